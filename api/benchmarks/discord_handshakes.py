@@ -0,0 +1,80 @@
+"""
+Benchmark connections opened to Discord per OAuth callback
+
+Runs the Discord calls made by /discord/callback against a local fake
+Discord server, first as four serial calls with a new httpx.AsyncClient
+each (the old behaviour), then as the current callback does them: token
+exchange, then user info and guild member concurrently through the
+shared keep-alive client.
+
+Every new connection is a TCP (and, against discord.com, TLS) handshake.
+
+Usage: python -m benchmarks.discord_handshakes [callbacks] [latency_ms]
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from benchmarks.fake_discord import FakeDiscordServer, GUILD_ID
+from routes.auth import discord_oauth
+from routes.auth.discord_client import create_discord_client, set_discord_client, close_discord_client
+from routes.auth.oauth_config import set_oauth_config
+
+
+async def callback_with_new_clients(base_url: str) -> None:
+    """Old behaviour: one client, and so one connection, per Discord call"""
+    headers = {"Authorization": "Bearer fake_access_token"}
+    async with httpx.AsyncClient() as client:
+        await client.post(f"{base_url}/oauth2/token", data={"code": "code"})
+    async with httpx.AsyncClient() as client:
+        await client.get(f"{base_url}/users/@me", headers=headers)
+    async with httpx.AsyncClient() as client:
+        await client.get(f"{base_url}/users/@me/guilds", headers=headers)
+    async with httpx.AsyncClient() as client:
+        await client.get(f"{base_url}/users/@me/guilds/{GUILD_ID}/member", headers=headers)
+
+
+async def callback_with_shared_client(base_url: str) -> None:
+    """New behaviour: the Discord helpers through the shared client"""
+    token = await discord_oauth.exchange_code_for_token("code")
+    access_token = token["access_token"]
+    await asyncio.gather(
+        discord_oauth.get_discord_user_info(access_token),
+        discord_oauth.get_discord_guild_member(access_token, GUILD_ID)
+    )
+
+
+async def run(name: str, callback, server: FakeDiscordServer, callbacks: int) -> None:
+    server.app.reset()
+    start = time.perf_counter()
+    for _ in range(callbacks):
+        await callback(server.base_url)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{name:<8} connections/callback: {len(server.app.connections) / callbacks:.2f}  "
+        f"avg: {elapsed / callbacks * 1000:.2f} ms"
+    )
+
+
+async def main(callbacks: int, latency: float) -> None:
+    with FakeDiscordServer(latency=latency) as server:
+        os.environ["DISCORD_TOKEN_URL"] = f"{server.base_url}/oauth2/token"
+        os.environ["DISCORD_USER_URL"] = f"{server.base_url}/users/@me"
+        set_oauth_config(None)
+        discord_oauth.DISCORD_API_BASE_URL = server.base_url
+        # The fake server speaks plain HTTP/1.1
+        set_discord_client(create_discord_client(http2=False))
+
+        await run("before", callback_with_new_clients, server, callbacks)
+        await run("after", callback_with_shared_client, server, callbacks)
+        await close_discord_client()
+
+
+if __name__ == "__main__":
+    callbacks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    asyncio.run(main(callbacks, latency_ms / 1000))
@@ -0,0 +1,92 @@
+"""
+Local stand-in for the Discord API used by benchmarks
+
+Serves the OAuth token, user, guilds and guild member endpoints with an
+optional artificial latency, and counts distinct client TCP connections.
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+from typing import Optional, Set, Tuple
+
+import uvicorn
+
+GUILD_ID = "100000000000000000"
+OTHER_GUILD_ID_BASE = 300000000000000000
+
+
+class FakeDiscord:
+    """ASGI app emulating the Discord endpoints used by the OAuth callback"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.connections: Set[Tuple[str, int]] = set()
+        self.requests = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        self.connections.add(tuple(scope["client"]))
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        status, body = self.respond(scope["method"], scope["path"])
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": json.dumps(body).encode()})
+
+    def respond(self, method: str, path: str):
+        if method == "POST" and path.endswith("/oauth2/token"):
+            return 200, {"access_token": "fake_access_token", "token_type": "Bearer"}
+        if path.endswith("/users/@me"):
+            return 200, {"id": "200000000000000000", "username": "bench_user", "email": "bench@example.com"}
+        if path.endswith("/users/@me/guilds"):
+            return 200, [{"id": str(OTHER_GUILD_ID_BASE + i), "name": f"Guild {i}"} for i in range(100)] + [
+                {"id": GUILD_ID, "name": "Target Guild"}
+            ]
+        if path.endswith(f"/guilds/{GUILD_ID}/member"):
+            return 200, {"nick": "bench_nick", "roles": ["1", "2"]}
+        return 404, {"message": "Unknown"}
+
+    def reset(self) -> None:
+        self.connections.clear()
+        self.requests = 0
+
+
+class FakeDiscordServer:
+    """Run FakeDiscord on a local port in a background thread"""
+
+    def __init__(self, latency: float = 0.0):
+        self.app = FakeDiscord(latency)
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{self.port}/api"
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "FakeDiscordServer":
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.should_exit = True
+        self._thread.join()
@@ -0,0 +1,265 @@
+"""
+Load and latency benchmark for the auth endpoints
+
+Drives the ASGI app in-process with concurrent clients against the
+configured database (Postgres or SQLite) and a mocked Discord API with a
+configurable latency. For each of GET /api/auth/me, POST /api/auth/logout
+and GET /api/auth/discord/callback it reports throughput, p50/p95/p99
+latency and DB statements per request.
+
+Results are written as JSON. Given a baseline, every endpoint is compared
+against it and the run exits non-zero on a regression: p95 latency above,
+or throughput below, the baseline by more than the tolerance, or any
+increase in queries per request. Any failed request fails the run, with
+or without a baseline: an HTTP error status, or a redirect to the
+frontend carrying error= (how a failed Discord login is reported).
+Baselines are machine-specific; record one on the machine you compare on
+with --save-baseline.
+
+Usage: DATABASE_URL=... python -m benchmarks.load [--requests N] [--concurrency C]
+           [--discord-latency-ms MS] [--output FILE] [--baseline FILE]
+           [--save-baseline FILE] [--tolerance 0.2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import secrets
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+from urllib.parse import urlsplit, parse_qs
+
+import httpx
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from benchmarks.fake_discord import FakeDiscord, GUILD_ID
+from benchmarks.me_query_count import TRANSACTION_CONTROL
+from database.connection import engine, async_engine, SessionLocal, DATABASE_URL
+from database.init_db import create_tables
+from database.models.user import User, UserStatus
+from database.operations.session_operations import create_session
+from database.session_cache import session_cache
+from routes.auth import discord_oauth
+from routes.auth.discord_client import create_discord_client, set_discord_client, close_discord_client
+from routes.auth.oauth_config import set_oauth_config
+from main import app
+
+DISCORD_BASE_URL = "http://discord.bench/api"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "load.json")
+
+
+def seed_user(discord_id: str = "200000000000000000") -> int:
+    """Create (or reuse) the approved user the fake Discord logs in as"""
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.discord_id == discord_id).first()
+        if user is None:
+            user = User(discord_id=discord_id, discord_username="bench_user", status=UserStatus.APPROVED)
+            db.add(user)
+            db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def install_fake_discord(latency: float) -> None:
+    """Route the shared Discord client to an in-process fake with the given latency"""
+    os.environ["DISCORD_TOKEN_URL"] = f"{DISCORD_BASE_URL}/oauth2/token"
+    os.environ["DISCORD_USER_URL"] = f"{DISCORD_BASE_URL}/users/@me"
+    os.environ["TARGET_SERVER_ID"] = GUILD_ID
+    os.environ.setdefault("FRONTEND_URL", "http://frontend.bench")
+    set_oauth_config(None)
+    discord_oauth.DISCORD_API_BASE_URL = DISCORD_BASE_URL
+    set_discord_client(create_discord_client(transport=httpx.ASGITransport(app=FakeDiscord(latency))))
+
+
+def is_error(response: httpx.Response) -> bool:
+    """An error status, or a redirect that reports an error to the frontend"""
+    if response.status_code >= 400:
+        return True
+    location = response.headers.get("location")
+    return location is not None and "error" in parse_qs(urlsplit(location).query)
+
+
+def percentile(latencies: List[float], pct: int) -> float:
+    return statistics.quantiles(latencies, n=100, method="inclusive")[pct - 1]
+
+
+async def run_endpoint(
+    name: str,
+    send: Callable[[AsyncClient, int], Awaitable[httpx.Response]],
+    requests: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """Issue `requests` calls over `concurrency` workers and summarize them"""
+    statements = 0
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        if not statement.startswith(TRANSACTION_CONTROL):
+            statements += 1
+
+    latencies: List[float] = []
+    errors = 0
+    next_request = iter(range(requests))
+
+    async def worker(client: AsyncClient) -> None:
+        nonlocal errors
+        for index in next_request:
+            start = time.perf_counter()
+            response = await send(client, index)
+            latencies.append(time.perf_counter() - start)
+            if is_error(response):
+                errors += 1
+
+    engines = [engine, async_engine.sync_engine]
+    for bench_engine in engines:
+        event.listen(bench_engine, "before_cursor_execute", count)
+    try:
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+    finally:
+        for bench_engine in engines:
+            event.remove(bench_engine, "before_cursor_execute", count)
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "queries_per_request": round(statements / requests, 2),
+    }
+
+
+async def run_suite(requests: int, concurrency: int, discord_latency: float) -> Dict[str, Any]:
+    create_tables()
+    user_id = seed_user()
+    install_fake_discord(discord_latency)
+    session_cache.clear()
+
+    me_session = create_session(user_id)
+
+    async def me(client: AsyncClient, index: int) -> httpx.Response:
+        return await client.get("/api/auth/me", cookies={"session_id": me_session})
+
+    # Each logout revokes its session, so every request gets its own
+    logout_sessions = [create_session(user_id) for _ in range(requests)]
+
+    async def logout(client: AsyncClient, index: int) -> httpx.Response:
+        return await client.post("/api/auth/logout", cookies={"session_id": logout_sessions[index]})
+
+    async def callback(client: AsyncClient, index: int) -> httpx.Response:
+        return await client.get("/api/auth/discord/callback", params={"code": secrets.token_hex(8)})
+
+    try:
+        endpoints = {
+            "GET /api/auth/me": await run_endpoint("me", me, requests, concurrency),
+            "POST /api/auth/logout": await run_endpoint("logout", logout, requests, concurrency),
+            "GET /api/auth/discord/callback": await run_endpoint("callback", callback, requests, concurrency),
+        }
+    finally:
+        await close_discord_client()
+
+    return {
+        "config": {
+            "database": DATABASE_URL.split(":", 1)[0],
+            "requests": requests,
+            "concurrency": concurrency,
+            "discord_latency_ms": discord_latency * 1000,
+            "python": platform.python_version(),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return one message per regression against the baseline"""
+    regressions = []
+    for endpoint, base in baseline["endpoints"].items():
+        current = results["endpoints"].get(endpoint)
+        if current is None:
+            regressions.append(f"{endpoint}: missing from results")
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {current['p95_ms']} ms vs baseline {base['p95_ms']} ms")
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{endpoint}: throughput {current['throughput_rps']} rps vs baseline {base['throughput_rps']} rps"
+            )
+        if current["queries_per_request"] > base["queries_per_request"]:
+            regressions.append(
+                f"{endpoint}: {current['queries_per_request']} queries/request "
+                f"vs baseline {base['queries_per_request']}"
+            )
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{endpoint}: {current['errors']} errors vs baseline {base['errors']}")
+    return regressions
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    print(f"{'endpoint':<32} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'q/req':>6} {'errors':>6}")
+    for endpoint, stats in results["endpoints"].items():
+        print(
+            f"{endpoint:<32} {stats['throughput_rps']:>9} {stats['p50_ms']:>9} {stats['p95_ms']:>9} "
+            f"{stats['p99_ms']:>9} {stats['queries_per_request']:>6} {stats['errors']:>6}"
+        )
+
+
+def write_json(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+        file.write("\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=300, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent clients")
+    parser.add_argument("--discord-latency-ms", type=float, default=50, help="latency of each mocked Discord call")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help=f"compare against this baseline (e.g. {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", help="write results as a new baseline to this file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative p95/throughput change")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_suite(args.requests, args.concurrency, args.discord_latency_ms / 1000))
+    print_report(results)
+
+    if args.output:
+        write_json(args.output, results)
+    if args.save_baseline:
+        write_json(args.save_baseline, results)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    failed = {endpoint: stats["errors"] for endpoint, stats in results["endpoints"].items() if stats["errors"]}
+    if failed:
+        print("ERRORS:")
+        for endpoint, errors in failed.items():
+            print(f"  {endpoint}: {errors} of {args.requests} requests failed")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["config"] != results["config"]:
+            print(f"Warning: baseline config differs: {baseline['config']}")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("REGRESSIONS:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
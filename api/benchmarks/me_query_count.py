@@ -0,0 +1,89 @@
+"""
+Benchmark the queries issued to resolve GET /api/auth/me
+
+Compares the old two-step lookup (get_session + get_user_from_session)
+with the single joined get_valid_session_user query. The session cache
+is disabled while measuring, so every lookup reaches the database.
+
+Usage: DATABASE_URL=... python -m benchmarks.me_query_count
+"""
+import time
+import secrets
+from sqlalchemy import event
+
+from database.connection import engine, SessionLocal
+from database.init_db import create_tables
+from database.models.user import User, UserStatus
+from database.session_cache import session_cache
+from database.operations.session_operations import (
+    create_session,
+    get_session,
+    get_user_from_session,
+    get_valid_session_user
+)
+
+ITERATIONS = 1000
+
+# BEGIN (emitted explicitly on SQLite) and savepoints are not queries
+TRANSACTION_CONTROL = ("BEGIN", "SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def seed_session() -> str:
+    """Create an approved user with an active session"""
+    db = SessionLocal()
+    try:
+        user = User(
+            discord_id=str(secrets.randbelow(10**18)),
+            discord_username="bench_user",
+            status=UserStatus.APPROVED
+        )
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    finally:
+        db.close()
+    return create_session(user_id)
+
+
+def old_lookup(session_id: str):
+    session = get_session(session_id)
+    if not session or not session.is_valid():
+        return None
+    return get_user_from_session(session_id)
+
+
+def new_lookup(session_id: str):
+    return get_valid_session_user(session_id)
+
+
+def measure(name: str, lookup, session_id: str):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith(TRANSACTION_CONTROL):
+            statements.append(statement)
+
+    original_ttl = session_cache.ttl_seconds
+    session_cache.ttl_seconds = 0
+    session_cache.clear()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            assert lookup(session_id) is not None
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+        session_cache.ttl_seconds = original_ttl
+
+    print(
+        f"{name:<8} queries/request: {len(statements) / ITERATIONS:.1f}  "
+        f"avg: {elapsed / ITERATIONS * 1000:.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    create_tables()
+    session_id = seed_session()
+    measure("before", old_lookup, session_id)
+    measure("after", new_lookup, session_id)
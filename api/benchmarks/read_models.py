@@ -0,0 +1,76 @@
+"""
+Benchmark ORM user lookups against column-restricted read models
+
+Measures time and allocations per lookup for get_user_by_id (full ORM
+User) and get_user_summary (slotted UserSummary), plus the session
+lookups that now return read models, against the same rows. Each call
+opens and closes its own session, as the request paths do.
+
+Usage: DATABASE_URL=... python -m benchmarks.read_models
+"""
+import gc
+import time
+import tracemalloc
+
+from database.init_db import create_tables
+from database.models.user import User
+from database.operations.users import get_user_by_id, get_user_summary
+from database.operations.session_operations import get_session, get_user_from_session
+from database.connection import SessionLocal
+from .me_query_count import seed_session
+
+ITERATIONS = 2000
+
+
+def measure(name: str, lookup) -> None:
+    # Warm up statement caches before measuring
+    for _ in range(50):
+        assert lookup() is not None
+
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        lookup()
+    elapsed = time.perf_counter() - start
+
+    # Peak traced memory over one lookup counts everything it allocated,
+    # including objects freed before it returned
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    lookup()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<32} avg: {elapsed / ITERATIONS * 1000:.3f} ms  peak alloc/lookup: {(peak - before) / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    create_tables()
+    session_id = seed_session()
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).order_by(User.id.desc()).limit(1).scalar()
+    finally:
+        db.close()
+
+    print("Own session per lookup:")
+    measure("get_user_by_id (ORM User)", lambda: get_user_by_id(user_id))
+    measure("get_user_summary", lambda: get_user_summary(user_id))
+    measure("get_session", lambda: get_session(session_id))
+    measure("get_user_from_session", lambda: get_user_from_session(session_id))
+
+    # In one unit of work the ORM lookup also pays for identity map
+    # bookkeeping; expunge so every lookup hydrates a fresh object
+    print("Shared session (request unit of work):")
+    db = SessionLocal()
+    try:
+        def orm_lookup():
+            user = get_user_by_id(user_id, db=db)
+            db.expunge_all()
+            return user
+
+        measure("get_user_by_id (ORM User)", orm_lookup)
+        measure("get_user_summary", lambda: get_user_summary(user_id, db=db))
+    finally:
+        db.close()
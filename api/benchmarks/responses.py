@@ -0,0 +1,88 @@
+"""
+Benchmark per-response serialization and redirect overhead
+
+Measures, without any I/O, what FastAPI does after a handler returns:
+the /me body as a plain dict through jsonable_encoder and JSONResponse
+(the old path) against the typed response model serialized by
+pydantic-core and rendered by ORJSONResponse, and the callback redirect
+built from os.getenv and an f-string against the pre-built, URL-encoded
+target from OAuthConfig.
+
+Importing the app needs a DATABASE_URL, but nothing here queries it.
+
+Usage: DATABASE_URL=sqlite:// python -m benchmarks.responses [iterations]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+from fastapi.responses import JSONResponse, ORJSONResponse, RedirectResponse
+from fastapi.routing import serialize_response
+
+from database.models.user import UserStatus
+from routes.auth.auth import MeResponse, MeUser
+from routes.auth.oauth_config import get_oauth_config
+from main import app
+
+ITERATIONS = 20000
+
+
+async def measure(name: str, respond, iterations: int) -> None:
+    # Warm up before measuring
+    for _ in range(100):
+        await respond()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await respond()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<36} avg: {elapsed / iterations * 1_000_000:.2f} us")
+
+
+async def main(iterations: int) -> None:
+    os.environ.setdefault("FRONTEND_URL", "http://frontend.bench")
+    me_route = next(route for route in app.routes if getattr(route, "path", None) == "/api/auth/me")
+
+    async def me_dict() -> bytes:
+        content = await serialize_response(response_content={
+            "authenticated": True,
+            "user": {
+                "id": 1,
+                "discord_username": "bench_user",
+                "server_nickname": None,
+                "status": UserStatus.APPROVED.value
+            }
+        })
+        return JSONResponse(content).body
+
+    async def me_model() -> bytes:
+        body = MeResponse.model_construct(
+            authenticated=True,
+            user=MeUser.model_construct(
+                id=1, discord_username="bench_user", server_nickname=None, status=UserStatus.APPROVED
+            )
+        )
+        content = await serialize_response(field=me_route.response_field, response_content=body, exclude_unset=True)
+        return ORJSONResponse(content).body
+
+    # Both paths must produce the same document
+    assert json.loads(await me_dict()) == json.loads(await me_model())
+
+    async def redirect_getenv() -> RedirectResponse:
+        return RedirectResponse(url=f"{os.getenv('FRONTEND_URL')}/?auth=success&message=Login successful")
+
+    async def redirect_prebuilt() -> RedirectResponse:
+        return RedirectResponse(url=get_oauth_config().redirects["success"])
+
+    print("/me body:")
+    await measure("dict + jsonable_encoder + json", me_dict, iterations)
+    await measure("response model + orjson", me_model, iterations)
+    print("Callback redirect:")
+    await measure("os.getenv + f-string", redirect_getenv, iterations)
+    await measure("pre-built OAuthConfig target", redirect_prebuilt, iterations)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else ITERATIONS))
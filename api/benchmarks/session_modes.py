@@ -0,0 +1,73 @@
+"""
+Benchmark GET /api/auth/me with DB-backed vs signed session tokens
+
+Usage: DATABASE_URL=... python -m benchmarks.session_modes [requests]
+"""
+import asyncio
+import sys
+import time
+
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from benchmarks.me_query_count import seed_session, TRANSACTION_CONTROL
+from database.connection import engine, async_engine, SessionLocal
+from database.init_db import create_tables
+from database.models.user import User
+from database.session_cache import session_cache
+from database.session_store import SqlSessionStore, SignedSessionStore, set_session_store
+from main import app
+
+
+async def measure(name: str, session_id: str, requests: int) -> None:
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith(TRANSACTION_CONTROL):
+            statements.append(statement)
+
+    engines = [engine, async_engine.sync_engine]
+    for bench_engine in engines:
+        event.listen(bench_engine, "before_cursor_execute", count)
+    try:
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+            client.cookies.set("session_id", session_id)
+            start = time.perf_counter()
+            for _ in range(requests):
+                response = await client.get("/api/auth/me")
+                assert response.json()["authenticated"] is True
+            elapsed = time.perf_counter() - start
+    finally:
+        for bench_engine in engines:
+            event.remove(bench_engine, "before_cursor_execute", count)
+
+    print(
+        f"{name:<20} queries/request: {len(statements) / requests:.2f}  "
+        f"avg: {elapsed / requests * 1000:.3f} ms"
+    )
+
+
+async def main(requests: int) -> None:
+    create_tables()
+    session_id = seed_session()
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).order_by(User.id.desc()).first()[0]
+    finally:
+        db.close()
+
+    set_session_store(SqlSessionStore())
+    original_ttl = session_cache.ttl_seconds
+    session_cache.ttl_seconds = 0
+    await measure("database (no cache)", session_id, requests)
+    session_cache.ttl_seconds = original_ttl
+    await measure("database (cache)", session_id, requests)
+
+    signed_store = SignedSessionStore("benchmark-secret")
+    set_session_store(signed_store)
+    await measure("signed", signed_store.create(user_id), requests)
+    set_session_store(None)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
@@ -1,11 +1,14 @@
-from .connection import get_db, engine, SessionLocal
+from .connection import get_db, get_async_db, engine, async_engine, SessionLocal, AsyncSessionLocal
 from .models import User, UserStatus, Session
 from .init_db import create_tables, drop_tables
 
 __all__ = [
     "get_db", 
+    "get_async_db",
     "engine",
+    "async_engine",
     "SessionLocal",
+    "AsyncSessionLocal",
     "User", 
     "UserStatus", 
     "Session",
@@ -1,23 +1,200 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.util import await_only
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+import asyncio
 import os
+import sqlite3
+import time
 from dotenv import load_dotenv
 import pathlib
 
+from .pool_stats import InstrumentedQueuePool, InstrumentedAsyncQueuePool, instrument_engine, get_pool_stats
+from .query_metrics import instrument_queries
+
 # Load .env file from the api directory
 env_path = pathlib.Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
+# Shared-cache name for in-memory SQLite, see get_sqlite_url
+SQLITE_MEMORY_NAME = os.getenv("SQLITE_MEMORY_NAME", "auth_api")
+
+def get_sqlite_url(url: str) -> str:
+    """
+    Point an in-memory SQLite URL at a named shared-cache database
+    A plain sqlite:// gives every connection its own empty database, so
+    the sync and async engines would not see each other's tables. Other
+    URLs are returned unchanged.
+    """
+    if not url:
+        return url
+    db_url = make_url(url)
+    if db_url.get_backend_name() != "sqlite" or db_url.database not in (None, "", ":memory:"):
+        return url
+    return db_url.set(
+        database=f"file:{SQLITE_MEMORY_NAME}",
+        query={**db_url.query, "mode": "memory", "cache": "shared", "uri": "true"}
+    ).render_as_string(hide_password=False)
+
+def is_shared_memory_sqlite(url: URL) -> bool:
+    """True for the shared-cache in-memory URIs built by get_sqlite_url"""
+    return url.get_backend_name() == "sqlite" and url.query.get("mode") == "memory"
+
+def open_sqlite_anchor(url: Optional[str]) -> Optional[sqlite3.Connection]:
+    """
+    Hold a connection to a shared in-memory database open
+    SQLite drops the database when its last connection closes, which a
+    pool may do at any time (recycle, overflow, dispose).
+    """
+    if not url or not is_shared_memory_sqlite(make_url(url)):
+        return None
+    db_url = make_url(url)
+    query = {key: value for key, value in db_url.query.items() if key != "uri"}
+    return sqlite3.connect(f"{db_url.database}?{urlencode(query)}", uri=True, check_same_thread=False)
+
 # Database URL from environment variable
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = get_sqlite_url(os.getenv("DATABASE_URL"))
+_sqlite_anchor = open_sqlite_anchor(DATABASE_URL)
+
+# Async drivers for each supported database backend
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+def get_async_database_url(url: str) -> str:
+    """
+    Map a sync database URL onto the matching async driver
+    e.g. postgresql://... -> postgresql+asyncpg://...
+    """
+    sync_url = make_url(url)
+    backend = sync_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    return sync_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+# Async database URL, derived from DATABASE_URL unless set explicitly
+ASYNC_DATABASE_URL = get_sqlite_url(os.getenv("ASYNC_DATABASE_URL") or get_async_database_url(DATABASE_URL))
+
+# Connection pool configuration from environment variables
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_USE_LIFO = os.getenv("DB_POOL_USE_LIFO", "false").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", str(DB_POOL_SIZE)))
+# How long a SQLite transaction waits for another connection's write lock
+SQLITE_BUSY_TIMEOUT_SECONDS = float(os.getenv("SQLITE_BUSY_TIMEOUT_SECONDS", "5"))
+
+def get_engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Build create_engine keyword arguments for the configured pool
+    Sizing options only apply to queue pools (e.g. not a private in-memory
+    SQLite database); a shared in-memory database gets one like any other.
+    """
+    db_url = make_url(url)
+    options: Dict[str, Any] = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_logging_name": "async" if is_async else "sync",
+        # Keep bound values (session IDs, emails) out of logged error messages
+        "hide_parameters": True,
+    }
+
+    if is_shared_memory_sqlite(db_url) or issubclass(db_url.get_dialect().get_pool_class(db_url), QueuePool):
+        options.update({
+            "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_use_lifo": DB_POOL_USE_LIFO,
+        })
+
+    if db_url.get_backend_name() == "sqlite":
+        # Worker threads (asyncio.to_thread) share pooled connections
+        options["connect_args"] = {"check_same_thread": False}
+
+    if DB_STATEMENT_TIMEOUT_MS and db_url.get_backend_name() == "postgresql":
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+
+    return options
+
+def configure_sqlite(engine) -> None:
+    """
+    Make SQLite behave like the Postgres deployment
+    Enforces foreign keys, and lets SQLAlchemy emit BEGIN itself: the
+    sqlite3 driver otherwise defers it to the first write, which breaks
+    SAVEPOINTs and read consistency within a transaction.
+
+    Transactions start with BEGIN IMMEDIATE, taking the write lock up
+    front. A deferred BEGIN fails mid-transaction when two connections
+    both try to upgrade to writing, and that cannot be retried. Shared
+    in-memory databases report a held lock at once instead of honouring
+    busy_timeout, so BEGIN is retried until SQLITE_BUSY_TIMEOUT_SECONDS.
+    """
+    is_async = engine.dialect.is_async
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_SECONDS * 1000)}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def on_begin(connection):
+        deadline = time.monotonic() + SQLITE_BUSY_TIMEOUT_SECONDS
+        while True:
+            try:
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+                return
+            except OperationalError as e:
+                if "locked" not in str(e.orig) or time.monotonic() >= deadline:
+                    raise
+            # The async engine runs this in a greenlet on the event loop,
+            # where the lock holder only progresses if the loop does
+            if is_async:
+                await_only(asyncio.sleep(0.001))
+            else:
+                time.sleep(0.001)
 
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **get_engine_options(DATABASE_URL))
+instrument_engine(engine, "sync")
+instrument_queries(engine)
+if engine.dialect.name == "sqlite":
+    configure_sqlite(engine)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async SQLAlchemy engine for request handlers
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **get_engine_options(ASYNC_DATABASE_URL, is_async=True))
+instrument_engine(async_engine.sync_engine, "async")
+instrument_queries(async_engine.sync_engine)
+if async_engine.dialect.name == "sqlite":
+    configure_sqlite(async_engine.sync_engine)
+
+# Async session factory; objects stay usable after commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for all models
 Base = declarative_base()
 
@@ -33,6 +210,39 @@ def get_db():
     finally:
         db.close()
 
+# Async database dependency for FastAPI
+async def get_async_db():
+    """
+    FastAPI dependency to get an async database session
+    Open per request and close when done.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Live pool statistics
+def get_pool_status() -> Dict[str, Any]:
+    """
+    Return pool statistics for the sync and async engines
+    """
+    return {
+        "sync": get_pool_stats("sync").snapshot(engine.pool),
+        "async": get_pool_stats("async").snapshot(async_engine.sync_engine.pool),
+    }
+
+# Open pooled connections ahead of the first requests
+async def warm_up_pool(connections: int = DB_POOL_WARMUP) -> int:
+    """
+    Open connections on the async engine concurrently and return them to the pool
+    Each runs SELECT 1, so an unreachable database raises here rather than
+    on a user's request.
+    """
+    async def connect():
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(connect() for _ in range(connections)))
+    return connections
+
 # Test the database connection
 def test_db_connection():
     """
@@ -10,11 +10,22 @@ def create_tables():
     Base.metadata.create_all(bind=engine)
     print("Database tables created successfully!")
 
+def migrate_database(revision: str = "head"):
+    """Apply Alembic migrations up to the given revision"""
+    from alembic import command
+    from alembic.config import Config
+
+    api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config = Config(os.path.join(api_dir, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(api_dir, "migrations"))
+    command.upgrade(config, revision)
+    print(f"Database migrated to {revision}!")
+
 def drop_tables():
     """Drop all database tables (use with caution!)"""
     Base.metadata.drop_all(bind=engine)
     print("Database tables dropped!")
 
 if __name__ == "__main__":
-    create_tables()
+    migrate_database()
 
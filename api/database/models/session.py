@@ -1,21 +1,41 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
 from ..connection import Base
+from ..types import Timestamp
 
 class Session(Base):
     """Session model for storing user sessions"""
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Bulk revocation: WHERE user_id = ? AND is_active
+        Index("ix_sessions_user_id_is_active", "user_id", "is_active"),
+        # Active-session scans by expiry, kept small by excluding revoked rows
+        Index(
+            "ix_sessions_active_expires_at",
+            "expires_at",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active")
+        ),
+        # Revoked-session sweeps: WHERE is_active = false (SQLite stores 0)
+        Index(
+            "ix_sessions_inactive",
+            "id",
+            postgresql_where=text("NOT is_active"),
+            sqlite_where=text("is_active = 0")
+        ),
+    )
     
     id = Column(String, primary_key=True)  # Session ID (UUID string)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     created_at = Column(
-        DateTime(timezone=True), 
+        Timestamp(), 
         server_default=func.current_timestamp()
     )
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(Timestamp(), nullable=False, index=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    last_accessed_at = Column(Timestamp(), nullable=True)
     
     # Relationship to User model
     user = relationship("User", backref="sessions")
@@ -25,7 +45,7 @@ class Session(Base):
     
     def is_expired(self) -> bool:
         """Check if session is expired"""
-        return datetime.utcnow() > self.expires_at.replace(tzinfo=None) if self.expires_at.tzinfo else self.expires_at
+        return datetime.utcnow() > self.expires_at
     
     def is_valid(self) -> bool:
         """Check if session is valid (active and not expired)"""
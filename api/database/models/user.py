@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, CheckConstraint
+from sqlalchemy import Column, Integer, String, Enum, CheckConstraint, Index
 from sqlalchemy.sql import func
 from datetime import datetime
 import enum
 from ..connection import Base
+from ..types import Timestamp
 
 class UserStatus(enum.Enum):
     """User status enumeration"""
@@ -14,6 +15,10 @@ class UserStatus(enum.Enum):
 class User(Base):
     """User model for storing Discord user information"""
     __tablename__ = "users"
+    __table_args__ = (
+        # Admin listings: WHERE status = ? ORDER BY created_at, id (keyset pagination)
+        Index("ix_users_status_created_at_id", "status", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)  # SERIAL PRIMARY KEY
     discord_id = Column(String(20), unique=True, nullable=False, index=True)  # VARCHAR(20) UNIQUE NOT NULL
@@ -21,21 +26,22 @@ class User(Base):
     server_nickname = Column(String(32), nullable=True)  # VARCHAR(32) - Server nickname
     email = Column(String(255))  # VARCHAR(255)
     status = Column(
-        Enum(UserStatus), 
+        # Native enum on Postgres; on SQLite a CHECK constraint keeps the same values
+        Enum(UserStatus, name="userstatus", create_constraint=True, validate_strings=True), 
         default=UserStatus.PENDING,  # DEFAULT 'pending'
         nullable=False
     )
     created_at = Column(
-        DateTime(timezone=True), 
+        Timestamp(), 
         server_default=func.current_timestamp()  # TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
     )
     updated_at = Column(
-        DateTime(timezone=True), 
+        Timestamp(), 
         server_default=func.current_timestamp(),
         onupdate=func.current_timestamp()  # TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
     )
     last_login_at = Column(
-        DateTime(timezone=True), 
+        Timestamp(), 
         server_default=func.current_timestamp(),
         onupdate=func.current_timestamp()  # TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
     )
@@ -0,0 +1,16 @@
+from typing import Sequence
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+def matches_any(column, values: Sequence, dialect_name: str):
+    """
+    Condition that column equals one of values
+    On Postgres the values are bound as a single array (column = ANY(:values)),
+    so the statement text and plan are the same however many values there
+    are and thousands of IDs cost one parameter. Other backends use an
+    expanding IN.
+    """
+    if dialect_name == "postgresql":
+        return column == any_(bindparam(None, list(values), type_=ARRAY(column.type)))
+    return column.in_(values)
@@ -1,206 +1,633 @@
 from sqlalchemy.orm import Session as DBSession
 from sqlalchemy.exc import IntegrityError
-from typing import Optional
+from typing import Dict, Optional, Sequence
 from datetime import datetime, timedelta
+import logging
 import secrets
 
 from ..models.session import Session
 from ..models.user import User
-from ..connection import SessionLocal
+from sqlalchemy import select, update, delete, text, values, column, func, String, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..unit_of_work import unit_of_work, async_unit_of_work
+from ..query_metrics import observe_operation
+from ..read_models import SessionSummary, SessionUser, UserSummary
+from ..types import Timestamp
+from ..session_cache import session_cache
+from .users.get_user_summary import USER_SUMMARY_COLUMNS
+from .filters import matches_any
+from ..session_access import session_access_buffer, SESSION_SLIDING_EXPIRATION, SESSION_LIFETIME_DAYS
 
+logger = logging.getLogger(__name__)
 
-def create_session(user_id: int, expires_in_days: int = 7) -> Optional[str]:
+
+@observe_operation
+def create_session(user_id: int, expires_in_days: int = SESSION_LIFETIME_DAYS, db: Optional[DBSession] = None) -> Optional[str]:
     """
     Create a new session for the user in the database
     
     Args:
         user_id: The ID of the user
-        expires_in_days: Number of days until session expires (default 7)
+        expires_in_days: Number of days until session expires (default SESSION_LIFETIME_DAYS)
+        db: Optional session to run in; the caller then owns the commit
     
     Returns:
         Session ID if successful, None otherwise
     """
-    db: DBSession = SessionLocal()
-    try:
-        # Generate a secure session ID
-        session_id = secrets.token_urlsafe(32)
+    with unit_of_work(db, savepoint=True) as uow:
+        try:
+            # Generate a secure session ID
+            session_id = secrets.token_urlsafe(32)
         
-        # Calculate expiration time
-        expires_at = datetime.utcnow() + timedelta(days=expires_in_days)
+            # Calculate expiration time
+            expires_at = datetime.utcnow() + timedelta(days=expires_in_days)
         
-        # Create session object
-        session = Session(
-            id=session_id,
-            user_id=user_id,
-            expires_at=expires_at,
-            is_active=True
-        )
+            # Create session object
+            session = Session(
+                id=session_id,
+                user_id=user_id,
+                expires_at=expires_at,
+                is_active=True
+            )
         
-        db.add(session)
-        db.commit()
+            uow.session.add(session)
+            uow.commit()
         
-        return session_id
+            return session_id
         
-    except IntegrityError as e:
-        db.rollback()
-        print(f"Integrity error creating session: {e.orig}")
-        return None
-    except Exception as e:
-        db.rollback()
-        print(f"Error creating session: {e}")
-        return None
-    finally:
-        db.close()
+        except IntegrityError as e:
+            uow.rollback()
+            logger.warning("Integrity error creating session", extra={"error": type(e.orig).__name__})
+            return None
+        except Exception:
+            uow.rollback()
+            logger.exception("Error creating session")
+            return None
 
 
-def get_session(session_id: str) -> Optional[Session]:
+@observe_operation
+def get_session(session_id: str, db: Optional[DBSession] = None) -> Optional[SessionSummary]:
     """
     Get session from database by session ID
     
     Args:
         session_id: The session ID to look up
+        db: Optional session to run in; the caller then owns the commit
     
     Returns:
-        Session object if found and valid, None otherwise
+        SessionSummary if found and active, None otherwise
     """
-    db: DBSession = SessionLocal()
-    try:
-        session = db.query(Session).filter(
-            Session.id == session_id,
-            Session.is_active == True
-        ).first()
+    with unit_of_work(db) as uow:
+        try:
+            row = uow.session.execute(
+                select(
+                    Session.id,
+                    Session.user_id,
+                    Session.expires_at,
+                    Session.is_active
+                ).where(
+                    Session.id == session_id,
+                    Session.is_active == True
+                )
+            ).first()
         
-        return session
+            return SessionSummary(*row) if row else None
         
-    except Exception as e:
-        print(f"Error retrieving session {session_id}: {e}")
-        return None
-    finally:
-        db.close()
+        except Exception:
+            logger.exception("Error retrieving session")
+            return None
 
 
-def get_user_from_session(session_id: str) -> Optional[User]:
+@observe_operation
+def get_user_from_session(session_id: str, db: Optional[DBSession] = None) -> Optional[UserSummary]:
     """
     Get user associated with a session
     
     Args:
         session_id: The session ID
+        db: Optional session to run in; the caller then owns the commit
     
     Returns:
-        User object if session is valid, None otherwise
+        UserSummary if session is active, None otherwise
     """
-    db: DBSession = SessionLocal()
-    try:
-        # Join session and user tables
-        result = db.query(User).join(Session).filter(
-            Session.id == session_id,
-            Session.is_active == True
-        ).first()
+    with unit_of_work(db) as uow:
+        try:
+            # Join session and user tables
+            row = uow.session.execute(
+                select(*USER_SUMMARY_COLUMNS).join(Session, Session.user_id == User.id).where(
+                    Session.id == session_id,
+                    Session.is_active == True
+                )
+            ).first()
         
-        return result
+            return UserSummary(*row) if row else None
         
-    except Exception as e:
-        print(f"Error getting user from session {session_id}: {e}")
-        return None
-    finally:
-        db.close()
+        except Exception:
+            logger.exception("Error getting user from session")
+            return None
 
 
+@observe_operation
+def get_valid_session_user(session_id: str, db: Optional[DBSession] = None) -> Optional[SessionUser]:
+    """
+    Resolve a session and its user in a single round-trip
+    The session must be active and not expired; both are checked in SQL.
+    Results are served from the in-process session cache when possible.
+    
+    Args:
+        session_id: The session ID
+        db: Optional session to run in; the caller then owns the commit
+    
+    Returns:
+        SessionUser snapshot if the session is valid, None otherwise
+    """
+    cached = session_cache.get(session_id)
+    if cached is not None:
+        return cached
+
+    with unit_of_work(db) as uow:
+        try:
+            result = uow.session.query(
+                User.id,
+                User.discord_username,
+                User.server_nickname,
+                User.status,
+                Session.expires_at,
+                User.updated_at
+            ).join(Session, Session.user_id == User.id).filter(
+                Session.id == session_id,
+                Session.is_active == True,
+                Session.expires_at > datetime.utcnow()
+            ).first()
+        
+            if not result:
+                return None
+
+            session_user = SessionUser(*result)
+            session_cache.set(session_id, session_user)
+            return session_user
+        
+        except Exception:
+            logger.exception("Error resolving session")
+            return None
+
+
+@observe_operation
 def update_session_access(session_id: str) -> bool:
     """
-    Update the session's last accessed time (you could add this field to model)
-    For now, this is a placeholder since the model doesn't have last_accessed
+    Record that a session was used
+    The access time is buffered and written by update_sessions_last_accessed,
+    so this never touches the database
     
     Args:
         session_id: The session ID
     
     Returns:
-        True if successful, False otherwise
+        True if sliding expiration is enabled and the access was recorded
     """
-    # Since the current model doesn't have last_accessed field,
-    # we'll just return True. You could add this field later if needed.
+    if not SESSION_SLIDING_EXPIRATION:
+        return False
+
+    session_access_buffer.record(session_id)
     return True
 
 
-def invalidate_session(session_id: str) -> bool:
+@observe_operation
+def update_sessions_last_accessed(accessed: Dict[str, datetime], db: Optional[DBSession] = None) -> int:
+    """
+    Write buffered access times in one batched UPDATE and slide expiry
+    forward to last access + SESSION_LIFETIME_DAYS (never backwards)
+    
+    Args:
+        accessed: Mapping of session ID to last access time
+        db: Optional session to run in; the caller then owns the commit
+    
+    Returns:
+        Number of sessions updated
+    """
+    window = timedelta(days=SESSION_LIFETIME_DAYS)
+    rows = [
+        {"session_id": session_id, "accessed_at": accessed_at, "new_expires_at": accessed_at + window}
+        for session_id, accessed_at in accessed.items()
+    ]
+
+    with unit_of_work(db, savepoint=True) as uow:
+        try:
+            if uow.session.get_bind().dialect.name == "postgresql":
+                # UPDATE ... FROM (VALUES ...) updates every row in one statement
+                accessed_values = values(
+                    column("session_id", String),
+                    column("accessed_at", Timestamp()),
+                    column("new_expires_at", Timestamp()),
+                    name="accessed"
+                ).data([(row["session_id"], row["accessed_at"], row["new_expires_at"]) for row in rows])
+
+                result = uow.session.execute(
+                    update(Session)
+                    .where(
+                        Session.id == accessed_values.c.session_id,
+                        Session.is_active == True
+                    )
+                    .values(
+                        last_accessed_at=accessed_values.c.accessed_at,
+                        expires_at=func.greatest(Session.expires_at, accessed_values.c.new_expires_at)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                updated_count = result.rowcount
+            else:
+                # Other backends: one executemany round-trip
+                statement = text(
+                    "UPDATE sessions SET last_accessed_at = :accessed_at, "
+                    "expires_at = CASE WHEN expires_at < :new_expires_at THEN :new_expires_at ELSE expires_at END "
+                    "WHERE id = :session_id AND is_active"
+                ).bindparams(
+                    # Bind through Timestamp so values are stored like ORM writes
+                    bindparam("accessed_at", type_=Timestamp()),
+                    bindparam("new_expires_at", type_=Timestamp())
+                )
+                result = uow.session.execute(statement, rows)
+                updated_count = result.rowcount
+
+            uow.commit()
+            return updated_count
+        
+        except Exception:
+            uow.rollback()
+            logger.exception("Error updating session access times")
+            return 0
+
+
+@observe_operation
+def invalidate_session(session_id: str, db: Optional[DBSession] = None) -> bool:
     """
     Invalidate a session by setting is_active to False
     
     Args:
         session_id: The session ID to invalidate
+        db: Optional session to run in; the caller then owns the commit
     
     Returns:
         True if successful, False otherwise
     """
-    db: DBSession = SessionLocal()
-    try:
-        session = db.query(Session).filter(Session.id == session_id).first()
+    with unit_of_work(db, savepoint=True) as uow:
+        try:
+            session = uow.session.query(Session).filter(Session.id == session_id).first()
         
-        if session:
-            session.is_active = False
-            db.commit()
-            return True
+            if session:
+                session.is_active = False
+                uow.after_commit(lambda: session_cache.invalidate(session_id))
+                uow.commit()
+                return True
         
-        return False
+            return False
         
-    except Exception as e:
-        db.rollback()
-        print(f"Error invalidating session {session_id}: {e}")
-        return False
-    finally:
-        db.close()
+        except Exception:
+            uow.rollback()
+            logger.exception("Error invalidating session")
+            return False
 
 
-def cleanup_expired_sessions() -> int:
+@observe_operation
+def get_revoked_session_ids(db: Optional[DBSession] = None) -> Optional[Dict[str, datetime]]:
+    """
+    Get sessions that were invalidated but have not yet expired
+    Used to build the revocation list for signed session tokens
+    
+    Args:
+        db: Optional session to run in; the caller then owns the commit
+    
+    Returns:
+        Mapping of session ID to expiry time, None if the lookup failed
+    """
+    with unit_of_work(db) as uow:
+        try:
+            rows = uow.session.query(Session.id, Session.expires_at).filter(
+                Session.is_active == False,
+                Session.expires_at > datetime.utcnow()
+            ).all()
+        
+            return {session_id: expires_at for session_id, expires_at in rows}
+        
+        except Exception:
+            logger.exception("Error loading revoked sessions")
+            return None
+
+
+@observe_operation
+def cleanup_expired_sessions(db: Optional[DBSession] = None) -> int:
     """
     Remove expired sessions from the database
     This should be run periodically (e.g., via a cron job)
     
+    Args:
+        db: Optional session to run in; the caller then owns the commit
+    
     Returns:
         Number of sessions cleaned up
     """
-    db: DBSession = SessionLocal()
-    try:
-        # Delete sessions that are expired
-        deleted_count = db.query(Session).filter(
-            Session.expires_at < datetime.utcnow()
-        ).delete()
+    session_cache.evict_expired()
+
+    with unit_of_work(db, savepoint=True) as uow:
+        try:
+            # Delete sessions that are expired
+            deleted_count = uow.session.query(Session).filter(
+                Session.expires_at < datetime.utcnow()
+            ).delete()
         
-        db.commit()
-        return deleted_count
+            uow.commit()
+            return deleted_count
         
-    except Exception as e:
-        db.rollback()
-        print(f"Error cleaning up expired sessions: {e}")
-        return 0
-    finally:
-        db.close()
+        except Exception:
+            uow.rollback()
+            logger.exception("Error cleaning up expired sessions")
+            return 0
+
+
+# Advisory lock key held while a sweeper batch runs (Postgres only)
+SESSION_SWEEP_LOCK_KEY = 0x5E55_0001
+
 
+@observe_operation
+def delete_expired_sessions_batch(batch_size: int = 1000, include_inactive: bool = True, db: Optional[DBSession] = None) -> Optional[int]:
+    """
+    Delete one bounded batch of expired (and optionally inactive) sessions
+    Takes a transaction-scoped advisory lock on Postgres so that only one
+    worker sweeps at a time. Expired rows are found through
+    ix_sessions_expires_at and revoked rows through ix_sessions_inactive,
+    in separate statements: an OR of the two conditions can use neither.
+    
+    Args:
+        batch_size: Maximum number of rows to delete
+        include_inactive: Also delete inactive sessions that have not expired
+        db: Optional session to run in; the caller then owns the commit
+    
+    Returns:
+        Number of sessions deleted, or None if another worker holds the lock
+    """
+    with unit_of_work(db, savepoint=True) as uow:
+        try:
+            if uow.session.get_bind().dialect.name == "postgresql":
+                locked = uow.session.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": SESSION_SWEEP_LOCK_KEY}
+                ).scalar()
+                if not locked:
+                    uow.rollback()
+                    return None
+
+            deleted = _delete_sessions_where(uow.session, Session.expires_at < datetime.utcnow(), batch_size)
+            if include_inactive and deleted < batch_size:
+                deleted += _delete_sessions_where(uow.session, Session.is_active == False, batch_size - deleted)
+            uow.commit()
+            return deleted
+        
+        except Exception:
+            uow.rollback()
+            logger.exception("Error deleting expired sessions batch")
+            return 0
 
-def invalidate_all_user_sessions(user_id: int) -> int:
+
+def _delete_sessions_where(db: DBSession, condition, limit: int) -> int:
+    batch = select(Session.id).where(condition).limit(limit).scalar_subquery()
+    result = db.execute(
+        delete(Session).where(Session.id.in_(batch)).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+@observe_operation
+def invalidate_all_user_sessions(user_id: int, db: Optional[DBSession] = None) -> int:
     """
     Invalidate all sessions for a specific user
     Useful for forcing logout on all devices
     
     Args:
         user_id: The user ID
+        db: Optional session to run in; the caller then owns the commit
     
     Returns:
         Number of sessions invalidated
     """
-    db: DBSession = SessionLocal()
-    try:
-        updated_count = db.query(Session).filter(
-            Session.user_id == user_id,
-            Session.is_active == True
-        ).update({"is_active": False})
+    with unit_of_work(db, savepoint=True) as uow:
+        try:
+            updated_count = uow.session.query(Session).filter(
+                Session.user_id == user_id,
+                Session.is_active == True
+            ).update({"is_active": False})
         
-        db.commit()
-        return updated_count
+            uow.after_commit(lambda: session_cache.invalidate_user(user_id))
+            uow.commit()
+            return updated_count
         
-    except Exception as e:
-        db.rollback()
-        print(f"Error invalidating user sessions for user {user_id}: {e}")
+        except Exception:
+            uow.rollback()
+            logger.exception("Error invalidating user sessions", extra={"user_id": user_id})
+            return 0
+
+
+@observe_operation
+def invalidate_users_sessions(user_ids: Sequence[int], db: Optional[DBSession] = None) -> int:
+    """
+    Invalidate all sessions for many users in one UPDATE
+    Set-based version of invalidate_all_user_sessions, for bulk bans
+    
+    Args:
+        user_ids: The user IDs
+        db: Optional session to run in; the caller then owns the commit
+    
+    Returns:
+        Number of sessions invalidated
+    
+    Raises:
+        SQLAlchemyError: Database errors are not swallowed
+    """
+    if not user_ids:
+        return 0
+
+    # Errors propagate so that a caller's transaction is never committed
+    # with the users changed but their sessions still live
+    with unit_of_work(db) as uow:
+        result = uow.session.execute(
+            _invalidate_users_statement(user_ids, uow.session.get_bind().dialect.name)
+        )
+        uow.after_commit(lambda: _evict_users(user_ids))
+        uow.commit()
+        return result.rowcount
+
+
+def _evict_users(user_ids: Sequence[int]) -> None:
+    for user_id in user_ids:
+        session_cache.invalidate_user(user_id)
+
+
+def _invalidate_users_statement(user_ids: Sequence[int], dialect_name: str):
+    return update(Session).where(
+        matches_any(Session.user_id, user_ids, dialect_name),
+        Session.is_active == True
+    ).values(is_active=False).execution_options(synchronize_session=False)
+
+
+@observe_operation
+async def create_session_async(user_id: int, expires_in_days: int = SESSION_LIFETIME_DAYS, db: Optional[AsyncSession] = None) -> Optional[str]:
+    """
+    Async version of create_session
+    
+    Args:
+        user_id: The ID of the user
+        expires_in_days: Number of days until session expires (default SESSION_LIFETIME_DAYS)
+        db: Optional session to run in; the caller then owns the commit
+    
+    Returns:
+        Session ID if successful, None otherwise
+    """
+    async with async_unit_of_work(db, savepoint=True) as uow:
+        try:
+            session_id = secrets.token_urlsafe(32)
+            expires_at = datetime.utcnow() + timedelta(days=expires_in_days)
+            
+            uow.session.add(Session(
+                id=session_id,
+                user_id=user_id,
+                expires_at=expires_at,
+                is_active=True
+            ))
+            await uow.commit()
+            
+            return session_id
+            
+        except IntegrityError as e:
+            await uow.rollback()
+            logger.warning("Integrity error creating session", extra={"error": type(e.orig).__name__})
+            return None
+        except Exception:
+            await uow.rollback()
+            logger.exception("Error creating session")
+            return None
+
+
+@observe_operation
+async def get_valid_session_user_async(session_id: str, db: Optional[AsyncSession] = None) -> Optional[SessionUser]:
+    """
+    Async version of get_valid_session_user
+    
+    Args:
+        session_id: The session ID
+        db: Optional session to run in; the caller then owns the commit
+    
+    Returns:
+        SessionUser snapshot if the session is valid, None otherwise
+    """
+    cached = session_cache.get(session_id)
+    if cached is not None:
+        return cached
+
+    async with async_unit_of_work(db) as uow:
+        try:
+            result = await uow.session.execute(
+                select(
+                    User.id,
+                    User.discord_username,
+                    User.server_nickname,
+                    User.status,
+                    Session.expires_at,
+                    User.updated_at
+                ).join(Session, Session.user_id == User.id).where(
+                    Session.id == session_id,
+                    Session.is_active == True,
+                    Session.expires_at > datetime.utcnow()
+                ).limit(1)
+            )
+            row = result.first()
+            
+            if not row:
+                return None
+
+            session_user = SessionUser(*row)
+            session_cache.set(session_id, session_user)
+            return session_user
+            
+        except Exception:
+            logger.exception("Error resolving session")
+            return None
+
+
+@observe_operation
+async def invalidate_session_async(session_id: str, db: Optional[AsyncSession] = None) -> bool:
+    """
+    Async version of invalidate_session
+    
+    Args:
+        session_id: The session ID to invalidate
+        db: Optional session to run in; the caller then owns the commit
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    async with async_unit_of_work(db, savepoint=True) as uow:
+        try:
+            result = await uow.session.execute(
+                update(Session).where(Session.id == session_id).values(is_active=False)
+            )
+            uow.after_commit(lambda: session_cache.invalidate(session_id))
+            await uow.commit()
+            return result.rowcount > 0
+            
+        except Exception:
+            await uow.rollback()
+            logger.exception("Error invalidating session")
+            return False
+
+
+@observe_operation
+async def invalidate_all_user_sessions_async(user_id: int, db: Optional[AsyncSession] = None) -> int:
+    """
+    Async version of invalidate_all_user_sessions
+    
+    Args:
+        user_id: The user ID
+        db: Optional session to run in; the caller then owns the commit
+    
+    Returns:
+        Number of sessions invalidated
+    """
+    async with async_unit_of_work(db, savepoint=True) as uow:
+        try:
+            result = await uow.session.execute(
+                update(Session).where(
+                    Session.user_id == user_id,
+                    Session.is_active == True
+                ).values(is_active=False)
+            )
+            uow.after_commit(lambda: session_cache.invalidate_user(user_id))
+            await uow.commit()
+            return result.rowcount
+            
+        except Exception:
+            await uow.rollback()
+            logger.exception("Error invalidating user sessions", extra={"user_id": user_id})
+            return 0
+
+
+@observe_operation
+async def invalidate_users_sessions_async(user_ids: Sequence[int], db: Optional[AsyncSession] = None) -> int:
+    """
+    Async version of invalidate_users_sessions
+    
+    Args:
+        user_ids: The user IDs
+        db: Optional session to run in; the caller then owns the commit
+    
+    Returns:
+        Number of sessions invalidated
+    """
+    if not user_ids:
         return 0
-    finally:
-        db.close()
+
+    async with async_unit_of_work(db) as uow:
+        result = await uow.session.execute(
+            _invalidate_users_statement(user_ids, uow.session.get_bind().dialect.name)
+        )
+        uow.after_commit(lambda: _evict_users(user_ids))
+        await uow.commit()
+        return result.rowcount
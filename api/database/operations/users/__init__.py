@@ -1,9 +1,17 @@
-from .store_user_appending_approval import store_user_pending_approval
-from .get_user_by_id import get_user_by_id
-from .get_user_by_discord_id import get_user_by_discord_id
+from .store_user_appending_approval import store_user_pending_approval, store_user_pending_approval_async
+from .get_user_by_id import get_user_by_id, get_user_by_id_async
+from .get_user_by_discord_id import get_user_by_discord_id, get_user_by_discord_id_async
+from .get_user_summary import get_user_summary, get_user_summary_async, get_user_summary_by_discord_id
 from .get_server_nickname_by_user_id import get_server_nickname_by_user_id
 from .is_user_approved import is_user_approved
-from .update_user_discord_info import update_user_discord_info
+from .update_user_discord_info import update_user_discord_info, update_user_discord_info_async
+from .list_users_by_status import list_users_by_status_async, stream_users_by_status
+from .bulk_update_user_status import (
+    ALLOWED_TRANSITIONS,
+    SESSION_REVOKING_STATUSES,
+    bulk_update_user_status_async
+)
+from .upsert_discord_user import UpsertedUser, upsert_discord_user, upsert_discord_user_async
 
 # As you create more files, add them here:
 # As you create more files, add them here:
@@ -0,0 +1,67 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, FrozenSet, List, Optional, Sequence
+from ...models.user import User, UserStatus
+from ...read_models import UserStatusChange
+from sqlalchemy import update, func, or_, false
+from ..filters import matches_any
+from ...unit_of_work import async_unit_of_work
+from ...query_metrics import observe_operation
+
+# Statuses each target status may be reached from
+ALLOWED_TRANSITIONS: Dict[UserStatus, FrozenSet[UserStatus]] = {
+    UserStatus.APPROVED: frozenset({UserStatus.PENDING, UserStatus.REJECTED, UserStatus.BANNED}),
+    UserStatus.REJECTED: frozenset({UserStatus.PENDING}),
+    UserStatus.BANNED: frozenset({UserStatus.PENDING, UserStatus.APPROVED, UserStatus.REJECTED}),
+}
+
+# Statuses that lose their sessions
+SESSION_REVOKING_STATUSES = frozenset({UserStatus.REJECTED, UserStatus.BANNED})
+
+
+@observe_operation
+async def bulk_update_user_status_async(
+    status: UserStatus,
+    user_ids: Sequence[int] = (),
+    discord_ids: Sequence[str] = (),
+    db: Optional[AsyncSession] = None
+) -> List[UserStatusChange]:
+    """
+    Move many users to a new status in one UPDATE ... RETURNING
+    Users are matched by ID or Discord ID; only users whose current status
+    may transition to the new one are updated, the rest are left as-is.
+    Errors propagate so a caller's transaction is never half-applied.
+    Params: status (UserStatus): The status to move users to
+            user_ids (Sequence[int]): User IDs to update
+            discord_ids (Sequence[str]): Discord IDs to update
+            db (AsyncSession, optional): Session to run in; the caller then owns the commit
+    Returns: List[UserStatusChange]: The users that were updated
+    Raises: ValueError: If no transition leads to status
+    """
+    sources = ALLOWED_TRANSITIONS.get(status)
+    if sources is None:
+        raise ValueError(f"Users cannot be moved to {status.value}")
+    if not user_ids and not discord_ids:
+        return []
+
+    async with async_unit_of_work(db) as uow:
+        dialect_name = uow.session.get_bind().dialect.name
+        matched = or_(
+            matches_any(User.id, user_ids, dialect_name) if user_ids else false(),
+            matches_any(User.discord_id, discord_ids, dialect_name) if discord_ids else false()
+        )
+
+        result = await uow.session.execute(
+            update(User)
+            .where(matched, User.status.in_(sources))
+            .values(
+                status=status,
+                updated_at=func.current_timestamp(),
+                # Leave last_login_at alone; its onupdate default is for logins
+                last_login_at=User.last_login_at
+            )
+            .returning(User.id, User.discord_id)
+            .execution_options(synchronize_session=False)
+        )
+        changes = [UserStatusChange(row.id, row.discord_id, status) for row in result]
+        await uow.commit()
+        return changes
@@ -1,23 +1,27 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import Optional, Dict, Any
+import logging
 from ...models.user import User, UserStatus
-from ...connection import SessionLocal
+from sqlalchemy import select
+from ...unit_of_work import unit_of_work
+from ...query_metrics import observe_operation
 
-def get_server_nickname_by_user_id(user_id: int) -> Optional[str]:
+logger = logging.getLogger(__name__)
+
+@observe_operation
+def get_server_nickname_by_user_id(user_id: int, db: Optional[Session] = None) -> Optional[str]:
     """
     Get the server nickname of a user by their ID
     Params: user_id (int): The ID of the user
+            db (Session, optional): Session to run in; the caller then owns the commit
     Returns: Optional[str]: The server nickname if found, otherwise None
     """
-    db: Session = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            return user.server_nickname
-        return None
-    except Exception as e:
-        print(f"Error retrieving server nickname for user ID {user_id}: {e}")
-        return None
-    finally:
-        db.close()
\ No newline at end of file
+    with unit_of_work(db) as uow:
+        try:
+            return uow.session.execute(
+                select(User.server_nickname).where(User.id == user_id)
+            ).scalar()
+        except Exception:
+            logger.exception("Error retrieving server nickname", extra={"user_id": user_id})
+            return None
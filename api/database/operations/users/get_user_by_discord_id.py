@@ -1,18 +1,32 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from typing import Optional, Dict, Any
 from ...models.user import User, UserStatus
-from ...connection import SessionLocal
+from sqlalchemy import select
+from ...unit_of_work import unit_of_work, async_unit_of_work
+from ...query_metrics import observe_operation
 
-def get_user_by_discord_id(discord_id: str) -> Optional[User]:
+@observe_operation
+def get_user_by_discord_id(discord_id: str, db: Optional[Session] = None) -> Optional[User]:
     """
     Get a user by their Discord ID
     Params: discord_id (str): The Discord ID of the user to retrieve
+            db (Session, optional): Session to run in; the caller then owns the commit
     Returns: Optional[User]: The user object if found, otherwise None
     """
-    db: Session = SessionLocal()
-    try:
-        user = db.query(User).filter(User.discord_id == discord_id).first()
+    with unit_of_work(db) as uow:
+        user = uow.session.query(User).filter(User.discord_id == discord_id).first()
         return user
-    finally:
-        db.close()
\ No newline at end of file
+
+@observe_operation
+async def get_user_by_discord_id_async(discord_id: str, db: Optional[AsyncSession] = None) -> Optional[User]:
+    """
+    Async version of get_user_by_discord_id
+    Params: discord_id (str): The Discord ID of the user to retrieve
+            db (AsyncSession, optional): Session to run in; the caller then owns the commit
+    Returns: Optional[User]: The user object if found, otherwise None
+    """
+    async with async_unit_of_work(db) as uow:
+        result = await uow.session.execute(select(User).where(User.discord_id == discord_id))
+        return result.scalars().first()
@@ -1,20 +1,42 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from typing import Optional, Dict, Any
+import logging
 from ...models.user import User, UserStatus
-from ...connection import SessionLocal
+from sqlalchemy import select
+from ...unit_of_work import unit_of_work, async_unit_of_work
+from ...query_metrics import observe_operation
 
-def get_user_by_id(user_id: int) -> Optional[User]:
+logger = logging.getLogger(__name__)
+
+@observe_operation
+def get_user_by_id(user_id: int, db: Optional[Session] = None) -> Optional[User]:
     """
     Get a user by their ID
     Params: user_id (int): The ID of the user to retrieve
+            db (Session, optional): Session to run in; the caller then owns the commit
+    Returns: User | None: The user object if found, otherwise None
+    """
+    with unit_of_work(db) as uow:
+        try:
+            user = uow.session.query(User).filter(User.id == user_id).first()
+            return user
+        except Exception:
+            logger.exception("Error retrieving user by ID", extra={"user_id": user_id})
+
+@observe_operation
+async def get_user_by_id_async(user_id: int, db: Optional[AsyncSession] = None) -> Optional[User]:
+    """
+    Async version of get_user_by_id
+    Params: user_id (int): The ID of the user to retrieve
+            db (AsyncSession, optional): Session to run in; the caller then owns the commit
     Returns: User | None: The user object if found, otherwise None
     """
-    db: Session = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        return user
-    except Exception as e:
-        print(f"Error retrieving user by ID {user_id}: {e}")
-    finally:
-        db.close()
\ No newline at end of file
+    async with async_unit_of_work(db) as uow:
+        try:
+            result = await uow.session.execute(select(User).where(User.id == user_id))
+            return result.scalars().first()
+        except Exception:
+            logger.exception("Error retrieving user by ID", extra={"user_id": user_id})
+            return None
@@ -0,0 +1,58 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import logging
+from ...models.user import User
+from ...read_models import UserSummary
+from sqlalchemy import select
+from ...unit_of_work import unit_of_work, async_unit_of_work
+from ...query_metrics import observe_operation
+
+logger = logging.getLogger(__name__)
+
+# Columns loaded for a UserSummary, in field order
+USER_SUMMARY_COLUMNS = (User.id, User.discord_username, User.server_nickname, User.status)
+
+@observe_operation
+def get_user_summary(user_id: int, db: Optional[Session] = None) -> Optional[UserSummary]:
+    """
+    Get the fields of a user read on request paths, without loading an ORM object
+    Params: user_id (int): The ID of the user to retrieve
+            db (Session, optional): Session to run in; the caller then owns the commit
+    Returns: Optional[UserSummary]: The user summary if found, otherwise None
+    """
+    with unit_of_work(db) as uow:
+        try:
+            row = uow.session.execute(select(*USER_SUMMARY_COLUMNS).where(User.id == user_id)).first()
+            return UserSummary(*row) if row else None
+        except Exception:
+            logger.exception("Error retrieving user summary", extra={"user_id": user_id})
+            return None
+
+@observe_operation
+async def get_user_summary_async(user_id: int, db: Optional[AsyncSession] = None) -> Optional[UserSummary]:
+    """
+    Async version of get_user_summary
+    Params: user_id (int): The ID of the user to retrieve
+            db (AsyncSession, optional): Session to run in; the caller then owns the commit
+    Returns: Optional[UserSummary]: The user summary if found, otherwise None
+    """
+    async with async_unit_of_work(db) as uow:
+        try:
+            row = (await uow.session.execute(select(*USER_SUMMARY_COLUMNS).where(User.id == user_id))).first()
+            return UserSummary(*row) if row else None
+        except Exception:
+            logger.exception("Error retrieving user summary", extra={"user_id": user_id})
+            return None
+
+@observe_operation
+def get_user_summary_by_discord_id(discord_id: str, db: Optional[Session] = None) -> Optional[UserSummary]:
+    """
+    Get the fields of a user read on request paths by their Discord ID
+    Params: discord_id (str): The Discord ID of the user to retrieve
+            db (Session, optional): Session to run in; the caller then owns the commit
+    Returns: Optional[UserSummary]: The user summary if found, otherwise None
+    """
+    with unit_of_work(db) as uow:
+        row = uow.session.execute(select(*USER_SUMMARY_COLUMNS).where(User.discord_id == discord_id)).first()
+        return UserSummary(*row) if row else None
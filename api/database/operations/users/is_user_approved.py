@@ -1,8 +1,7 @@
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from typing import Optional, Dict, Any
+import logging
 from ...models.user import User, UserStatus
-from ...connection import SessionLocal
+
+logger = logging.getLogger(__name__)
 
 def is_user_approved(user: User) -> bool:
     """
@@ -14,6 +13,6 @@ def is_user_approved(user: User) -> bool:
         if user and user.status == UserStatus.APPROVED:
             return True
         return False
-    except Exception as e:
-        print(f"Error checking user approval status: {e}")
+    except Exception:
+        logger.exception("Error checking user approval status")
         return False
\ No newline at end of file
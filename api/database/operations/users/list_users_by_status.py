@@ -0,0 +1,75 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional, Tuple
+from datetime import datetime
+from ...models.user import User, UserStatus
+from ...read_models import UserListItem
+from sqlalchemy import select, tuple_
+from ...unit_of_work import async_unit_of_work
+from ...query_metrics import observe_operation
+
+# Columns loaded for a UserListItem, in field order
+USER_LIST_COLUMNS = (
+    User.id,
+    User.discord_id,
+    User.discord_username,
+    User.server_nickname,
+    User.email,
+    User.status,
+    User.created_at
+)
+
+
+def _users_by_status(status: UserStatus):
+    return select(*USER_LIST_COLUMNS).where(User.status == status).order_by(User.created_at, User.id)
+
+
+@observe_operation
+async def list_users_by_status_async(
+    status: UserStatus,
+    limit: int = 50,
+    after: Optional[Tuple[datetime, int]] = None,
+    db: Optional[AsyncSession] = None
+) -> List[UserListItem]:
+    """
+    List users with a status, oldest first, one keyset page at a time
+    The page starts after the (created_at, id) of the previous page's last
+    row, so every page is an index seek whatever its depth.
+    Params: status (UserStatus): The status to filter by
+            limit (int): Maximum number of users to return
+            after (Tuple[datetime, int], optional): (created_at, id) of the last row already seen
+            db (AsyncSession, optional): Session to run in; the caller then owns the commit
+    Returns: List[UserListItem]: Up to limit users
+    """
+    statement = _users_by_status(status).limit(limit)
+    if after is not None:
+        # Bind with the column types so SQLite compares timestamps in its stored format
+        statement = statement.where(
+            tuple_(User.created_at, User.id) > tuple_(*after, types=[User.created_at.type, User.id.type])
+        )
+
+    async with async_unit_of_work(db) as uow:
+        result = await uow.session.execute(statement)
+        return [UserListItem(*row) for row in result]
+
+
+@observe_operation
+async def stream_users_by_status(
+    status: UserStatus,
+    batch_size: int = 1000,
+    db: Optional[AsyncSession] = None
+) -> AsyncIterator[List[UserListItem]]:
+    """
+    Stream every user with a status in batches, oldest first
+    Rows are fetched through a server-side cursor batch_size at a time, so
+    memory use does not grow with the table.
+    Params: status (UserStatus): The status to filter by
+            batch_size (int): Rows fetched per round-trip
+            db (AsyncSession, optional): Session to run in; the caller then owns the commit
+    Returns: AsyncIterator[List[UserListItem]]: Batches of users
+    """
+    async with async_unit_of_work(db) as uow:
+        result = await uow.session.stream(
+            _users_by_status(status).execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield [UserListItem(*row) for row in partition]
@@ -1,36 +1,72 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from typing import Optional, Dict, Any
+import logging
 from ...models.user import User, UserStatus
-from ...connection import SessionLocal
+from ...unit_of_work import unit_of_work, async_unit_of_work
+from ...query_metrics import observe_operation
 
+logger = logging.getLogger(__name__)
 
-def store_user_pending_approval(user_data: Dict[str, Any]) -> Optional[User]:
+
+@observe_operation
+def store_user_pending_approval(user_data: Dict[str, Any], db: Optional[Session] = None) -> Optional[User]:
     """
     Store user data pending admin approval
     Params: user_data (Dict[str, Any]): The user data to store
+            db (Session, optional): Session to run in; the caller then owns the commit
+    Returns: Optional[User]: The created user object if successful, None otherwise
+    """
+    with unit_of_work(db, savepoint=True) as uow:
+        try:
+            user = User(
+                discord_id=user_data.get("id"),
+                discord_username=user_data.get("username"),
+                server_nickname=user_data.get("server_nickname"),  # Include server nickname
+                email=user_data.get("email"),
+                status=UserStatus.PENDING
+            )
+            uow.session.add(user)
+            uow.commit()
+            uow.session.refresh(user)
+            return user
+        except IntegrityError as e:
+            uow.rollback()
+            logger.warning("Integrity error storing user pending approval", extra={"error": type(e.orig).__name__})
+            return None
+        except Exception:
+            uow.rollback()
+            logger.exception("Error storing user pending approval")
+            return None
+
+
+@observe_operation
+async def store_user_pending_approval_async(user_data: Dict[str, Any], db: Optional[AsyncSession] = None) -> Optional[User]:
+    """
+    Async version of store_user_pending_approval
+    Params: user_data (Dict[str, Any]): The user data to store
+            db (AsyncSession, optional): Session to run in; the caller then owns the commit
     Returns: Optional[User]: The created user object if successful, None otherwise
     """
-    db: Session = SessionLocal()
-    try:
-        user = User(
-            discord_id=user_data.get("id"),
-            discord_username=user_data.get("username"),
-            server_nickname=user_data.get("server_nickname"),  # Include server nickname
-            email=user_data.get("email"),
-            status=UserStatus.PENDING
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        return user
-    except IntegrityError as e:
-        db.rollback()
-        print(f"Integrity error storing user pending approval: {e.orig}")
-        return None
-    except Exception as e:
-        db.rollback()
-        print(f"Error storing user pending approval: {e}")
-        return None
-    finally:
-        db.close()
\ No newline at end of file
+    async with async_unit_of_work(db, savepoint=True) as uow:
+        try:
+            user = User(
+                discord_id=user_data.get("id"),
+                discord_username=user_data.get("username"),
+                server_nickname=user_data.get("server_nickname"),
+                email=user_data.get("email"),
+                status=UserStatus.PENDING
+            )
+            uow.session.add(user)
+            await uow.commit()
+            await uow.session.refresh(user)
+            return user
+        except IntegrityError as e:
+            await uow.rollback()
+            logger.warning("Integrity error storing user pending approval", extra={"error": type(e.orig).__name__})
+            return None
+        except Exception:
+            await uow.rollback()
+            logger.exception("Error storing user pending approval")
+            return None
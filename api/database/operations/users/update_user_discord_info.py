@@ -1,14 +1,18 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from typing import Optional, Dict, Any
 from ...models.user import User, UserStatus
-from ...connection import SessionLocal
+from sqlalchemy import select
+from ...unit_of_work import unit_of_work, async_unit_of_work
+from ...query_metrics import observe_operation
 
-def update_user_discord_info(user_id: int, discord_data: Dict[str, Any]) -> bool:
+@observe_operation
+def update_user_discord_info(user_id: int, discord_data: Dict[str, Any], db: Optional[Session] = None) -> bool:
     """Update Discord-related information for a user in the database."""
-    try:
-        with SessionLocal() as session:
-            user = session.query(User).filter(User.id == user_id).first()
+    with unit_of_work(db, savepoint=True) as uow:
+        try:
+            user = uow.session.query(User).filter(User.id == user_id).first()
             if not user:
                 return False
 
@@ -16,8 +20,29 @@ def update_user_discord_info(user_id: int, discord_data: Dict[str, Any]) -> bool
             user.email = discord_data.get('email')
             user.server_nickname = discord_data.get('server_nickname')
 
-            session.commit()
+            uow.commit()
             return True
-    except IntegrityError:
-        session.rollback()
-        return False
\ No newline at end of file
+        except IntegrityError:
+            uow.rollback()
+            return False
+
+
+@observe_operation
+async def update_user_discord_info_async(user_id: int, discord_data: Dict[str, Any], db: Optional[AsyncSession] = None) -> bool:
+    """Async version of update_user_discord_info."""
+    async with async_unit_of_work(db, savepoint=True) as uow:
+        try:
+            result = await uow.session.execute(select(User).where(User.id == user_id))
+            user = result.scalars().first()
+            if not user:
+                return False
+
+            user.discord_username = discord_data.get('username')
+            user.email = discord_data.get('email')
+            user.server_nickname = discord_data.get('server_nickname')
+
+            await uow.commit()
+            return True
+        except IntegrityError:
+            await uow.rollback()
+            return False
@@ -0,0 +1,142 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, exists, or_, false, func, literal_column, Boolean
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+import logging
+from ...models.user import User, UserStatus
+from ...unit_of_work import unit_of_work, async_unit_of_work
+from ...query_metrics import observe_operation
+
+logger = logging.getLogger(__name__)
+
+# Discord fields kept in sync on every login
+SYNCED_FIELDS = ("discord_username", "server_nickname", "email")
+
+
+@dataclass(frozen=True)
+class UpsertedUser:
+    """Outcome of syncing a Discord user: the row's id and status, and whether it was just created"""
+    id: int
+    status: UserStatus
+    created: bool
+
+
+def _discord_values(discord_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "discord_id": discord_data.get("id"),
+        "discord_username": discord_data.get("username"),
+        "server_nickname": discord_data.get("server_nickname"),
+        "email": discord_data.get("email"),
+    }
+
+
+def _upsert(dialect_insert, discord_data: Dict[str, Any]):
+    """
+    INSERT a pending user, or on a discord_id conflict UPDATE the synced
+    fields - but only when one of them actually differs, so unchanged
+    logins do not write a new row version
+    """
+    stmt = dialect_insert(User).values(**_discord_values(discord_data), status=UserStatus.PENDING)
+    changed = or_(*(
+        getattr(User, field).is_distinct_from(getattr(stmt.excluded, field))
+        for field in SYNCED_FIELDS
+    ))
+    return stmt.on_conflict_do_update(
+        index_elements=[User.discord_id],
+        set_={
+            **{field: getattr(stmt.excluded, field) for field in SYNCED_FIELDS},
+            "updated_at": func.current_timestamp(),
+            "last_login_at": func.current_timestamp(),
+        },
+        where=changed
+    )
+
+
+def _postgresql_upsert(discord_data: Dict[str, Any]):
+    """
+    One statement answering for all three cases: a new row (xmax = 0),
+    an updated row, or - when the conflict WHERE skipped the update and
+    RETURNING is empty - the existing row
+    """
+    upserted = _upsert(postgresql_insert, discord_data).returning(
+        User.id,
+        User.status,
+        literal_column("xmax = 0", Boolean).label("created")
+    ).cte("upserted")
+
+    unchanged = select(User.id, User.status, false().label("created")).where(
+        User.discord_id == discord_data.get("id"),
+        ~exists(select(upserted.c.id))
+    )
+    return select(upserted.c.id, upserted.c.status, upserted.c.created).union_all(unchanged)
+
+
+def _select_existing(discord_id: str):
+    return select(User.id, User.status).where(User.discord_id == discord_id)
+
+
+@observe_operation
+def upsert_discord_user(discord_data: Dict[str, Any], db: Optional[Session] = None) -> Optional[UpsertedUser]:
+    """
+    Create a pending user or sync an existing user's Discord fields in one round-trip
+    Params: discord_data (Dict[str, Any]): Discord user data, plus server_nickname
+            db (Session, optional): Session to run in; the caller then owns the commit
+    Returns: Optional[UpsertedUser]: The user's id, status and whether it was created, None on error
+    """
+    with unit_of_work(db, savepoint=True) as uow:
+        try:
+            discord_id = discord_data.get("id")
+            if uow.session.get_bind().dialect.name == "postgresql":
+                row = uow.session.execute(_postgresql_upsert(discord_data)).first()
+                if row is None:
+                    # A concurrent login inserted the row after this statement's snapshot
+                    row = uow.session.execute(_select_existing(discord_id)).first()
+                    row = row and (row.id, row.status, False)
+            else:
+                # SQLite cannot put the upsert in a CTE; check for the row first
+                existing = uow.session.execute(_select_existing(discord_id)).first()
+                upserted = uow.session.execute(
+                    _upsert(sqlite_insert, discord_data).returning(User.id, User.status)
+                ).first()
+                row = upserted or existing
+                row = row and (row.id, row.status, existing is None)
+            uow.commit()
+            return UpsertedUser(*row) if row else None
+        except Exception:
+            uow.rollback()
+            logger.exception("Error upserting Discord user")
+            return None
+
+
+@observe_operation
+async def upsert_discord_user_async(discord_data: Dict[str, Any], db: Optional[AsyncSession] = None) -> Optional[UpsertedUser]:
+    """
+    Async version of upsert_discord_user
+    Params: discord_data (Dict[str, Any]): Discord user data, plus server_nickname
+            db (AsyncSession, optional): Session to run in; the caller then owns the commit
+    Returns: Optional[UpsertedUser]: The user's id, status and whether it was created, None on error
+    """
+    async with async_unit_of_work(db, savepoint=True) as uow:
+        try:
+            discord_id = discord_data.get("id")
+            if uow.session.get_bind().dialect.name == "postgresql":
+                row = (await uow.session.execute(_postgresql_upsert(discord_data))).first()
+                if row is None:
+                    row = (await uow.session.execute(_select_existing(discord_id))).first()
+                    row = row and (row.id, row.status, False)
+            else:
+                existing = (await uow.session.execute(_select_existing(discord_id))).first()
+                upserted = (await uow.session.execute(
+                    _upsert(sqlite_insert, discord_data).returning(User.id, User.status)
+                )).first()
+                row = upserted or existing
+                row = row and (row.id, row.status, existing is None)
+            await uow.commit()
+            return UpsertedUser(*row) if row else None
+        except Exception:
+            await uow.rollback()
+            logger.exception("Error upserting Discord user")
+            return None
@@ -0,0 +1,118 @@
+from typing import Any, Dict
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """Counters recorded from SQLAlchemy pool events for one engine"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.overflow_events = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkout_wait_total += seconds
+            if seconds > self.checkout_wait_max:
+                self.checkout_wait_max = seconds
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        """Counters plus the live state of the given pool"""
+        live: Dict[str, Any] = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            live.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+
+        with self._lock:
+            waits = self.checkouts or 1
+            return {
+                **live,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "overflow_events": self.overflow_events,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_avg_ms": round(self.checkout_wait_total / waits * 1000, 3),
+                "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+            }
+
+
+# Stats per engine, keyed by the pool logging name
+_pool_stats: Dict[str, PoolStats] = {}
+
+
+def get_pool_stats(name: str) -> PoolStats:
+    """Return the stats object for a named pool, creating it on first use"""
+    if name not in _pool_stats:
+        _pool_stats[name] = PoolStats(name)
+    return _pool_stats[name]
+
+
+class _TimedCheckoutMixin:
+    """Measure how long callers wait for a pooled connection"""
+
+    def _do_get(self):
+        stats = get_pool_stats(self._orig_logging_name)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            stats.increment("checkout_timeouts")
+            raise
+        finally:
+            stats.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolStats:
+    """Record pool events for a (sync) engine under the given name"""
+    stats = get_pool_stats(name)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.increment("connects")
+        pool = engine.pool
+        if isinstance(pool, QueuePool) and pool.overflow() > 0:
+            stats.increment("overflow_events")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.increment("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        stats.increment("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.increment("invalidations")
+
+    return stats
@@ -0,0 +1,85 @@
+from contextvars import ContextVar
+from typing import Callable, TypeVar
+import functools
+import inspect
+import time
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+F = TypeVar("F", bound=Callable)
+
+# Name of the database operation whose statements are executing. Context
+# variables follow asyncio tasks and asyncio.to_thread, so statements are
+# attributed correctly under concurrency.
+current_operation: ContextVar[str] = ContextVar("current_operation", default="other")
+
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time by database operation",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+
+def observe_operation(func: F) -> F:
+    """
+    Attribute the SQL a database operation runs to the operation's name
+    Works on sync functions, coroutines and async generators.
+    """
+    name = func.__name__
+
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def async_gen_wrapper(*args, **kwargs):
+            # The generator body runs in the consumer's context, so only
+            # label the steps of the generator itself
+            generator = func(*args, **kwargs)
+            try:
+                while True:
+                    token = current_operation.set(name)
+                    try:
+                        item = await generator.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        current_operation.reset(token)
+                    yield item
+            finally:
+                await generator.aclose()
+        return async_gen_wrapper
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = current_operation.set(name)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                current_operation.reset(token)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = current_operation.set(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+    return wrapper
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Time every statement on a (sync) engine into DB_QUERY_SECONDS"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start", None)
+        if start is not None:
+            DB_QUERY_SECONDS.labels(current_operation.get()).observe(time.perf_counter() - start)
@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+import hashlib
+
+from .models.user import UserStatus
+
+
+# Read models are plain slotted dataclasses built from column-restricted
+# queries: no identity map entry, no instrumented attributes, and safe to
+# use after the session that loaded them is closed.
+
+
+@dataclass(frozen=True, slots=True)
+class UserSummary:
+    """The user fields read on request paths"""
+    id: int
+    discord_username: str
+    server_nickname: Optional[str]
+    status: UserStatus
+
+    def is_active(self) -> bool:
+        """Check if user is approved and not banned"""
+        return self.status == UserStatus.APPROVED
+
+
+@dataclass(frozen=True, slots=True)
+class SessionSummary:
+    """A session row without its timestamps of record"""
+    id: str
+    user_id: int
+    expires_at: datetime
+    is_active: bool
+
+    def is_expired(self) -> bool:
+        """Check if session is expired"""
+        return datetime.utcnow() > self.expires_at
+
+    def is_valid(self) -> bool:
+        """Check if session is valid (active and not expired)"""
+        return self.is_active and not self.is_expired()
+
+
+@dataclass(frozen=True, slots=True)
+class SessionUser:
+    """Snapshot of a validated session and the user it belongs to"""
+    id: int
+    discord_username: str
+    server_nickname: Optional[str]
+    status: UserStatus
+    expires_at: datetime
+    # Only the database-backed stores read it; snapshot stores leave it unset
+    updated_at: Optional[datetime] = None
+
+    def etag(self) -> str:
+        """Weak validator for the user data and session expiry served from /me"""
+        state = (self.id, self.discord_username, self.server_nickname, self.status.value, self.updated_at, self.expires_at)
+        return f'W/"{hashlib.blake2b(repr(state).encode(), digest_size=12).hexdigest()}"'
+
+
+@dataclass(frozen=True, slots=True)
+class UserListItem:
+    """A user as shown in admin listings"""
+    id: int
+    discord_id: str
+    discord_username: str
+    server_nickname: Optional[str]
+    email: Optional[str]
+    status: UserStatus
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class UserStatusChange:
+    """A user moved to a new status by a bulk update"""
+    id: int
+    discord_id: str
+    status: UserStatus
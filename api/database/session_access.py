@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Dict, Optional
+import asyncio
+import logging
+import os
+import threading
+
+# Sliding expiration configuration from environment variables
+SESSION_SLIDING_EXPIRATION = os.getenv("SESSION_SLIDING_EXPIRATION", "true").lower() == "true"
+SESSION_LIFETIME_DAYS = int(os.getenv("SESSION_LIFETIME_DAYS", "7"))
+SESSION_ACCESS_FLUSH_SECONDS = float(os.getenv("SESSION_ACCESS_FLUSH_SECONDS", "60"))
+
+logger = logging.getLogger(__name__)
+
+
+class SessionAccessBuffer:
+    """
+    Buffer session access times in memory and write them in batches
+
+    Only the latest access per session is kept, so each session costs at
+    most one row update per flush interval and requests never wait on a
+    write. The buffer is flushed periodically and at shutdown.
+    """
+
+    def __init__(self, flush_interval: float = SESSION_ACCESS_FLUSH_SECONDS):
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.rows_written = 0
+
+    def record(self, session_id: str) -> None:
+        with self._lock:
+            self._pending[session_id] = datetime.utcnow()
+
+    def drain(self) -> Dict[str, datetime]:
+        """Take all pending access times, leaving the buffer empty"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """Write pending access times to the database; returns rows updated"""
+        from .operations.session_operations import update_sessions_last_accessed
+
+        pending = self.drain()
+        if not pending:
+            return 0
+
+        updated = update_sessions_last_accessed(pending)
+        self.flushes += 1
+        self.rows_written += updated
+        return updated
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.pending,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written
+        }
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("Session access flush failed")
+
+
+# Process-wide buffer fed by update_session_access
+session_access_buffer = SessionAccessBuffer()
@@ -0,0 +1,149 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Set
+import os
+import threading
+import time
+
+from .read_models import SessionUser
+
+
+# Cache configuration from environment variables; the TTL also bounds how
+# long a revoked session keeps working on other workers (see SessionCache)
+SESSION_CACHE_MAX_SIZE = int(os.getenv("SESSION_CACHE_MAX_SIZE", "10000"))
+SESSION_CACHE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_TTL_SECONDS", "60"))
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Drop tzinfo so expires_at can be compared with datetime.utcnow()"""
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+class SessionCache:
+    """
+    Bounded in-process LRU cache of validated sessions keyed by session ID
+
+    Entries live for at most ttl_seconds and never past the session's
+    expires_at.
+
+    Revocation is not immediate across workers. The cache is per process:
+    logging out or banning evicts entries only in the process that made
+    the change, and only once its transaction commits. Every other worker
+    keeps authenticating the revoked session until its entry times out,
+    for up to SESSION_CACHE_TTL_SECONDS. Set that to 0 where a revoked
+    session must stop working at once everywhere.
+    """
+
+    def __init__(self, max_size: int = SESSION_CACHE_MAX_SIZE, ttl_seconds: float = SESSION_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[SessionUser, float]]" = OrderedDict()
+        self._user_sessions: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, session_id: str) -> Optional[SessionUser]:
+        """Return the cached snapshot or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            session_user, deadline = entry
+            if time.monotonic() >= deadline:
+                self._remove(session_id)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return session_user
+
+    def set(self, session_id: str, session_user: SessionUser) -> None:
+        """Cache a snapshot until the TTL or the session expiry, whichever is first"""
+        if not self.enabled:
+            return
+
+        remaining = (_naive_utc(session_user.expires_at) - datetime.utcnow()).total_seconds()
+        ttl = min(self.ttl_seconds, remaining)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if session_id in self._entries:
+                self._remove(session_id)
+            self._entries[session_id] = (session_user, time.monotonic() + ttl)
+            self._user_sessions.setdefault(session_user.id, set()).add(session_id)
+
+            while len(self._entries) > self.max_size:
+                oldest_id = next(iter(self._entries))
+                self._remove(oldest_id)
+                self.evictions += 1
+
+    def invalidate(self, session_id: str) -> None:
+        """Evict a single session"""
+        with self._lock:
+            if self._remove(session_id):
+                self.invalidations += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Evict every cached session belonging to a user"""
+        with self._lock:
+            for session_id in list(self._user_sessions.get(user_id, ())):
+                if self._remove(session_id):
+                    self.invalidations += 1
+
+    def evict_expired(self) -> None:
+        """Evict entries whose session has passed expires_at"""
+        now = datetime.utcnow()
+        with self._lock:
+            expired = [
+                session_id for session_id, (session_user, _) in self._entries.items()
+                if _naive_utc(session_user.expires_at) < now
+            ]
+            for session_id in expired:
+                if self._remove(session_id):
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._user_sessions.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for scraping"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _remove(self, session_id: str) -> bool:
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return False
+
+        user_id = entry[0].id
+        user_sessions = self._user_sessions.get(user_id)
+        if user_sessions is not None:
+            user_sessions.discard(session_id)
+            if not user_sessions:
+                del self._user_sessions[user_id]
+        return True
+
+
+# Process-wide cache used by session operations
+session_cache = SessionCache()
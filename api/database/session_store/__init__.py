@@ -0,0 +1,52 @@
+from typing import Optional
+import os
+
+from .base import SessionStore
+from .sql_store import SqlSessionStore
+from .redis_store import RedisSessionStore
+from .signed_store import SignedSessionStore
+
+# Session backend from environment variables: "database" (default), "redis" or "signed"
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "database")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+SESSION_SIGNING_SECRET = os.getenv("SESSION_SIGNING_SECRET")
+SESSION_REVOCATION_REFRESH_SECONDS = float(os.getenv("SESSION_REVOCATION_REFRESH_SECONDS", "30"))
+
+_session_store: Optional[SessionStore] = None
+
+
+def create_session_store(backend: str = SESSION_BACKEND) -> SessionStore:
+    """Build the session store for the configured backend"""
+    if backend == "database":
+        return SqlSessionStore()
+    if backend == "redis":
+        import redis
+        return RedisSessionStore(redis.Redis.from_url(REDIS_URL))
+    if backend == "signed":
+        return SignedSessionStore(SESSION_SIGNING_SECRET, SESSION_REVOCATION_REFRESH_SECONDS)
+    raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store, creating it on first use"""
+    global _session_store
+    if _session_store is None:
+        _session_store = create_session_store()
+    return _session_store
+
+
+def set_session_store(store: Optional[SessionStore]) -> None:
+    """Override the process-wide session store (None resets to configuration)"""
+    global _session_store
+    _session_store = store
+
+
+__all__ = [
+    "SessionStore",
+    "SqlSessionStore",
+    "RedisSessionStore",
+    "SignedSessionStore",
+    "create_session_store",
+    "get_session_store",
+    "set_session_store"
+]
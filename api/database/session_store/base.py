@@ -0,0 +1,83 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..session_cache import SessionUser
+from ..session_access import SESSION_LIFETIME_DAYS
+
+
+class SessionStore(ABC):
+    """
+    Interface for session storage backends
+
+    The *_async methods are awaited by request handlers. By default they run
+    the sync method in a worker thread; backends with a native async client
+    override them. Request handlers pass their unit of work as `db`;
+    backends that keep sessions in the database run in it, others ignore it.
+    """
+
+    @abstractmethod
+    def create(self, user_id: int, expires_in_days: int = SESSION_LIFETIME_DAYS) -> Optional[str]:
+        """Create a session for the user and return its ID, or None on failure"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[SessionUser]:
+        """Return the user snapshot for a valid session, or None"""
+
+    @abstractmethod
+    def invalidate(self, session_id: str) -> bool:
+        """Invalidate a single session, returning True if it existed"""
+
+    @abstractmethod
+    def invalidate_user(self, user_id: int) -> int:
+        """Invalidate every session for a user, returning how many were invalidated"""
+
+    @abstractmethod
+    def cleanup(self) -> int:
+        """Remove expired session data, returning how many entries were removed"""
+
+    def invalidate_users(self, user_ids: Sequence[int]) -> int:
+        """
+        Invalidate every session for many users, returning how many were invalidated
+        Backends override this with a set-based version
+        """
+        return sum(self.invalidate_user(user_id) for user_id in user_ids)
+
+    def touch(self, session_id: str) -> bool:
+        """
+        Record session activity for sliding expiration (optional)
+        Returns True if the session's expiry will slide forward
+        """
+        return False
+
+    def ping(self) -> bool:
+        """
+        Check the backend's own storage is reachable (optional)
+        Backends that keep sessions in the database are covered by its check
+        """
+        return True
+
+    async def start(self) -> None:
+        """Start background work at application startup (optional)"""
+
+    async def stop(self) -> None:
+        """Stop background work at application shutdown (optional)"""
+
+    async def create_async(self, user_id: int, expires_in_days: int = SESSION_LIFETIME_DAYS, db: Optional[AsyncSession] = None) -> Optional[str]:
+        return await asyncio.to_thread(self.create, user_id, expires_in_days)
+
+    async def get_async(self, session_id: str, db: Optional[AsyncSession] = None) -> Optional[SessionUser]:
+        return await asyncio.to_thread(self.get, session_id)
+
+    async def invalidate_async(self, session_id: str, db: Optional[AsyncSession] = None) -> bool:
+        return await asyncio.to_thread(self.invalidate, session_id)
+
+    async def invalidate_user_async(self, user_id: int) -> int:
+        return await asyncio.to_thread(self.invalidate_user, user_id)
+
+    async def invalidate_users_async(self, user_ids: Sequence[int], db: Optional[AsyncSession] = None) -> int:
+        return await asyncio.to_thread(self.invalidate_users, user_ids)
+
+    async def cleanup_async(self) -> int:
+        return await asyncio.to_thread(self.cleanup)
@@ -0,0 +1,177 @@
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+import json
+import logging
+import secrets
+
+from ..models.user import UserStatus
+from ..session_cache import SessionUser
+from ..session_access import SESSION_LIFETIME_DAYS
+from ..operations.users.get_user_summary import get_user_summary
+from .base import SessionStore
+
+logger = logging.getLogger(__name__)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Session store backed by Redis
+
+    Each session is a JSON snapshot of the user under `session:{id}` with a
+    native key TTL matching the session expiry, so reads never touch the
+    relational DB. A `user_sessions:{user_id}` set tracks a user's session
+    IDs for bulk revocation.
+    """
+
+    def __init__(self, client, key_prefix: str = ""):
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def _session_key(self, session_id: str) -> str:
+        return f"{self.key_prefix}session:{session_id}"
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self.key_prefix}user_sessions:{user_id}"
+
+    def create(self, user_id: int, expires_in_days: int = SESSION_LIFETIME_DAYS) -> Optional[str]:
+        # The user snapshot is read once here so that get() can skip the DB
+        user = get_user_summary(user_id)
+        if not user:
+            return None
+
+        try:
+            session_id = secrets.token_urlsafe(32)
+            ttl = timedelta(days=expires_in_days)
+            payload = json.dumps({
+                "id": user.id,
+                "discord_username": user.discord_username,
+                "server_nickname": user.server_nickname,
+                "status": user.status.value,
+                "expires_at": (datetime.utcnow() + ttl).isoformat()
+            })
+
+            # The user index has no TTL; cleanup() prunes expired IDs and
+            # Redis drops the set once it is empty
+            pipe = self.client.pipeline()
+            pipe.set(self._session_key(session_id), payload, ex=ttl)
+            pipe.sadd(self._user_key(user_id), session_id)
+            pipe.execute()
+
+            return session_id
+
+        except Exception:
+            logger.exception("Error creating session in Redis")
+            return None
+
+    def get(self, session_id: str) -> Optional[SessionUser]:
+        try:
+            payload = self.client.get(self._session_key(session_id))
+        except Exception:
+            logger.exception("Error retrieving session from Redis")
+            return None
+
+        if payload is None:
+            return None
+
+        data = json.loads(payload)
+        return SessionUser(
+            id=data["id"],
+            discord_username=data["discord_username"],
+            server_nickname=data["server_nickname"],
+            status=UserStatus(data["status"]),
+            expires_at=datetime.fromisoformat(data["expires_at"])
+        )
+
+    def invalidate(self, session_id: str) -> bool:
+        try:
+            session_key = self._session_key(session_id)
+            payload = self.client.get(session_key)
+            if payload is None:
+                return False
+
+            user_id = json.loads(payload)["id"]
+            pipe = self.client.pipeline()
+            pipe.delete(session_key)
+            pipe.srem(self._user_key(user_id), session_id)
+            pipe.execute()
+            return True
+
+        except Exception:
+            logger.exception("Error invalidating session in Redis")
+            return False
+
+    def invalidate_user(self, user_id: int) -> int:
+        try:
+            user_key = self._user_key(user_id)
+            session_ids = self.client.smembers(user_key)
+            if not session_ids:
+                return 0
+
+            pipe = self.client.pipeline()
+            pipe.delete(*[self._session_key(self._decode(sid)) for sid in session_ids])
+            pipe.delete(user_key)
+            deleted_count, _ = pipe.execute()
+            return deleted_count
+
+        except Exception:
+            logger.exception("Error invalidating user sessions in Redis", extra={"user_id": user_id})
+            return 0
+
+    def invalidate_users(self, user_ids: Sequence[int]) -> int:
+        """
+        Invalidate many users' sessions in two pipelined round-trips
+        Errors propagate so a bulk status change can be rolled back
+        """
+        if not user_ids:
+            return 0
+
+        user_keys = [self._user_key(user_id) for user_id in user_ids]
+        pipe = self.client.pipeline()
+        for user_key in user_keys:
+            pipe.smembers(user_key)
+        session_keys = [
+            self._session_key(self._decode(session_id))
+            for members in pipe.execute()
+            for session_id in members
+        ]
+
+        pipe = self.client.pipeline()
+        if session_keys:
+            pipe.delete(*session_keys)
+        pipe.delete(*user_keys)
+        results = pipe.execute()
+        return results[0] if session_keys else 0
+
+    def cleanup(self) -> int:
+        """
+        Expired sessions are removed by Redis key TTLs; this only prunes
+        session IDs left behind in the per-user index sets
+        """
+        removed = 0
+        try:
+            for user_key in self.client.scan_iter(match=self._user_key("*")):
+                session_ids = [self._decode(sid) for sid in self.client.smembers(user_key)]
+                if not session_ids:
+                    continue
+
+                pipe = self.client.pipeline()
+                for session_id in session_ids:
+                    pipe.exists(self._session_key(session_id))
+                exists = pipe.execute()
+
+                stale = [sid for sid, alive in zip(session_ids, exists) if not alive]
+                if stale:
+                    removed += self.client.srem(user_key, *stale)
+
+            return removed
+
+        except Exception:
+            logger.exception("Error cleaning up Redis session index")
+            return removed
+
+    def ping(self) -> bool:
+        return bool(self.client.ping())
+
+    @staticmethod
+    def _decode(value) -> str:
+        return value.decode() if isinstance(value, bytes) else value
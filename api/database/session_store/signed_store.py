@@ -0,0 +1,197 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Sequence
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import threading
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.user import UserStatus
+from ..session_cache import SessionUser
+from ..session_access import SESSION_LIFETIME_DAYS
+from ..operations import session_operations
+from ..operations.users.get_user_summary import get_user_summary, get_user_summary_async
+from .base import SessionStore
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _is_session_payload(payload: Any) -> bool:
+    """Whether a decoded token carries every session field with the expected type"""
+    if not isinstance(payload, dict):
+        return False
+    if not isinstance(payload.get("sid"), str) or not isinstance(payload.get("name"), str):
+        return False
+    if not isinstance(payload.get("nick"), (str, type(None))):
+        return False
+    if type(payload.get("uid")) is not int or type(payload.get("exp")) is not int:
+        return False
+    if payload.get("st") not in {status.value for status in UserStatus}:
+        return False
+    try:
+        datetime.utcfromtimestamp(payload["exp"])
+    except (OverflowError, OSError, ValueError):
+        return False
+    return True
+
+
+class SignedSessionStore(SessionStore):
+    """
+    Stateless sessions carried in an HMAC-signed cookie
+
+    The token holds the session ID, user snapshot and expiry, so get() is
+    answered from the cookie alone. A `sessions` row is still written at
+    login and marked inactive on revocation; inactive, unexpired session
+    IDs form an in-memory denylist that start() refreshes every
+    refresh_interval seconds, so revocations on other workers take effect
+    within one interval.
+    """
+
+    def __init__(self, secret: str, refresh_interval: float = 30):
+        if not secret:
+            raise ValueError("SESSION_SIGNING_SECRET is required for signed sessions")
+        self._key = secret.encode()
+        self.refresh_interval = refresh_interval
+        self._revoked: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        body = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        return f"{body}.{self._sign(body)}"
+
+    def decode(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the payload of a correctly signed, well-formed token, None otherwise"""
+        body, _, signature = token.partition(".")
+        try:
+            # Compare bytes: compare_digest rejects non-ASCII str
+            if not signature or not hmac.compare_digest(signature.encode(), self._sign(body).encode()):
+                return None
+            payload = json.loads(_b64decode(body))
+        except (UnicodeError, ValueError):
+            return None
+        return payload if _is_session_payload(payload) else None
+
+    def create(self, user_id: int, expires_in_days: int = SESSION_LIFETIME_DAYS) -> Optional[str]:
+        user = get_user_summary(user_id)
+        if not user:
+            return None
+
+        session_id = session_operations.create_session(user_id, expires_in_days)
+        return self._token(session_id, user, expires_in_days)
+
+    async def create_async(self, user_id: int, expires_in_days: int = SESSION_LIFETIME_DAYS, db: Optional[AsyncSession] = None) -> Optional[str]:
+        user = await get_user_summary_async(user_id, db=db)
+        if not user:
+            return None
+
+        session_id = await session_operations.create_session_async(user_id, expires_in_days, db=db)
+        return self._token(session_id, user, expires_in_days)
+
+    def get(self, session_id: str) -> Optional[SessionUser]:
+        payload = self.decode(session_id)
+        if payload is None:
+            return None
+
+        expires_at = datetime.utcfromtimestamp(payload["exp"])
+        if expires_at <= datetime.utcnow() or payload["sid"] in self._revoked:
+            return None
+
+        return SessionUser(
+            id=payload["uid"],
+            discord_username=payload["name"],
+            server_nickname=payload["nick"],
+            status=UserStatus(payload["st"]),
+            expires_at=expires_at
+        )
+
+    async def get_async(self, session_id: str, db: Optional[AsyncSession] = None) -> Optional[SessionUser]:
+        # No I/O, so no need for a worker thread
+        return self.get(session_id)
+
+    def invalidate(self, session_id: str) -> bool:
+        payload = self.decode(session_id)
+        if payload is None:
+            return False
+
+        invalidated = session_operations.invalidate_session(payload["sid"])
+        with self._lock:
+            self._revoked[payload["sid"]] = datetime.utcfromtimestamp(payload["exp"])
+        return invalidated
+
+    def invalidate_user(self, user_id: int) -> int:
+        invalidated = session_operations.invalidate_all_user_sessions(user_id)
+        self.refresh()
+        return invalidated
+
+    def invalidate_users(self, user_ids: Sequence[int]) -> int:
+        invalidated = session_operations.invalidate_users_sessions(user_ids)
+        self.refresh()
+        return invalidated
+
+    async def invalidate_users_async(self, user_ids: Sequence[int], db: Optional[AsyncSession] = None) -> int:
+        # Rows written in the caller's transaction are not visible to a
+        # refresh yet; the refresh loop picks them up after the commit
+        return await session_operations.invalidate_users_sessions_async(user_ids, db=db)
+
+    def cleanup(self) -> int:
+        now = datetime.utcnow()
+        with self._lock:
+            self._revoked = {sid: exp for sid, exp in self._revoked.items() if exp > now}
+        return session_operations.cleanup_expired_sessions()
+
+    def refresh(self) -> None:
+        """Reload the denylist from the database"""
+        revoked = session_operations.get_revoked_session_ids()
+        if revoked is None:
+            # Keep the previous list rather than un-revoking sessions
+            return
+        with self._lock:
+            self._revoked = dict(revoked)
+
+    @property
+    def revoked_count(self) -> int:
+        return len(self._revoked)
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self.refresh)
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await asyncio.to_thread(self.refresh)
+
+    def _sign(self, body: str) -> str:
+        return _b64encode(hmac.new(self._key, body.encode(), hashlib.sha256).digest())
+
+    def _token(self, session_id: Optional[str], user, expires_in_days: int) -> Optional[str]:
+        if not session_id:
+            return None
+
+        expires_at = datetime.utcnow() + timedelta(days=expires_in_days)
+        return self.encode({
+            "sid": session_id,
+            "uid": user.id,
+            "name": user.discord_username,
+            "nick": user.server_nickname,
+            "st": user.status.value,
+            "exp": int(expires_at.replace(tzinfo=timezone.utc).timestamp())
+        })
@@ -0,0 +1,47 @@
+from typing import Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..session_cache import SessionUser
+from ..session_access import SESSION_LIFETIME_DAYS
+from ..operations import session_operations
+from .base import SessionStore
+
+
+class SqlSessionStore(SessionStore):
+    """Session store backed by the relational `sessions` table"""
+
+    def create(self, user_id: int, expires_in_days: int = SESSION_LIFETIME_DAYS) -> Optional[str]:
+        return session_operations.create_session(user_id, expires_in_days)
+
+    def get(self, session_id: str) -> Optional[SessionUser]:
+        return session_operations.get_valid_session_user(session_id)
+
+    def invalidate(self, session_id: str) -> bool:
+        return session_operations.invalidate_session(session_id)
+
+    def invalidate_user(self, user_id: int) -> int:
+        return session_operations.invalidate_all_user_sessions(user_id)
+
+    def invalidate_users(self, user_ids: Sequence[int]) -> int:
+        return session_operations.invalidate_users_sessions(user_ids)
+
+    def touch(self, session_id: str) -> bool:
+        return session_operations.update_session_access(session_id)
+
+    def cleanup(self) -> int:
+        return session_operations.cleanup_expired_sessions()
+
+    async def create_async(self, user_id: int, expires_in_days: int = SESSION_LIFETIME_DAYS, db: Optional[AsyncSession] = None) -> Optional[str]:
+        return await session_operations.create_session_async(user_id, expires_in_days, db=db)
+
+    async def get_async(self, session_id: str, db: Optional[AsyncSession] = None) -> Optional[SessionUser]:
+        return await session_operations.get_valid_session_user_async(session_id, db=db)
+
+    async def invalidate_async(self, session_id: str, db: Optional[AsyncSession] = None) -> bool:
+        return await session_operations.invalidate_session_async(session_id, db=db)
+
+    async def invalidate_user_async(self, user_id: int) -> int:
+        return await session_operations.invalidate_all_user_sessions_async(user_id)
+
+    async def invalidate_users_async(self, user_ids: Sequence[int], db: Optional[AsyncSession] = None) -> int:
+        return await session_operations.invalidate_users_sessions_async(user_ids, db=db)
@@ -0,0 +1,118 @@
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import os
+import time
+
+from .operations.session_operations import delete_expired_sessions_batch
+from .session_cache import session_cache
+from .session_store import SESSION_BACKEND
+
+# Sweeper configuration from environment variables
+SESSION_SWEEP_ENABLED = os.getenv("SESSION_SWEEP_ENABLED", "true").lower() == "true"
+SESSION_SWEEP_INTERVAL_SECONDS = float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "3600"))
+SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "1000"))
+SESSION_SWEEP_PAUSE_SECONDS = float(os.getenv("SESSION_SWEEP_PAUSE_SECONDS", "0.5"))
+SESSION_SWEEP_MAX_BATCHES = int(os.getenv("SESSION_SWEEP_MAX_BATCHES", "1000"))
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSweeper:
+    """
+    Periodically delete expired sessions in bounded batches
+
+    Each batch is its own short transaction, followed by a pause, so a
+    large backlog never holds locks for long. Batches take an advisory
+    lock, so concurrent workers skip a run another worker is doing.
+    """
+
+    def __init__(
+        self,
+        interval: float = SESSION_SWEEP_INTERVAL_SECONDS,
+        batch_size: int = SESSION_SWEEP_BATCH_SIZE,
+        pause: float = SESSION_SWEEP_PAUSE_SECONDS,
+        max_batches: int = SESSION_SWEEP_MAX_BATCHES,
+        include_inactive: bool = True
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause = pause
+        self.max_batches = max_batches
+        self.include_inactive = include_inactive
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.batches = 0
+        self.rows_removed = 0
+        self.skipped_runs = 0
+        self.last_run_rows = 0
+        self.last_run_seconds = 0.0
+
+    async def run_once(self) -> int:
+        """Sweep until a batch comes back short; returns rows removed"""
+        session_cache.evict_expired()
+        run_start = time.perf_counter()
+        removed = 0
+
+        for batch_number in range(1, self.max_batches + 1):
+            batch_start = time.perf_counter()
+            deleted = await asyncio.to_thread(
+                delete_expired_sessions_batch, self.batch_size, self.include_inactive
+            )
+            if deleted is None:
+                logger.info("Session sweep skipped: another worker holds the lock")
+                self.skipped_runs += 1
+                break
+
+            elapsed_ms = (time.perf_counter() - batch_start) * 1000
+            logger.info("Session sweep batch finished", extra={
+                "batch": batch_number, "rows": deleted, "elapsed_ms": round(elapsed_ms, 1)
+            })
+            removed += deleted
+            self.batches += 1
+
+            if deleted < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+
+        self.runs += 1
+        self.rows_removed += removed
+        self.last_run_rows = removed
+        self.last_run_seconds = time.perf_counter() - run_start
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "batches": self.batches,
+            "rows_removed": self.rows_removed,
+            "skipped_runs": self.skipped_runs,
+            "last_run_rows": self.last_run_rows,
+            "last_run_seconds": round(self.last_run_seconds, 3)
+        }
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Session sweep failed")
+            await asyncio.sleep(self.interval)
+
+
+# Process-wide sweeper started from the FastAPI lifespan. Signed session
+# tokens rely on inactive rows until they expire, so keep them in that mode.
+session_sweeper = SessionSweeper(include_inactive=SESSION_BACKEND != "signed")
@@ -0,0 +1,46 @@
+from datetime import timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.types import TypeDecorator
+
+# Format SQLite's CURRENT_TIMESTAMP writes for server defaults
+SQLITE_TIMESTAMP_FORMAT = "%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+
+
+class Timestamp(TypeDecorator):
+    """
+    DateTime(timezone=True) that reads and writes naive UTC on every backend
+
+    The application works in naive UTC (datetime.utcnow()). Naive values
+    are bound as UTC, aware ones converted to it, and loaded values come
+    back as naive UTC whether the backend returns aware (Postgres
+    timestamptz, in the session's time zone) or naive (SQLite) values.
+
+    SQLite stores timestamps as text and compares them as strings. Values
+    bound from Python otherwise carry a ".000000" suffix that
+    server-default values lack, so equal timestamps would compare unequal
+    and keyset pagination on a timestamp would skip ties. On SQLite
+    values are stored to the second.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(sqlite.DATETIME(storage_format=SQLITE_TIMESTAMP_FORMAT))
+        return dialect.type_descriptor(self.impl)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        else:
+            value = value.astimezone(timezone.utc)
+        return value.replace(tzinfo=None) if dialect.name == "sqlite" else value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
@@ -0,0 +1,139 @@
+from contextlib import contextmanager, asynccontextmanager
+from typing import AsyncIterator, Callable, Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session as DBSession, SessionTransaction
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+
+from .connection import SessionLocal, AsyncSessionLocal
+
+# Session.info key of the callbacks waiting for the transaction to commit
+_AFTER_COMMIT = "after_commit_callbacks"
+
+
+def run_after_commit(session: DBSession, callback: Callable[[], None]) -> None:
+    """
+    Run callback once the session's transaction commits
+    For side effects that must not be seen before the data is, such as
+    evicting cached sessions: evicting earlier lets a concurrent reader
+    cache the still-committed row again.
+    """
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+@event.listens_for(DBSession, "after_commit")
+def _run_after_commit_callbacks(session: DBSession) -> None:
+    # Also fired when a SAVEPOINT is released; wait for the real commit
+    if session.in_nested_transaction():
+        return
+    for callback in session.info.pop(_AFTER_COMMIT, ()):
+        callback()
+
+
+class UnitOfWork:
+    """
+    The session a database operation runs in
+
+    Operations accept an optional injected session. When one is given the
+    caller owns the transaction: commit() only flushes and rollback() is
+    left to the caller, so several operations share one connection and
+    one commit. Without one, the operation opens its own session and
+    commits it, as a standalone call.
+
+    Operations that catch their own errors and report a soft failure
+    (None, False, 0) ask for a savepoint. In an injected session their
+    work then runs in a SAVEPOINT, and rollback() undoes just that, so the
+    caller's transaction stays usable instead of being left aborted.
+    """
+
+    def __init__(self, session: DBSession, owned: bool, savepoint: Optional[SessionTransaction] = None):
+        self.session = session
+        self.owned = owned
+        self.savepoint = savepoint
+
+    def commit(self) -> None:
+        if self.owned:
+            self.session.commit()
+        elif self.savepoint is not None:
+            self.savepoint.commit()
+            self.savepoint = None
+        else:
+            self.session.flush()
+
+    def rollback(self) -> None:
+        if self.owned:
+            self.session.rollback()
+        elif self.savepoint is not None:
+            self.savepoint.rollback()
+            self.savepoint = None
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback when this work commits; with an injected session, when the caller does"""
+        run_after_commit(self.session, callback)
+
+
+class AsyncUnitOfWork:
+    """Async counterpart of UnitOfWork"""
+
+    def __init__(self, session: AsyncSession, owned: bool, savepoint: Optional[AsyncSessionTransaction] = None):
+        self.session = session
+        self.owned = owned
+        self.savepoint = savepoint
+
+    async def commit(self) -> None:
+        if self.owned:
+            await self.session.commit()
+        elif self.savepoint is not None:
+            await self.savepoint.commit()
+            self.savepoint = None
+        else:
+            await self.session.flush()
+
+    async def rollback(self) -> None:
+        if self.owned:
+            await self.session.rollback()
+        elif self.savepoint is not None:
+            await self.savepoint.rollback()
+            self.savepoint = None
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback when this work commits; with an injected session, when the caller does"""
+        run_after_commit(self.session.sync_session, callback)
+
+
+@contextmanager
+def unit_of_work(db: Optional[DBSession] = None, savepoint: bool = False) -> Iterator[UnitOfWork]:
+    """Run an operation in the caller's session (in a savepoint if asked), or in its own"""
+    if db is not None:
+        uow = UnitOfWork(db, owned=False, savepoint=db.begin_nested() if savepoint else None)
+        try:
+            yield uow
+        except BaseException:
+            uow.rollback()
+            raise
+        if uow.savepoint is not None:
+            uow.commit()
+        return
+
+    session = SessionLocal()
+    try:
+        yield UnitOfWork(session, owned=True)
+    finally:
+        session.close()
+
+
+@asynccontextmanager
+async def async_unit_of_work(db: Optional[AsyncSession] = None, savepoint: bool = False) -> AsyncIterator[AsyncUnitOfWork]:
+    """Run an async operation in the caller's session (in a savepoint if asked), or in its own"""
+    if db is not None:
+        uow = AsyncUnitOfWork(db, owned=False, savepoint=await db.begin_nested() if savepoint else None)
+        try:
+            yield uow
+        except BaseException:
+            await uow.rollback()
+            raise
+        if uow.savepoint is not None:
+            await uow.commit()
+        return
+
+    async with AsyncSessionLocal() as session:
+        yield AsyncUnitOfWork(session, owned=True)
@@ -0,0 +1,174 @@
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import os
+import time
+
+from sqlalchemy import text
+
+from database import connection
+from database.session_store import get_session_store, SESSION_BACKEND
+from routes.auth.discord_client import ping_discord
+from startup import startup_warmup
+
+# Health check configuration from environment variables
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "5"))
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "2"))
+HEALTH_SNAPSHOT_MAX_AGE_SECONDS = float(
+    os.getenv("HEALTH_SNAPSHOT_MAX_AGE_SECONDS", str(HEALTH_CHECK_INTERVAL_SECONDS * 3))
+)
+HEALTH_POOL_SATURATION = float(os.getenv("HEALTH_POOL_SATURATION", "1.0"))
+HEALTH_CHECK_REDIS = os.getenv("HEALTH_CHECK_REDIS", str(SESSION_BACKEND == "redis")).lower() == "true"
+HEALTH_CHECK_DISCORD = os.getenv("HEALTH_CHECK_DISCORD", "false").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+
+async def check_database() -> Dict[str, Any]:
+    """Run SELECT 1 through the request pool"""
+    async with connection.async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return {}
+
+
+async def check_pool(last_timeouts: int = 0) -> Dict[str, Any]:
+    """
+    Fail when the request pool is saturated: every connection the pool may
+    open is checked out, or a checkout timed out since the last check
+    """
+    status = connection.get_pool_status()["async"]
+    if "size" not in status:
+        # Not a queue pool (e.g. in-memory SQLite), nothing to saturate
+        return {"pool_class": status["pool_class"]}
+
+    capacity = status["size"] + connection.DB_MAX_OVERFLOW
+    saturation = status["checked_out"] / capacity if capacity else 0.0
+    timeouts = status["checkout_timeouts"] - last_timeouts
+    details = {
+        "checked_out": status["checked_out"],
+        "capacity": capacity,
+        "saturation": round(saturation, 3),
+        "checkout_timeouts": status["checkout_timeouts"],
+    }
+    if saturation >= HEALTH_POOL_SATURATION or timeouts > 0:
+        raise RuntimeError(f"pool saturated ({details['checked_out']}/{capacity}, {timeouts} new timeouts)")
+    return details
+
+
+async def check_redis() -> Dict[str, Any]:
+    """Ping the Redis session store"""
+    if not await asyncio.to_thread(get_session_store().ping):
+        raise RuntimeError("ping failed")
+    return {}
+
+
+async def check_discord() -> Dict[str, Any]:
+    """Reach the Discord API through the shared client"""
+    if not await ping_discord():
+        raise RuntimeError("Discord answered with a server error")
+    return {}
+
+
+class HealthMonitor:
+    """
+    Run dependency checks in the background and serve readiness from the result
+
+    Probes read the latest snapshot and never touch a dependency themselves,
+    so probe traffic adds no load however often the load balancer polls.
+    Checks run concurrently, each bounded by the check timeout; a replica is
+    ready when startup warm-up has finished and every enabled check passed
+    in a snapshot that is not older than the maximum age.
+    """
+
+    def __init__(
+        self,
+        interval: float = HEALTH_CHECK_INTERVAL_SECONDS,
+        timeout: float = HEALTH_CHECK_TIMEOUT_SECONDS,
+        max_age: float = HEALTH_SNAPSHOT_MAX_AGE_SECONDS,
+        check_redis_enabled: bool = HEALTH_CHECK_REDIS,
+        check_discord_enabled: bool = HEALTH_CHECK_DISCORD
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.max_age = max_age
+        self.checks: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]] = {
+            "database": check_database,
+            "pool": lambda: check_pool(self._last_timeouts),
+        }
+        if check_redis_enabled:
+            self.checks["redis"] = check_redis
+        if check_discord_enabled:
+            self.checks["discord"] = check_discord
+        self._task: Optional[asyncio.Task] = None
+        self._last_timeouts = 0
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_at = 0.0
+        self.runs = 0
+
+    async def _run_check(self, name: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(self.checks[name](), self.timeout)
+            result = {"ok": True, **details}
+        except asyncio.TimeoutError:
+            result = {"ok": False, "error": f"timed out after {self.timeout}s"}
+        except Exception as e:
+            result = {"ok": False, "error": str(e) or type(e).__name__}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Run every check concurrently and store the snapshot"""
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._run_check(name) for name in names))
+        self._last_timeouts = connection.get_pool_status()["async"]["checkout_timeouts"]
+
+        self._snapshot = {
+            "checks": dict(zip(names, results)),
+            "checked_at": datetime.utcnow().isoformat() + "Z",
+        }
+        self._snapshot_at = time.monotonic()
+        self.runs += 1
+        return self._snapshot
+
+    def readiness(self) -> Dict[str, Any]:
+        """The latest snapshot with an overall status; does no I/O"""
+        if not startup_warmup.ready:
+            return {"status": "starting"}
+        if self._snapshot is None:
+            return {"status": "unknown"}
+
+        age = time.monotonic() - self._snapshot_at
+        if age > self.max_age:
+            status = "stale"
+        elif all(check["ok"] for check in self._snapshot["checks"].values()):
+            status = "ready"
+        else:
+            status = "unready"
+        return {"status": status, "age_seconds": round(age, 1), **self._snapshot}
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Health check run failed")
+            await asyncio.sleep(self.interval)
+
+
+# Process-wide monitor started from the FastAPI lifespan
+health_monitor = HealthMonitor()
@@ -1,20 +1,52 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
+from fastapi.responses import ORJSONResponse
 from routes.auth import router as auth_router
-from database.connection import test_db_connection
-from sqlalchemy import text
+from routes.internal import router as internal_router
+from routes.admin import router as admin_router
+from routes.auth.discord_client import start_discord_client, close_discord_client
+from database.session_store import get_session_store
+from database.session_sweeper import session_sweeper, SESSION_SWEEP_ENABLED
+from database.session_access import session_access_buffer
+from startup import startup_warmup
+from health import health_monitor
+from metrics import MetricsMiddleware, metrics_response
+from logging_config import configure_logging, stop_logging
 
-# Load environment variables
-load_dotenv()
+# Environment variables are loaded from .env by database.connection; nothing
+# here touches the database or the network until the lifespan starts
 
-# Test database connection
-test_db_connection()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Log through a queue so formatting and output stay off the event loop
+    configure_logging()
+    # Open the shared Discord HTTP client for the lifetime of the app
+    await start_discord_client()
+    # Warm the pool and Discord client in the background; /health/ready waits on it
+    startup_warmup.start()
+    # Dependency checks feed the cached readiness snapshot
+    health_monitor.start()
+    await get_session_store().start()
+    if SESSION_SWEEP_ENABLED:
+        session_sweeper.start()
+    session_access_buffer.start()
+    yield
+    await session_access_buffer.stop()
+    await session_sweeper.stop()
+    await get_session_store().stop()
+    await health_monitor.stop()
+    await startup_warmup.stop()
+    await close_discord_client()
+    stop_logging()
 
 app = FastAPI(
     title=os.getenv("APP_NAME", "Auth API"),
-    version=os.getenv("APP_VERSION", "1.0.0")
+    version=os.getenv("APP_VERSION", "1.0.0"),
+    # orjson encodes responses natively, without json.dumps' Python-level overhead
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware for your frontend
@@ -27,6 +59,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency and status for /metrics
+app.add_middleware(MetricsMiddleware)
+
 @app.get("/")
 async def root():
     return {"message": "Auth API is running!"}
@@ -35,9 +70,32 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/live")
+async def liveness_check():
+    # The process is serving requests; dependencies are /health/ready's concern
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    # Served from the background health snapshot, never from a live check
+    readiness = health_monitor.readiness()
+    if readiness["status"] != "ready":
+        return ORJSONResponse(status_code=503, content=readiness)
+    return readiness
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
+
 # Include auth routes
 app.include_router(auth_router, prefix="/api/auth", tags=["authentication"])
 
+# Include admin routes
+app.include_router(admin_router, prefix="/api/admin", tags=["admin"])
+
+# Include internal routes (admin only, not part of the public API schema)
+app.include_router(internal_router, prefix="/internal", tags=["internal"], include_in_schema=False)
+
 if __name__ == "__main__":
     import uvicorn
     host = os.getenv("HOST", "0.0.0.0")
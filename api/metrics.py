@@ -0,0 +1,64 @@
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+HTTP_RESPONSES = Counter(
+    "http_responses_total",
+    "HTTP responses by route and status code",
+    ["method", "route", "status"]
+)
+
+# Routes left out of the metrics: scrapes and probes would drown real traffic
+EXCLUDED_ROUTES = frozenset({"/metrics", "/health", "/health/live", "/health/ready"})
+
+
+class MetricsMiddleware:
+    """
+    Record latency and status per route template
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware, so it adds no
+    extra task or response buffering per request. Routes are labelled by
+    their template (e.g. /api/admin/users), unmatched paths as "unmatched",
+    to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            if path not in EXCLUDED_ROUTES:
+                method = scope["method"]
+                HTTP_REQUEST_SECONDS.labels(method, path).observe(time.perf_counter() - start)
+                HTTP_RESPONSES.labels(method, path, str(status)).inc()
+
+
+def metrics_response() -> Response:
+    """Expose every registered metric in the Prometheus text format"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
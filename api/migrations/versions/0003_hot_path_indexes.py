@@ -0,0 +1,65 @@
+"""Indexes for the session and user hot paths
+
+Built with CREATE INDEX CONCURRENTLY on Postgres so live tables are not
+locked against writes. Concurrent builds cannot run in a transaction, so
+each one runs in an autocommit block.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Expired-session sweeps: WHERE expires_at < now()
+        op.create_index(
+            "ix_sessions_expires_at", "sessions", ["expires_at"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # Active sessions only; revoked rows are excluded from the index
+        op.create_index(
+            "ix_sessions_active_expires_at", "sessions", ["expires_at"],
+            postgresql_where=sa.text("is_active"),
+            sqlite_where=sa.text("is_active"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # Bulk revocation: WHERE user_id = ? AND is_active
+        op.create_index(
+            "ix_sessions_user_id_is_active", "sessions", ["user_id", "is_active"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # Admin listings by status
+        op.create_index(
+            "ix_users_status", "users", ["status"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        # Covered by the leading column of ix_sessions_user_id_is_active
+        op.drop_index(
+            "ix_sessions_user_id", table_name="sessions",
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sessions_user_id", "sessions", ["user_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index("ix_users_status", table_name="users", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_sessions_user_id_is_active", table_name="sessions", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_sessions_active_expires_at", table_name="sessions", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_sessions_expires_at", table_name="sessions", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,39 @@
+"""Keyset pagination index for admin user listings
+
+(status, created_at, id) serves WHERE status = ? ORDER BY created_at, id
+with a (created_at, id) > (?, ?) seek, and its leading column replaces
+ix_users_status.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_status_created_at_id", "users", ["status", "created_at", "id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index("ix_users_status", table_name="users", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_status", "users", ["status"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index("ix_users_status_created_at_id", table_name="users", postgresql_concurrently=True, if_exists=True)
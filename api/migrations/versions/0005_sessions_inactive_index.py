@@ -0,0 +1,38 @@
+"""Partial index of revoked sessions for the sweeper
+
+The sweeper deletes expired rows through ix_sessions_expires_at and
+revoked rows through this index; a single OR of the two conditions
+could use neither and scanned the table.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Revoked-session sweeps: WHERE is_active = false
+        op.create_index(
+            "ix_sessions_inactive", "sessions", ["id"],
+            postgresql_where=sa.text("NOT is_active"),
+            sqlite_where=sa.text("is_active = 0"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_sessions_inactive", table_name="sessions", postgresql_concurrently=True, if_exists=True)
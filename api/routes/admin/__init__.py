@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Depends
+from .permissions import require_admin
+from .users import router as users_router
+
+# Create main admin router and include sub-routers; every route requires an admin
+router = APIRouter(dependencies=[Depends(require_admin)])
+router.include_router(users_router)
+
+__all__ = ["router"]
@@ -0,0 +1,28 @@
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+import os
+
+from database.connection import get_async_db
+from database.models.user import UserStatus
+from database.read_models import SessionUser
+from routes.auth.session import get_session_user_async
+
+# Users allowed to call admin routes, by user ID (comma-separated)
+ADMIN_USER_IDS = {
+    int(user_id) for user_id in os.getenv("ADMIN_USER_IDS", "").split(",") if user_id.strip()
+}
+
+
+async def require_admin(request: Request, db: AsyncSession = Depends(get_async_db)) -> SessionUser:
+    """
+    FastAPI dependency that admits approved users listed in ADMIN_USER_IDS
+    """
+    session_id = request.cookies.get("session_id")
+    user = await get_session_user_async(session_id, db=db) if session_id else None
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    if user.status != UserStatus.APPROVED or user.id not in ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return user
@@ -0,0 +1,134 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime
+import base64
+import json
+import os
+
+from database.connection import get_async_db
+from database.models.user import UserStatus
+from database.read_models import UserListItem
+from database.operations.users import (
+    list_users_by_status_async,
+    stream_users_by_status,
+    bulk_update_user_status_async,
+    SESSION_REVOKING_STATUSES
+)
+from database.session_store import get_session_store
+
+# Listing configuration from environment variables
+ADMIN_PAGE_SIZE_MAX = int(os.getenv("ADMIN_PAGE_SIZE_MAX", "500"))
+ADMIN_EXPORT_BATCH_SIZE = int(os.getenv("ADMIN_EXPORT_BATCH_SIZE", "1000"))
+ADMIN_BULK_MAX_IDS = int(os.getenv("ADMIN_BULK_MAX_IDS", "10000"))
+
+router = APIRouter()
+
+
+class UserStatusUpdate(BaseModel):
+    """Body of a bulk status change; users may be given by ID, Discord ID or both"""
+    status: UserStatus
+    user_ids: List[int] = Field(default_factory=list, max_length=ADMIN_BULK_MAX_IDS)
+    discord_ids: List[str] = Field(default_factory=list, max_length=ADMIN_BULK_MAX_IDS)
+
+
+def encode_cursor(user: UserListItem) -> str:
+    """Opaque cursor pointing just past this user in (created_at, id) order"""
+    payload = json.dumps({"created_at": user.created_at.isoformat(), "id": user.id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(payload["created_at"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def user_to_dict(user: UserListItem) -> Dict[str, Any]:
+    return {
+        "id": user.id,
+        "discord_id": user.discord_id,
+        "discord_username": user.discord_username,
+        "server_nickname": user.server_nickname,
+        "email": user.email,
+        "status": user.status.value,
+        "created_at": user.created_at.isoformat() if user.created_at else None
+    }
+
+
+@router.get("/users")
+async def list_users(
+    status: UserStatus = UserStatus.PENDING,
+    limit: int = Query(50, ge=1, le=ADMIN_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    List users with a status, oldest first
+    Pass next_cursor back as cursor to get the following page.
+    """
+    after = decode_cursor(cursor) if cursor else None
+
+    # One extra row tells whether another page follows
+    users = await list_users_by_status_async(status, limit + 1, after, db=db)
+    page = users[:limit]
+
+    return {
+        "users": [user_to_dict(user) for user in page],
+        "next_cursor": encode_cursor(page[-1]) if len(users) > limit else None
+    }
+
+
+@router.get("/users/export")
+async def export_users(status: UserStatus = UserStatus.PENDING):
+    """
+    Export every user with a status as newline-delimited JSON
+    """
+    async def ndjson() -> AsyncIterator[str]:
+        # Own session: the export outlives the request's dependencies
+        async for batch in stream_users_by_status(status, ADMIN_EXPORT_BATCH_SIZE):
+            yield "".join(json.dumps(user_to_dict(user)) + "\n" for user in batch)
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="users-{status.value}.ndjson"'}
+    )
+
+
+@router.post("/users/status")
+async def update_user_status(change: UserStatusUpdate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Approve, reject or ban many users at once
+    Users whose current status cannot move to the new one are skipped.
+    Rejected and banned users lose their sessions in the same transaction.
+    """
+    try:
+        updated = await bulk_update_user_status_async(
+            change.status, change.user_ids, change.discord_ids, db=db
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    sessions_revoked = 0
+    if updated and change.status in SESSION_REVOKING_STATUSES:
+        sessions_revoked = await get_session_store().invalidate_users_async(
+            [user.id for user in updated], db=db
+        )
+    await db.commit()
+
+    updated_ids = {user.id for user in updated}
+    updated_discord_ids = {user.discord_id for user in updated}
+    return {
+        "status": change.status.value,
+        "updated": [{"id": user.id, "discord_id": user.discord_id} for user in updated],
+        "skipped": {
+            "user_ids": [user_id for user_id in change.user_ids if user_id not in updated_ids],
+            "discord_ids": [discord_id for discord_id in change.discord_ids if discord_id not in updated_discord_ids]
+        },
+        "sessions_revoked": sessions_revoked
+    }
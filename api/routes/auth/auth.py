@@ -1,25 +1,61 @@
-from fastapi import APIRouter, Request, HTTPException, Response, Depends
-from fastapi.responses import RedirectResponse
-from typing import Dict, Any
-from sqlalchemy.orm import Session
-import os
-import httpx
-import secrets
-import json
-from datetime import datetime, timedelta
-from .session import get_session, is_session_valid, update_session_access
-from database.connection import get_db
-from database.operations.users.get_user_by_id import (
-    get_user_by_id
-)
-from database.operations.session_operations import get_user_from_session
+from fastapi import APIRouter, Request, Response, Depends
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from .session import get_session_user_async, invalidate_session_async, update_session_access, set_session_cookie
+from database.connection import get_async_db
 from database.models.user import UserStatus
 
 router = APIRouter()
 
+# /me may be stored by the browser, but must be revalidated on every use
+ME_CACHE_CONTROL = "private, no-cache"
 
-@router.get("/me")
-async def get_current_user(request: Request):
+
+class MeUser(BaseModel):
+    """The signed-in user as returned by /me"""
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    discord_username: str
+    server_nickname: Optional[str]
+    status: UserStatus
+
+
+class MeResponse(BaseModel):
+    """Body of /me; only the fields that were set are sent"""
+    model_config = ConfigDict(frozen=True)
+
+    authenticated: bool
+    message: Optional[str] = None
+    user: Optional[MeUser] = None
+
+
+class LogoutResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    message: str
+
+
+# Bodies that never change are built once
+NO_SESSION = MeResponse(authenticated=False, message="No session found.")
+INVALID_SESSION = MeResponse(authenticated=False, message="Session expired or invalid.")
+LOGGED_OUT = LogoutResponse(message="Logged out successfully")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+
+@router.get("/me", response_model=MeResponse, response_model_exclude_unset=True)
+async def get_current_user(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
     """
     Check if user is authenticated and return user data
     """
@@ -27,44 +63,47 @@ async def get_current_user(request: Request):
     
     # Is there a session?
     if not session_id:
-        return {
-            "authenticated": False,
-            "message": "No session found."
-        }
+        return NO_SESSION
     
-    # If yes, is it valid?
-    session = get_session(session_id)
-    if not session or not is_session_valid(session):
-        return {
-            "authenticated": False,
-            "message": "Session expired or invalid."
-        }
-    
-    # Is there a user associated with the session? Get from db
-    user = get_user_from_session(session_id)
+    # If yes, is it valid? Resolve session and user in one query
+    user = await get_session_user_async(session_id, db=db)
     if not user:
-        return {
-            "authenticated": False,
-            "message": "User not found."
-        }
+        return INVALID_SESSION
+    
+    # Record session activity; with sliding expiration the cookie
+    # lifetime is renewed to match
+    renewed = update_session_access(session_id)
+    
+    # The validator comes from the session snapshot, so an unchanged
+    # answer costs no serialization (and no query on a cache hit)
+    etag = user.etag()
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        not_modified = Response(status_code=304, headers={"ETag": etag, "Cache-Control": ME_CACHE_CONTROL})
+        if renewed:
+            set_session_cookie(not_modified, session_id)
+        return not_modified
     
-    # Update session last accessed time
-    update_session_access(session_id)
+    if renewed:
+        set_session_cookie(response, session_id)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = ME_CACHE_CONTROL
     
-    # Return the user data
-    return {
-        "authenticated": True,
-        "user": {
-            "id": user.id,
-            "discord_username": user.discord_username,
-            "server_nickname": user.server_nickname,  # Include server nickname
-            "status": user.status.value  # UserStatus is an enum, so we need .value
-        }
-    }
-
-
-@router.post("/logout")
-async def logout(request: Request, response: Response):
+    # Return the user data. FastAPI still dumps the model and validates it
+    # against response_model before pydantic-core serializes it; building
+    # it with model_construct only skips validating it once more here
+    return MeResponse.model_construct(
+        authenticated=True,
+        user=MeUser.model_construct(
+            id=user.id,
+            discord_username=user.discord_username,
+            server_nickname=user.server_nickname,  # Include server nickname
+            status=user.status
+        )
+    )
+
+
+@router.post("/logout", response_model=LogoutResponse)
+async def logout(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
     """
     Logout user by clearing session
     """
@@ -72,10 +111,10 @@ async def logout(request: Request, response: Response):
     
     # Invalidate session in storage
     if session_id:
-        from .session import invalidate_session
-        invalidate_session(session_id)
+        await invalidate_session_async(session_id, db=db)
+        await db.commit()
     
     # Clear the session cookie
     response.delete_cookie("session_id")
     
-    return {"message": "Logged out successfully"}
+    return LOGGED_OUT
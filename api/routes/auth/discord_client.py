@@ -0,0 +1,143 @@
+from typing import Optional
+import logging
+import os
+import re
+import time
+import httpx
+from prometheus_client import Counter, Histogram
+
+from .discord_ratelimit import discord_rate_limiter
+
+# Discord HTTP client configuration from environment variables
+DISCORD_API_BASE_URL = os.getenv("DISCORD_API_BASE_URL", "https://discord.com/api")
+DISCORD_HTTP2 = os.getenv("DISCORD_HTTP2", "true").lower() == "true"
+DISCORD_HTTP_MAX_CONNECTIONS = int(os.getenv("DISCORD_HTTP_MAX_CONNECTIONS", "100"))
+DISCORD_HTTP_MAX_KEEPALIVE = int(os.getenv("DISCORD_HTTP_MAX_KEEPALIVE", "20"))
+DISCORD_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("DISCORD_HTTP_KEEPALIVE_EXPIRY", "30"))
+DISCORD_HTTP_TIMEOUT = float(os.getenv("DISCORD_HTTP_TIMEOUT", "10"))
+DISCORD_HTTP_CONNECT_TIMEOUT = float(os.getenv("DISCORD_HTTP_CONNECT_TIMEOUT", "5"))
+DISCORD_WARMUP = os.getenv("DISCORD_WARMUP", "true").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+DISCORD_REQUEST_SECONDS = Histogram(
+    "discord_request_duration_seconds",
+    "Discord API response time by endpoint",
+    ["method", "endpoint"]
+)
+DISCORD_RESPONSES = Counter(
+    "discord_responses_total",
+    "Discord API responses by endpoint and status code",
+    ["method", "endpoint", "status"]
+)
+
+# Snowflake IDs in Discord paths, collapsed to keep label cardinality bounded
+_SNOWFLAKE = re.compile(r"/\d{6,}")
+
+_discord_client: Optional[httpx.AsyncClient] = None
+
+
+def _endpoint(url: httpx.URL) -> str:
+    return _SNOWFLAKE.sub("/{id}", url.path)
+
+
+async def _on_request(request: httpx.Request) -> None:
+    request.extensions["metrics_start"] = time.perf_counter()
+
+
+async def _on_response(response: httpx.Response) -> None:
+    request = response.request
+    endpoint = _endpoint(request.url)
+    start = request.extensions.get("metrics_start")
+    if start is not None:
+        DISCORD_REQUEST_SECONDS.labels(request.method, endpoint).observe(time.perf_counter() - start)
+    DISCORD_RESPONSES.labels(request.method, endpoint, str(response.status_code)).inc()
+
+
+def create_discord_client(**kwargs) -> httpx.AsyncClient:
+    """Build a pooled keep-alive client for the Discord API"""
+    options = {
+        "http2": DISCORD_HTTP2,
+        "limits": httpx.Limits(
+            max_connections=DISCORD_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=DISCORD_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=DISCORD_HTTP_KEEPALIVE_EXPIRY
+        ),
+        "timeout": httpx.Timeout(DISCORD_HTTP_TIMEOUT, connect=DISCORD_HTTP_CONNECT_TIMEOUT),
+        # Latency and status per Discord endpoint for /metrics
+        "event_hooks": {"request": [_on_request], "response": [_on_response]},
+    }
+    options.update(kwargs)
+    return httpx.AsyncClient(**options)
+
+
+def get_discord_client() -> httpx.AsyncClient:
+    """
+    Return the application-lifetime Discord client
+    Normally opened in the FastAPI lifespan; created lazily otherwise.
+    """
+    global _discord_client
+    if _discord_client is None or _discord_client.is_closed:
+        _discord_client = create_discord_client()
+    return _discord_client
+
+
+def set_discord_client(client: Optional[httpx.AsyncClient]) -> None:
+    """Override the shared Discord client (used by tests and benchmarks)"""
+    global _discord_client
+    _discord_client = client
+
+
+async def discord_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request to Discord through the shared client
+    Rate-limit headers are tracked and 429s retried after Retry-After.
+    """
+    client = get_discord_client()
+    try:
+        return await discord_rate_limiter.send(
+            lambda: client.request(method, url, **kwargs),
+            method,
+            url,
+            kwargs.get("headers")
+        )
+    except httpx.TransportError:
+        # No response for the event hooks to record
+        DISCORD_RESPONSES.labels(method.upper(), _endpoint(httpx.URL(url)), "error").inc()
+        raise
+
+
+async def start_discord_client() -> httpx.AsyncClient:
+    """Open the shared Discord client at application startup"""
+    return get_discord_client()
+
+
+async def ping_discord() -> bool:
+    """
+    Send one request to the unauthenticated gateway endpoint
+    Returns whether Discord answered without a server error; transport
+    errors propagate.
+    """
+    response = await discord_request("GET", f"{DISCORD_API_BASE_URL}/gateway")
+    return response.status_code < 500
+
+
+async def warm_up_discord_client() -> bool:
+    """
+    Open a connection to Discord ahead of the first login
+    One request completes the TLS handshake and leaves a keep-alive
+    connection in the client's pool.
+    """
+    try:
+        return await ping_discord()
+    except httpx.HTTPError as e:
+        logger.warning("Discord client warm-up failed", extra={"error": type(e).__name__})
+        return False
+
+
+async def close_discord_client() -> None:
+    """Close the shared Discord client at application shutdown"""
+    global _discord_client
+    if _discord_client is not None:
+        await _discord_client.aclose()
+        _discord_client = None
@@ -1,105 +1,97 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import RedirectResponse
 from typing import Dict, Any
-import os
+import asyncio
 import httpx
+import logging
 from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # User database operations
+from database.connection import get_async_db
 from database.operations.users import (
-    get_user_by_discord_id,
-    store_user_pending_approval,
-    is_user_approved,
-    update_user_discord_info
+    upsert_discord_user_async,
+    is_user_approved
 )
-from database.models.user import UserStatus
 
 
-from .session import get_session, is_session_expired, update_session_access
+from .session import create_session_async, set_session_cookie
+from .discord_client import discord_request, DISCORD_API_BASE_URL
+from .oauth_config import get_oauth_config
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 async def exchange_code_for_token(code: str) -> Dict[str, Any]:
     """Exchange Discord authorization code for access token"""
-    token_url = os.getenv("DISCORD_TOKEN_URL")
+    config = get_oauth_config()
     
     data = {
-        "client_id": os.getenv("DISCORD_CLIENT_ID"),
-        "client_secret": os.getenv("DISCORD_CLIENT_SECRET"),
+        "client_id": config.client_id,
+        "client_secret": config.client_secret,
         "grant_type": "authorization_code",
         "code": code,
-        "redirect_uri": os.getenv("DISCORD_REDIRECT_URI"),
+        "redirect_uri": config.redirect_uri,
     }
     
     headers = {
         "Content-Type": "application/x-www-form-urlencoded"
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(token_url, data=data, headers=headers)
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=400, detail="Failed to exchange code for token")
-        
-        return response.json()
+    response = await discord_request("POST", config.token_url, data=data, headers=headers)
+    
+    if response.status_code != 200:
+        raise HTTPException(status_code=400, detail="Failed to exchange code for token")
+    
+    return response.json()
 
 async def get_discord_user_info(access_token: str) -> Dict[str, Any]:
     """Get Discord user information using access token"""
-    user_url = os.getenv("DISCORD_USER_URL")
+    user_url = get_oauth_config().user_url
     
     headers = {
         "Authorization": f"Bearer {access_token}"
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(user_url, headers=headers)
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=400, detail="Failed to get user info from Discord")
-        
-        return response.json()
+    response = await discord_request("GET", user_url, headers=headers)
+    
+    if response.status_code != 200:
+        raise HTTPException(status_code=400, detail="Failed to get user info from Discord")
+    
+    return response.json()
     
 async def get_discord_user_guilds(access_token: str) -> Dict[str, Any]:
     """Get Discord user's guilds (servers) using access token"""
-    guilds_url = "https://discord.com/api/users/@me/guilds"
+    guilds_url = f"{DISCORD_API_BASE_URL}/users/@me/guilds"
     
     headers = {
         "Authorization": f"Bearer {access_token}"
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(guilds_url, headers=headers)
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=400, detail="Failed to get user guilds from Discord")
-        
-        return response.json()
+    response = await discord_request("GET", guilds_url, headers=headers)
+    
+    if response.status_code != 200:
+        raise HTTPException(status_code=400, detail="Failed to get user guilds from Discord")
+    
+    return response.json()
 
 async def get_discord_guild_member(access_token: str, guild_id: str) -> Dict[str, Any]:
     """Get Discord user's member details for a specific guild (includes roles)"""
-    member_url = f"https://discord.com/api/users/@me/guilds/{guild_id}/member"
+    member_url = f"{DISCORD_API_BASE_URL}/users/@me/guilds/{guild_id}/member"
     
     headers = {
         "Authorization": f"Bearer {access_token}"
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(member_url, headers=headers)
-        
-        if response.status_code != 200:
-            # User might not be in guild or insufficient permissions
-            return None
-        
-        return response.json()
+    response = await discord_request("GET", member_url, headers=headers)
     
-def is_member_of_target_guild(user_guilds: Dict[str, Any], target_guild_id:str) -> tuple[bool, str]:
-    """Check if user is a member of the target guild
-    Returns: (is_member: bool, guild_id: str)
-    """
-    for guild in user_guilds:
-        if guild['id'] == target_guild_id:
-            return True, guild['id']
-    return False, None
+    if response.status_code == 404:
+        # User is not a member of the guild
+        return None
+    if response.status_code != 200:
+        raise HTTPException(status_code=400, detail="Failed to get guild membership from Discord")
+    
+    return response.json()
 
 async def check_user_guild_roles(access_token: str, guild_id: str, required_roles: list = None) -> Dict[str, Any]:
     """Check user's roles in a specific guild and extract server nickname
@@ -148,21 +140,19 @@ async def check_user_guild_roles(access_token: str, guild_id: str, required_role
 
 # Testing version
 @router.get("/discord/callback")
-async def discord_callback(code: str = None, error: str = None):
+async def discord_callback(code: str = None, error: str = None, db: AsyncSession = Depends(get_async_db)):
     """
     Handle Discord OAuth callback
+    All database work runs in the request's session and is committed once.
+    Redirect targets for the fixed outcomes are pre-built by OAuthConfig.
     """
-    frontend_url = os.getenv("FRONTEND_URL")
+    config = get_oauth_config()
 
     # Check for errors from Discord
     if error:
-        return RedirectResponse(
-            url=f"{frontend_url}/?error=discord_auth_failed&message=Access Denied. Error connecting to Discord"
-        )
+        return RedirectResponse(url=config.redirects["denied"])
     if not code:
-        return RedirectResponse(
-            url=f"{frontend_url}/?error=discord_auth_failed&message=ERROR: No code provided"
-        )
+        return RedirectResponse(url=config.redirects["no_code"])
     try:
         # Exchange code for access token
         token_data = await exchange_code_for_token(code)
@@ -170,112 +160,68 @@ async def discord_callback(code: str = None, error: str = None):
         if not access_token:
             raise HTTPException(status_code=400, detail="No access token received")
         
-        # Get user info from Discord
-        discord_user = await get_discord_user_info(access_token)
-        print(discord_user)
-        user_servers = await get_discord_user_guilds(access_token)
-        for server in user_servers:
-            print(f"Server: {server['name']} (ID: {server['id']})")
-
-        # Check if user is a member of guild
-        target_guild = os.getenv("TARGET_SERVER_ID")
-        is_member, guild_id = is_member_of_target_guild(user_servers, target_guild)
-            
-        if not is_member:
-            return RedirectResponse(
-                url=f"{frontend_url}/?error=not_in_target_guild&message=Access Denied. Approved Membership in Discord Required."
-            )
-            
-            # Check user's roles in the guild (optional - specify required roles)
-            # required_roles = ["123456789", "987654321"]  # Role IDs for specific ranks
-        guild_id = guild_id or os.getenv("TARGET_SERVER_ID")
-        guild_member_info = await check_user_guild_roles(access_token, guild_id)
-            
-        print(f"User roles in {target_guild}: {guild_member_info.get('roles', [])}")
-
-        # Check if user already exists
-        existing_user = get_user_by_discord_id(discord_user["id"])
-        print(existing_user)
-        if existing_user:
-            # Check if Discord data (username, email) has changed
-            if existing_user.discord_username != discord_user['username'] or \
-                existing_user.email != discord_user.get('email') or \
-                existing_user.server_nickname != guild_member_info.get('nickname'):
-                update_user_discord_info(existing_user.id, discord_user)
-            
-            # Check if user is approved
-            if not is_user_approved(existing_user):
-                return RedirectResponse(
-                    url=f"{frontend_url}/?error=pending_approval&message=Your account is pending admin approval"
-                )
-
-            # If user is approved, create session and redirect
-            print(f"User {existing_user.id} is approved, creating session")
-            from .session import create_session
-            session_id = create_session(existing_user.id)
-
-            redirect_response = RedirectResponse(
-                url=f"{frontend_url}/?auth=success&message=Login successful"
-            )
-            redirect_response.set_cookie(
-                key="session_id",
-                value=session_id,
-                httponly=True,
-                secure=os.getenv("ENVIRONMENT") == "production",
-                samesite="lax",
-                max_age=86400 * 7  # 7 days
-            )
-            return redirect_response
-        else:
-            # # Check if user is a member of Naja Echó guild
-            # target_guild = os.getenv("TARGET_SERVER_ID")
-            # is_member, guild_id = is_member_of_target_guild(user_servers, target_guild)
-            
-            # if not is_member:
-            #     return RedirectResponse(
-            #         url=f"{frontend_url}/?error=not_in_target_guild&message=Access Denied. Approved Membership in Discord Required."
-            #     )
-            
-            # # Check user's roles in the guild (optional - specify required roles)
-            # # required_roles = ["123456789", "987654321"]  # Role IDs for specific ranks
-            # guild_id = guild_id or os.getenv("TARGET_SERVER_ID")
-            # guild_member_info = await check_user_guild_roles(access_token, guild_id)
+        # Get user info and target guild membership from Discord concurrently.
+        # The member endpoint answers membership directly (404 if not a member),
+        # so the user's full guild list is never fetched.
+        discord_user, guild_member_info = await asyncio.gather(
+            get_discord_user_info(access_token),
+            check_user_guild_roles(access_token, config.target_guild_id)
+        )
             
-            # print(f"User roles in {target_guild}: {guild_member_info.get('roles', [])}")
+        if not guild_member_info.get("is_member"):
+            return RedirectResponse(url=config.redirects["not_in_guild"])
             
+        # Check user's roles in the guild (optional - specify required roles)
+        # required_roles = ["123456789", "987654321"]  # Role IDs for specific ranks
+
+        # Create the user or sync their Discord fields in a single statement
+        user = await upsert_discord_user_async({
+            **discord_user,
+            "server_nickname": guild_member_info.get("nickname")
+        }, db=db)
+        if user is None:
+            logger.warning("Discord login could not be stored")
+            return RedirectResponse(url=config.redirects["error"])
+
+        # Per-login detail; DEBUG records are sampled (LOG_DEBUG_SAMPLE_RATE)
+        logger.debug("Discord login", extra={
+            "user_id": user.id,
+            "new_user": user.created,
+            "status": user.status.value,
+            "role_count": len(guild_member_info.get("roles", []))
+        })
+
+        if user.created:
             # Optionally check for specific roles here
             # if not guild_member_info.get('has_required_role'):
-            #     return RedirectResponse(
-            #         url=f"{frontend_url}/?error=insufficient_role&message=You need a specific role in the guild to register"
-            #     )
-
-            # Debug: Print the Discord user data
-            print(f"Creating new user with Discord data: {discord_user}")
-            print(f"Server nickname: {guild_member_info.get('nickname')}")
-            
-            # Prepare user data with server nickname
-            user_data_with_nickname = discord_user.copy()
-            user_data_with_nickname['server_nickname'] = guild_member_info.get('nickname')
-
-            new_user = store_user_pending_approval(user_data_with_nickname)
-            if new_user:
-                # Redirect with pending message
-                return RedirectResponse(
-                    url=f"{frontend_url}/?auth=pending&message=Your account has been submitted for admin approval"
-                )
-            else:
-                # User already exists or error occurred
-                return RedirectResponse(
-                    url=f"{frontend_url}/?error=user_exists&message=Account already exists"
-                )
+            #     return RedirectResponse(url=config.redirect_url(
+            #         error="insufficient_role", message="You need a specific role in the guild to register"
+            #     ))
+            logger.info("Created user pending approval", extra={"user_id": user.id})
+            await db.commit()
+            return RedirectResponse(url=config.redirects["created"])
+
+        # Check if user is approved
+        if not is_user_approved(user):
+            await db.commit()
+            return RedirectResponse(url=config.redirects["pending"])
+
+        # If user is approved, create session and redirect
+        session_id = await create_session_async(user.id, db=db)
+        await db.commit()
+        if not session_id:
+            logger.error("Could not create session", extra={"user_id": user.id})
+            return RedirectResponse(url=config.redirects["error"])
+
+        redirect_response = RedirectResponse(url=config.redirects["success"])
+        set_session_cookie(redirect_response, session_id)
+        return redirect_response
 
     
     except HTTPException as e:
-        return RedirectResponse(
-            url=f"{frontend_url}/?error=discord_auth_failed&message={e.detail}"
-        )
-    except Exception as e:
-        return RedirectResponse(
-            url=f"{frontend_url}/?error=discord_auth_failed&message=An unexpected error occurred"
-        )
+        logger.warning("Discord callback rejected", extra={"status_code": e.status_code})
+        return RedirectResponse(url=config.redirect_url(error="discord_auth_failed", message=e.detail))
+    except Exception:
+        logger.exception("Discord callback failed")
+        return RedirectResponse(url=config.redirects["error"])
 
@@ -0,0 +1,236 @@
+from dataclasses import dataclass
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import math
+import os
+import time
+import httpx
+
+# Rate-limit handling configuration from environment variables
+DISCORD_MAX_RETRIES = int(os.getenv("DISCORD_MAX_RETRIES", "3"))
+DISCORD_MAX_RATE_LIMIT_WAIT = float(os.getenv("DISCORD_MAX_RATE_LIMIT_WAIT", "10"))
+
+# Bucket entries are pruned once this many are tracked
+MAX_TRACKED_BUCKETS = 10000
+
+# Delay before retrying a 429 that gives no usable Retry-After or bucket reset
+DEFAULT_RETRY_AFTER = 1.0
+
+
+@dataclass
+class BucketState:
+    """Remaining requests in a Discord rate-limit bucket and when it resets"""
+    remaining: int
+    reset_at: float
+    limit: int
+    reset_after: float
+
+
+class DiscordRateLimiter:
+    """
+    Track Discord rate limits and delay requests before they hit one
+
+    Discord reports limits per bucket in the X-RateLimit-* headers. User
+    OAuth tokens are limited independently, so bucket state is keyed by
+    bucket and token. Requests wait (up to max_wait) for an exhausted
+    bucket or a global limit to reset, and 429 responses are retried after
+    Retry-After up to max_retries times. Each request reserves a slot in its
+    bucket before it is sent, so waiters released by a reset only go out
+    while the refilled bucket has room.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DISCORD_MAX_RETRIES,
+        max_wait: float = DISCORD_MAX_RATE_LIMIT_WAIT,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self._route_buckets: Dict[Tuple[str, str], str] = {}
+        self._buckets: Dict[Tuple[str, str], BucketState] = {}
+        self._global_reset_at = 0.0
+        self._lock = asyncio.Lock()
+        self.rate_limited = 0
+        self.retries = 0
+        self.delayed = 0
+
+    async def send(self, send_request: Callable[[], Awaitable[httpx.Response]], method: str, url: str, headers: Optional[dict] = None) -> httpx.Response:
+        """Send a request through the limiter, retrying on 429"""
+        identity = self._identity(headers)
+        route = (f"{method} {httpx.URL(url).path}", identity)
+
+        attempt = 0
+        while True:
+            await self._wait_for_capacity(route, identity)
+            response = await send_request()
+            self._update_from_headers(route, identity, response)
+
+            if response.status_code != 429:
+                return response
+
+            self.rate_limited += 1
+            retry_after = self._retry_after(route, identity, response)
+            if attempt >= self.max_retries or retry_after > self.max_wait:
+                return response
+
+            if self._is_global(response):
+                self._global_reset_at = max(self._global_reset_at, self.clock() + retry_after)
+
+            attempt += 1
+            self.retries += 1
+            await self.sleep(retry_after)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "delayed": self.delayed,
+            "tracked_buckets": len(self._buckets)
+        }
+
+    async def _wait_for_capacity(self, route: Tuple[str, str], identity: str) -> None:
+        waited = 0.0
+        while True:
+            async with self._lock:
+                wait = self._reserve(route, identity)
+            if wait <= 0:
+                return
+            if waited >= self.max_wait:
+                # Waited long enough; send and let a 429 be retried
+                return
+
+            if waited == 0:
+                self.delayed += 1
+            wait = min(wait, self.max_wait - waited)
+            await self.sleep(wait)
+            waited += wait
+
+    def _reserve(self, route: Tuple[str, str], identity: str) -> float:
+        """Take a slot in the route's bucket, or return how long to wait for one"""
+        now = self.clock()
+        wait = max(self._global_reset_at - now, 0.0)
+
+        bucket = self._route_buckets.get(route)
+        state = self._buckets.get((bucket, identity)) if bucket else None
+        if state is None:
+            return wait
+
+        if state.reset_at <= now:
+            # Bucket has reset; refill it until the next response refreshes it
+            state.remaining = state.limit
+            state.reset_at = now + state.reset_after
+        if state.remaining <= 0:
+            return max(wait, state.reset_at - now)
+        if wait <= 0:
+            # Reserve a slot so concurrent requests do not overshoot
+            state.remaining -= 1
+        return wait
+
+    def _update_from_headers(self, route: Tuple[str, str], identity: str, response: httpx.Response) -> None:
+        bucket = response.headers.get("X-RateLimit-Bucket")
+        remaining = _finite_float(response.headers.get("X-RateLimit-Remaining"))
+        reset_after = _finite_float(response.headers.get("X-RateLimit-Reset-After"))
+        if not bucket or remaining is None or reset_after is None or remaining < 0 or reset_after < 0:
+            # Missing or malformed headers: leave the bucket untracked
+            return
+
+        previous = self._buckets.get((bucket, identity))
+        limit = _finite_float(response.headers.get("X-RateLimit-Limit"))
+        if limit is None or limit < 0:
+            limit = previous.limit if previous is not None else remaining + 1
+
+        if len(self._buckets) >= MAX_TRACKED_BUCKETS:
+            self._prune()
+
+        self._route_buckets[route] = bucket
+        self._buckets[(bucket, identity)] = BucketState(
+            remaining=int(remaining),
+            reset_at=self.clock() + reset_after,
+            limit=int(limit),
+            reset_after=reset_after
+        )
+
+    def _prune(self) -> None:
+        now = self.clock()
+        for key in [key for key, state in self._buckets.items() if state.reset_at <= now]:
+            del self._buckets[key]
+        live_buckets = {bucket for bucket, _ in self._buckets}
+        for route in [route for route, bucket in self._route_buckets.items() if bucket not in live_buckets]:
+            del self._route_buckets[route]
+
+    @staticmethod
+    def _identity(headers: Optional[dict]) -> str:
+        """Fingerprint of the bearer token so user limits are tracked separately"""
+        authorization = (headers or {}).get("Authorization")
+        if not authorization:
+            return "app"
+        return hashlib.sha256(authorization.encode()).hexdigest()[:16]
+
+    def _retry_after(self, route: Tuple[str, str], identity: str, response: httpx.Response) -> float:
+        """
+        Seconds to wait before retrying a 429
+
+        Retry-After may be delta-seconds or an HTTP-date, and Discord also
+        puts retry_after in the JSON body. Anything unparseable falls back
+        to the bucket reset, then to DEFAULT_RETRY_AFTER.
+        """
+        retry_after = self._parse_retry_after_header(response.headers.get("Retry-After"))
+        if retry_after is None:
+            retry_after = self._parse_retry_after_body(response)
+        if retry_after is None:
+            bucket = self._route_buckets.get(route)
+            state = self._buckets.get((bucket, identity)) if bucket else None
+            if state is not None:
+                retry_after = state.reset_at - self.clock()
+        if retry_after is None:
+            retry_after = DEFAULT_RETRY_AFTER
+        return max(retry_after, 0.0)
+
+    @staticmethod
+    def _parse_retry_after_header(header: Optional[str]) -> Optional[float]:
+        if not header:
+            return None
+        seconds = _finite_float(header)
+        if seconds is not None:
+            return seconds
+        try:
+            retry_at = parsedate_to_datetime(header)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return retry_at.timestamp() - time.time()
+
+    @staticmethod
+    def _parse_retry_after_body(response: httpx.Response) -> Optional[float]:
+        try:
+            body = response.json()
+        except ValueError:
+            return None
+        if not isinstance(body, dict):
+            return None
+        return _finite_float(body.get("retry_after"))
+
+    @staticmethod
+    def _is_global(response: httpx.Response) -> bool:
+        return response.headers.get("X-RateLimit-Global", "").lower() == "true" or \
+            response.headers.get("X-RateLimit-Scope") == "global"
+
+
+def _finite_float(value) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+# Process-wide limiter shared by all Discord requests
+discord_rate_limiter = DiscordRateLimiter()
@@ -0,0 +1,70 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlencode, quote
+import os
+
+# Query parameters of the frontend redirect for each fixed callback outcome
+CALLBACK_REDIRECTS: Dict[str, Dict[str, str]] = {
+    "denied": {"error": "discord_auth_failed", "message": "Access Denied. Error connecting to Discord"},
+    "no_code": {"error": "discord_auth_failed", "message": "ERROR: No code provided"},
+    "not_in_guild": {"error": "not_in_target_guild", "message": "Access Denied. Approved Membership in Discord Required."},
+    "error": {"error": "discord_auth_failed", "message": "An unexpected error occurred"},
+    "created": {"auth": "pending", "message": "Your account has been submitted for admin approval"},
+    "pending": {"error": "pending_approval", "message": "Your account is pending admin approval"},
+    "success": {"auth": "success", "message": "Login successful"},
+}
+
+_oauth_config: Optional["OAuthConfig"] = None
+
+
+@dataclass(frozen=True)
+class OAuthConfig:
+    """
+    Discord OAuth settings, read from the environment once
+
+    The frontend redirect for every fixed callback outcome is built and
+    URL-encoded here, so the callback only looks one up.
+    """
+    client_id: Optional[str]
+    client_secret: Optional[str]
+    redirect_uri: Optional[str]
+    token_url: Optional[str]
+    user_url: Optional[str]
+    target_guild_id: Optional[str]
+    frontend_url: str
+    redirects: Dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "redirects", {
+            outcome: self.redirect_url(**params) for outcome, params in CALLBACK_REDIRECTS.items()
+        })
+
+    @classmethod
+    def from_env(cls) -> "OAuthConfig":
+        return cls(
+            client_id=os.getenv("DISCORD_CLIENT_ID"),
+            client_secret=os.getenv("DISCORD_CLIENT_SECRET"),
+            redirect_uri=os.getenv("DISCORD_REDIRECT_URI"),
+            token_url=os.getenv("DISCORD_TOKEN_URL"),
+            user_url=os.getenv("DISCORD_USER_URL"),
+            target_guild_id=os.getenv("TARGET_SERVER_ID"),
+            frontend_url=os.getenv("FRONTEND_URL", "")
+        )
+
+    def redirect_url(self, **params: str) -> str:
+        """Frontend URL with the given query parameters, percent-encoded"""
+        return f"{self.frontend_url}/?{urlencode(params, quote_via=quote)}"
+
+
+def get_oauth_config() -> OAuthConfig:
+    """Return the process-wide OAuth configuration, loading it on first use"""
+    global _oauth_config
+    if _oauth_config is None:
+        _oauth_config = OAuthConfig.from_env()
+    return _oauth_config
+
+
+def set_oauth_config(config: Optional[OAuthConfig]) -> None:
+    """Override the process-wide OAuth configuration (None reloads it from the environment)"""
+    global _oauth_config
+    _oauth_config = config
@@ -1,34 +1,48 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import os
 
 # Import database session operations
 from database.operations.session_operations import (
-    create_session as db_create_session,
     get_session as db_get_session,
-    get_user_from_session,
-    update_session_access as db_update_session_access,
-    invalidate_session as db_invalidate_session
+    get_user_from_session
 )
-from database.models.session import Session
+from database.session_access import SESSION_LIFETIME_DAYS
+from database.session_store import get_session_store
 from database.models.user import User
+from database.read_models import SessionSummary, SessionUser
 
 def create_session(user_id: int) -> Optional[str]:
-    """Create a new session for the user in the database"""
-    return db_create_session(user_id)
+    """Create a new session for the user in the configured session store"""
+    return get_session_store().create(user_id)
+
+async def create_session_async(user_id: int, db: Optional[AsyncSession] = None) -> Optional[str]:
+    """Create a new session without blocking the event loop, in the request's unit of work if given"""
+    return await get_session_store().create_async(user_id, db=db)
 
-def get_session(session_id: str) -> Optional[Session]:
+def get_session(session_id: str) -> Optional[SessionSummary]:
     """Get session data from the database"""
     return db_get_session(session_id)
 
-def is_session_expired(session: Session) -> bool:
+def get_session_user(session_id: str) -> Optional[SessionUser]:
+    """Get the user for a valid session from the configured session store"""
+    return get_session_store().get(session_id)
+
+async def get_session_user_async(session_id: str, db: Optional[AsyncSession] = None) -> Optional[SessionUser]:
+    """Get the user for a valid session without blocking the event loop"""
+    return await get_session_store().get_async(session_id, db=db)
+
+def is_session_expired(session: SessionSummary) -> bool:
     """Check if session is expired"""
     if not session:
         return True
     
     return session.is_expired()
 
-def is_session_valid(session: Session) -> bool:
+def is_session_valid(session: SessionSummary) -> bool:
     """Check if session is valid (active and not expired)"""
     if not session:
         return False
@@ -36,9 +50,24 @@ def is_session_valid(session: Session) -> bool:
     return session.is_valid()
 
 def update_session_access(session_id: str) -> bool:
-    """Update last accessed time for session"""
-    return db_update_session_access(session_id)
+    """Record session activity; True if the session expiry slides forward"""
+    return get_session_store().touch(session_id)
+
+def set_session_cookie(response: Response, session_id: str) -> None:
+    """Set the session cookie for the configured session lifetime"""
+    response.set_cookie(
+        key="session_id",
+        value=session_id,
+        httponly=True,
+        secure=os.getenv("ENVIRONMENT") == "production",
+        samesite="lax",
+        max_age=86400 * SESSION_LIFETIME_DAYS
+    )
 
 def invalidate_session(session_id: str) -> bool:
-    """Invalidate session in database"""
-    return db_invalidate_session(session_id)
+    """Invalidate session in the configured session store"""
+    return get_session_store().invalidate(session_id)
+
+async def invalidate_session_async(session_id: str, db: Optional[AsyncSession] = None) -> bool:
+    """Invalidate session without blocking the event loop, in the request's unit of work if given"""
+    return await get_session_store().invalidate_async(session_id, db=db)
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Depends
+from routes.admin.permissions import require_admin
+from .stats import router as stats_router
+
+# Create main internal router and include sub-routers; the stats describe
+# the whole deployment, so every route requires an admin
+router = APIRouter(dependencies=[Depends(require_admin)])
+router.include_router(stats_router)
+
+__all__ = ["router"]
@@ -0,0 +1,48 @@
+from fastapi import APIRouter
+from database.connection import get_pool_status
+from database.session_cache import session_cache
+from database.session_sweeper import session_sweeper
+from database.session_access import session_access_buffer
+from routes.auth.discord_ratelimit import discord_rate_limiter
+
+router = APIRouter()
+
+
+@router.get("/session-cache")
+async def session_cache_stats():
+    """
+    Return session cache hit/miss/eviction counters
+    """
+    return session_cache.stats()
+
+
+@router.get("/pool")
+async def pool_stats():
+    """
+    Return database connection pool statistics
+    """
+    return get_pool_status()
+
+
+@router.get("/discord-rate-limits")
+async def discord_rate_limit_stats():
+    """
+    Return Discord rate-limit counters
+    """
+    return discord_rate_limiter.stats()
+
+
+@router.get("/session-sweeper")
+async def session_sweeper_stats():
+    """
+    Return expired-session sweeper counters
+    """
+    return session_sweeper.stats()
+
+
+@router.get("/session-access")
+async def session_access_stats():
+    """
+    Return buffered session access counters
+    """
+    return session_access_buffer.stats()
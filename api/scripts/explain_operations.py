@@ -0,0 +1,159 @@
+"""
+Print query plans for every statement issued by database/operations
+
+Each operation is run inside a transaction that is rolled back at the
+end, so the script is safe to point at a populated database. Sync
+operations run on the sync engine; async ones are run afterwards on the
+async engine, in a session of their own rolled-back transaction. Statements
+are captured as they execute and then explained (EXPLAIN on Postgres,
+EXPLAIN QUERY PLAN on SQLite); writes are explained, not analyzed.
+
+Usage: DATABASE_URL=... python -m scripts.explain_operations
+"""
+import asyncio
+import secrets
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.connection import async_engine, engine, SessionLocal
+from database.models.user import UserStatus
+from database.session_access import session_access_buffer
+from database.session_cache import session_cache
+from database.operations import session_operations
+from database.operations.users import (
+    store_user_pending_approval,
+    get_user_by_id,
+    get_user_by_discord_id,
+    get_user_summary,
+    get_user_summary_by_discord_id,
+    get_server_nickname_by_user_id,
+    update_user_discord_info,
+    upsert_discord_user,
+    upsert_discord_user_async,
+    list_users_by_status_async,
+    stream_users_by_status,
+    bulk_update_user_status_async
+)
+
+SKIPPED_PREFIXES = ("SAVEPOINT", "RELEASE", "ROLLBACK")
+
+
+def explain_prefix() -> str:
+    return "EXPLAIN" if engine.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN"
+
+
+@contextmanager
+def capturing(connection):
+    """Collect the (statement, parameters) executed on a connection"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(SKIPPED_PREFIXES):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        session_cache.clear()
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+
+def capture(connection, operation):
+    """Run an operation and return the (statement, parameters) it executed"""
+    with capturing(connection) as statements:
+        operation()
+    return statements
+
+
+def print_plans(connection, name, statements):
+    print(f"\n=== {name}")
+    for statement, parameters in statements:
+        print(f"\n{' '.join(statement.split())}")
+        for row in connection.exec_driver_sql(f"{explain_prefix()} {statement}", parameters):
+            print("    " + " | ".join(str(column) for column in row))
+
+
+def main():
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        # Operations open their own sessions; make their commits savepoints
+        # inside this transaction so everything is rolled back afterwards
+        SessionLocal.configure(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            discord_id = str(secrets.randbelow(10**18))
+            user = store_user_pending_approval({"id": discord_id, "username": "explain_user"})
+            session_id = session_operations.create_session(user.id)
+
+            operations = [
+                ("store_user_pending_approval", lambda: store_user_pending_approval(
+                    {"id": str(secrets.randbelow(10**18)), "username": "explain_user_2"})),
+                ("get_user_by_id", lambda: get_user_by_id(user.id)),
+                ("get_user_by_discord_id", lambda: get_user_by_discord_id(discord_id)),
+                ("get_user_summary", lambda: get_user_summary(user.id)),
+                ("get_user_summary_by_discord_id", lambda: get_user_summary_by_discord_id(discord_id)),
+                ("get_server_nickname_by_user_id", lambda: get_server_nickname_by_user_id(user.id)),
+                ("update_user_discord_info", lambda: update_user_discord_info(user.id, {"username": "explained"})),
+                ("upsert_discord_user", lambda: upsert_discord_user({"id": discord_id, "username": "upserted"})),
+                ("create_session", lambda: session_operations.create_session(user.id)),
+                ("get_session", lambda: session_operations.get_session(session_id)),
+                ("get_user_from_session", lambda: session_operations.get_user_from_session(session_id)),
+                ("get_valid_session_user", lambda: session_operations.get_valid_session_user(session_id)),
+                ("update_sessions_last_accessed", lambda: session_operations.update_sessions_last_accessed(
+                    {session_id: datetime.utcnow()})),
+                ("get_revoked_session_ids", session_operations.get_revoked_session_ids),
+                ("delete_expired_sessions_batch", lambda: session_operations.delete_expired_sessions_batch(1000)),
+                ("invalidate_session", lambda: session_operations.invalidate_session(session_id)),
+                ("invalidate_all_user_sessions", lambda: session_operations.invalidate_all_user_sessions(user.id)),
+                ("invalidate_users_sessions", lambda: session_operations.invalidate_users_sessions([user.id])),
+                ("cleanup_expired_sessions", session_operations.cleanup_expired_sessions),
+            ]
+
+            for name, operation in operations:
+                print_plans(connection, name, capture(connection, operation))
+        finally:
+            session_access_buffer.drain()
+            SessionLocal.configure(bind=engine, join_transaction_mode="conservative_savepoint")
+            transaction.rollback()
+
+    asyncio.run(explain_async_operations())
+
+
+async def explain_async_operations():
+    async with async_engine.connect() as connection:
+        transaction = await connection.begin()
+        # Commits inside the operations become savepoints of this transaction
+        db = AsyncSession(bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        try:
+            discord_id = str(secrets.randbelow(10**18))
+            user = await upsert_discord_user_async({"id": discord_id, "username": "explain_user"}, db=db)
+
+            async def stream_all():
+                async for _ in stream_users_by_status(UserStatus.PENDING, db=db):
+                    pass
+
+            operations = [
+                ("upsert_discord_user_async", lambda: upsert_discord_user_async(
+                    {"id": discord_id, "username": "upserted"}, db=db)),
+                ("list_users_by_status_async", lambda: list_users_by_status_async(UserStatus.PENDING, db=db)),
+                ("list_users_by_status_async (after)", lambda: list_users_by_status_async(
+                    UserStatus.PENDING, after=(datetime.utcnow(), user.id), db=db)),
+                ("stream_users_by_status", stream_all),
+                ("bulk_update_user_status_async", lambda: bulk_update_user_status_async(
+                    UserStatus.BANNED, user_ids=[user.id], db=db)),
+            ]
+
+            for name, operation in operations:
+                with capturing(connection.sync_connection) as statements:
+                    await operation()
+                await connection.run_sync(print_plans, name, statements)
+        finally:
+            await db.close()
+            await transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import os
+import time
+
+from database.connection import warm_up_pool, DB_POOL_WARMUP
+from routes.auth.discord_client import warm_up_discord_client, DISCORD_WARMUP
+
+# Warm-up configuration from environment variables
+STARTUP_RETRY_SECONDS = float(os.getenv("STARTUP_RETRY_SECONDS", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+class StartupWarmup:
+    """
+    Warm the database pool and the Discord client before reporting ready
+
+    Runs in the background from the FastAPI lifespan, so the process starts
+    serving (and answering liveness probes) immediately. Both warm-ups run
+    concurrently; the database one is retried until it succeeds, while a
+    failed Discord warm-up is only logged - logins still work, just with a
+    cold first handshake.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DB_POOL_WARMUP,
+        warm_discord: bool = DISCORD_WARMUP,
+        retry_interval: float = STARTUP_RETRY_SECONDS
+    ):
+        self.pool_connections = pool_connections
+        self.warm_discord = warm_discord
+        self.retry_interval = retry_interval
+        self._task: Optional[asyncio.Task] = None
+        self.ready = False
+        self.attempts = 0
+        self.discord_warm = False
+        self.warmup_seconds = 0.0
+
+    async def run_once(self) -> bool:
+        """Run one warm-up attempt; returns whether the app is now ready"""
+        self.attempts += 1
+        start = time.perf_counter()
+        pool, discord = await asyncio.gather(
+            warm_up_pool(self.pool_connections),
+            warm_up_discord_client() if self.warm_discord else asyncio.sleep(0, False),
+            return_exceptions=True
+        )
+        if isinstance(pool, Exception):
+            logger.warning("Database warm-up failed", extra={"error": str(pool)})
+            return False
+
+        self.discord_warm = discord is True
+        self.warmup_seconds = time.perf_counter() - start
+        self.ready = True
+        logger.info("Warm-up finished", extra={
+            "elapsed_ms": round(self.warmup_seconds * 1000), "connections": pool, "discord_warm": self.discord_warm
+        })
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "attempts": self.attempts,
+            "pool_connections": self.pool_connections,
+            "discord_warm": self.discord_warm,
+            "warmup_seconds": round(self.warmup_seconds, 3)
+        }
+
+    def start(self) -> None:
+        if self._task is None:
+            self.ready = False
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.ready = False
+
+    async def _loop(self) -> None:
+        while not await self.run_once():
+            await asyncio.sleep(self.retry_interval)
+
+
+# Process-wide warm-up started from the FastAPI lifespan
+startup_warmup = StartupWarmup()
@@ -1,100 +1,134 @@
 import pytest
 import os
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 from dotenv import load_dotenv
-from database.connection import Base
 from faker import Faker
 from unittest.mock import patch
+from contextlib import contextmanager
 
 # Load environment variables
 load_dotenv()
 
+# Without configuration, run everything against in-memory SQLite
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from database.connection import Base, get_async_database_url, configure_sqlite
+from database.query_metrics import instrument_queries
+from database.session_cache import session_cache
+
 # Initialize Faker
 fake = Faker()
 
-# Test database configuration
-TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
-if not TEST_DATABASE_URL:
-    raise ValueError("TEST_DATABASE_URL environment variable is required for testing")
+# Test database configuration; any SQLAlchemy URL, in-memory SQLite by default
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL") or "sqlite://"
+IS_SQLITE = TEST_DATABASE_URL.startswith("sqlite")
+
+# Create test database engine. In-memory SQLite lives as long as its one
+# connection, so the pool holds exactly that connection.
+if TEST_DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+    test_engine = create_engine(
+        TEST_DATABASE_URL, poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+else:
+    test_engine = create_engine(
+        TEST_DATABASE_URL, connect_args={"check_same_thread": False} if IS_SQLITE else {}
+    )
+if IS_SQLITE:
+    configure_sqlite(test_engine)
+
+# Connection of the running test; every test session is bound to it
+_test_connection = None
+
+
+class TestBoundSession(Session):
+    """
+    Session bound to the running test's connection
+
+    The connection holds an outer transaction that is rolled back after
+    the test. Commits inside the test only release SAVEPOINTs, so no test
+    ever writes committed data and no cleanup is needed.
+    """
+
+    def __init__(self, bind=None, **kwargs):
+        super().__init__(
+            bind=_test_connection if _test_connection is not None else test_engine,
+            join_transaction_mode="create_savepoint",
+            **kwargs
+        )
+
+
+TestSessionLocal = sessionmaker(class_=TestBoundSession, autoflush=False)
+
+# Async sessions run their sync session on the same connection (greenlets
+# make the blocking driver calls), so sync and async code in a test see
+# each other's writes and share its rollback
+TestAsyncSessionLocal = async_sessionmaker(
+    sync_session_class=TestBoundSession, autoflush=False, expire_on_commit=False
+)
 
-# Create test database engine and session
-test_engine = create_engine(TEST_DATABASE_URL)
-TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+# Async engine for tests of code that connects through the engine itself;
+# NullPool because each async test runs on its own event loop
+test_async_engine = create_async_engine(get_async_database_url(TEST_DATABASE_URL), poolclass=NullPool)
+
+# Time test statements per operation, as the application engines do
+instrument_queries(test_engine)
+instrument_queries(test_async_engine.sync_engine)
+
+# Statements the per-test transaction adds around the application's own
+TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT", "BEGIN")
+
+# Modules that open their own async sessions
+ASYNC_SESSION_MODULES = [
+    'database.connection',
+    'database.unit_of_work',
+]
 
 @pytest.fixture(scope="session")
 def setup_test_database():
-    """Set up test database tables before running tests."""
-    # Mask the password in the URL for security
-    masked_url = TEST_DATABASE_URL
-    if '@' in masked_url and ':' in masked_url:
-        # Extract just the database name and host for display
-        parts = masked_url.split('/')
-        db_name = parts[-1] if parts else 'unknown'
-        host_part = masked_url.split('@')[-1].split('/')[0] if '@' in masked_url else 'localhost'
-        masked_url = f"postgresql://***:***@{host_part}/{db_name}"
-    
-    print(f"\n🔧 Setting up test database: {masked_url}")
-    
-    # Test database connection
-    try:
-        with test_engine.connect() as connection:
-            result = connection.execute(text("SELECT 1"))
-            print("✅ Test database connection successful")
-    except Exception as e:
-        print(f"❌ Test database connection failed: {e}")
-        raise
-    
-    # Create all tables
-    try:
-        Base.metadata.create_all(bind=test_engine)
-        print("✅ Test database tables created successfully")
-    except Exception as e:
-        print(f"❌ Failed to create test database tables: {e}")
-        raise
-    
+    """Create the schema once; tests roll back instead of recreating it."""
+    Base.metadata.create_all(bind=test_engine)
     yield
-    
-    # Cleanup: Drop all tables after tests
-    print("\n🧹 Cleaning up test database")
     Base.metadata.drop_all(bind=test_engine)
 
 @pytest.fixture
 def db_session(setup_test_database):
-    """Create a database session for a test and patch SessionLocal globally."""
+    """Run the test in a transaction that is rolled back, and patch SessionLocal globally."""
+    global _test_connection
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    _test_connection = connection
+
     session = TestSessionLocal()
+    session_cache.clear()
     
-    # Patch SessionLocal at multiple locations to ensure test isolation
+    # Operations without an injected session open one through the unit of work
     with patch('database.connection.SessionLocal') as mock_session_local, \
-         patch('database.operations.users.store_user_appending_approval.SessionLocal') as mock_store_session, \
-         patch('database.operations.users.get_user_by_discord_id.SessionLocal') as mock_get_discord_session, \
-         patch('database.operations.users.get_user_by_id.SessionLocal') as mock_get_id_session, \
-         patch('database.operations.users.get_server_nickname_by_user_id.SessionLocal') as mock_nickname_session, \
-         patch('database.operations.users.update_user_discord_info.SessionLocal') as mock_update_session:
+         patch('database.unit_of_work.SessionLocal') as mock_unit_of_work_session:
         
-        # Return a fresh session each time SessionLocal() is called
+        # Return the test session each time SessionLocal() is called
         mock_session_local.return_value = session
-        mock_store_session.return_value = session
-        mock_get_discord_session.return_value = session
-        mock_get_id_session.return_value = session
-        mock_nickname_session.return_value = session
-        mock_update_session.return_value = session
+        mock_unit_of_work_session.return_value = session
+        
+        # Point async operations at the test connection
+        async_patches = [
+            patch(f'{module}.AsyncSessionLocal', TestAsyncSessionLocal)
+            for module in ASYNC_SESSION_MODULES
+        ]
+        for async_patch in async_patches:
+            async_patch.start()
         
         try:
             yield session
         finally:
-            # Clean up all data after each test
-            session.rollback()
-            
-            # Delete all data from tables
-            from database.models.session import Session as SessionModel
-            from database.models.user import User
-            
-            session.query(SessionModel).delete()
-            session.query(User).delete()
-            session.commit()
-            
             session.close()
+            transaction.rollback()
+            connection.close()
+            _test_connection = None
+            for async_patch in async_patches:
+                async_patch.stop()
 
 @pytest.fixture
 def sample_user_data():
@@ -105,3 +139,70 @@ def sample_user_data():
         "server_nickname": fake.user_name(),
         "email": fake.email()
     }
+
+@pytest.fixture
+def query_counter():
+    """Count SQL statements executed against the test database, leaving out transaction control."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith(TRANSACTION_CONTROL):
+            statements.append(statement)
+
+    engines = [test_engine, test_async_engine.sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+async def async_db(db_session):
+    """Request-scoped async session, as get_async_db provides to routes."""
+    async with TestAsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def assert_connections_used():
+    """
+    Assert how many sessions a block runs database work in
+    Tests share one connection, so count sessions that begin a transaction:
+    in production each holds one pooled connection while it does.
+    """
+    @contextmanager
+    def checking(expected: int):
+        sessions = set()
+
+        def after_begin(session, transaction, connection):
+            sessions.add(id(session))
+
+        event.listen(TestBoundSession, "after_begin", after_begin)
+        try:
+            yield sessions
+        finally:
+            event.remove(TestBoundSession, "after_begin", after_begin)
+        assert len(sessions) == expected, f"expected {expected} sessions to use a connection, got {len(sessions)}"
+
+    return checking
+
+
+@pytest.fixture
+def admin_client(db_session, monkeypatch):
+    """Client with the session cookie of an approved admin"""
+    from main import app
+    from httpx import AsyncClient
+    from database.models.user import User, UserStatus
+    from database.operations.session_operations import create_session
+
+    admin = User(discord_id="1", discord_username="admin", status=UserStatus.APPROVED)
+    db_session.add(admin)
+    db_session.commit()
+    monkeypatch.setattr("routes.admin.permissions.ADMIN_USER_IDS", {admin.id})
+
+    client = AsyncClient(app=app, base_url="http://test")
+    client.cookies.set("session_id", create_session(admin.id))
+    return client
@@ -0,0 +1,150 @@
+"""
+Tests for the admin user listing and export
+"""
+import json
+import pytest
+from httpx import AsyncClient
+from database.models.user import User, UserStatus
+from database.operations.session_operations import create_session
+
+
+@pytest.fixture
+def pending_users(db_session):
+    """Pending users sharing created_at timestamps, so pages must break ties on id"""
+    users = [
+        User(discord_id=str(1000 + i), discord_username=f"pending{i}", status=UserStatus.PENDING)
+        for i in range(7)
+    ]
+    users.append(User(discord_id="2000", discord_username="approved", status=UserStatus.APPROVED))
+    db_session.add_all(users)
+    db_session.commit()
+    return [user.id for user in users[:7]]
+
+
+@pytest.mark.asyncio
+async def test_list_users_pages_by_keyset(admin_client, pending_users):
+    """Test pages cover every pending user once, in (created_at, id) order"""
+    seen, cursor = [], None
+    async with admin_client as client:
+        while True:
+            params = {"status": "pending", "limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            body = (await client.get("/api/admin/users", params=params)).json()
+            seen.extend(user["id"] for user in body["users"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+    assert seen == sorted(pending_users)
+
+
+@pytest.mark.asyncio
+async def test_list_users_filters_by_status(admin_client, pending_users):
+    async with admin_client as client:
+        body = (await client.get("/api/admin/users", params={"status": "approved"})).json()
+
+    assert {user["discord_username"] for user in body["users"]} == {"admin", "approved"}
+    assert body["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_users_rejects_bad_cursor(admin_client):
+    async with admin_client as client:
+        response = await client.get("/api/admin/users", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_streams_ndjson(admin_client, pending_users):
+    async with admin_client as client:
+        response = await client.get("/api/admin/users/export", params={"status": "pending"})
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == sorted(pending_users)
+    assert {row["status"] for row in rows} == {"pending"}
+
+
+@pytest.mark.asyncio
+async def test_admin_routes_require_admin(db_session, sample_user_data):
+    """Test anonymous and non-admin users are turned away"""
+    from main import app
+
+    user = User(discord_id=sample_user_data["id"], discord_username="user", status=UserStatus.APPROVED)
+    db_session.add(user)
+    db_session.commit()
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/api/admin/users")).status_code == 401
+
+        client.cookies.set("session_id", create_session(user.id))
+        assert (await client.get("/api/admin/users")).status_code == 403
+        assert (await client.get("/api/admin/users/export")).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_bulk_ban_revokes_sessions(admin_client, pending_users, db_session):
+    """Test banning users updates them and revokes their sessions together"""
+    from database.operations.session_operations import get_valid_session_user
+
+    approved_id, approved_discord_id = db_session.query(User.id, User.discord_id).filter(
+        User.discord_username == "approved"
+    ).one()
+    session_id = create_session(approved_id)
+    assert get_valid_session_user(session_id) is not None
+
+    async with admin_client as client:
+        response = await client.post("/api/admin/users/status", json={
+            "status": "banned",
+            "user_ids": [pending_users[0]],
+            "discord_ids": [approved_discord_id]
+        })
+
+    body = response.json()
+    assert {user["id"] for user in body["updated"]} == {pending_users[0], approved_id}
+    assert body["sessions_revoked"] == 1
+    assert get_valid_session_user(session_id) is None
+    assert db_session.query(User.status).filter(User.id == approved_id).scalar() == UserStatus.BANNED
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_skips_invalid_transitions(admin_client, pending_users, db_session):
+    """Test users whose status cannot make the transition are reported as skipped"""
+    approved_id = db_session.query(User.id).filter(User.discord_username == "approved").scalar()
+
+    async with admin_client as client:
+        response = await client.post("/api/admin/users/status", json={
+            "status": "rejected",
+            "user_ids": [pending_users[0], approved_id, 99999]
+        })
+        to_pending = await client.post("/api/admin/users/status", json={
+            "status": "pending", "user_ids": [approved_id]
+        })
+
+    body = response.json()
+    assert [user["id"] for user in body["updated"]] == [pending_users[0]]
+    assert body["skipped"]["user_ids"] == [approved_id, 99999]
+    assert to_pending.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_is_one_statement(admin_client, db_session, query_counter):
+    """Test thousands of users are approved by a single UPDATE"""
+    db_session.add_all([
+        User(discord_id=str(10**17 + i), discord_username=f"bulk{i}", status=UserStatus.PENDING)
+        for i in range(2000)
+    ])
+    db_session.commit()
+    discord_ids = [str(10**17 + i) for i in range(2000)]
+    query_counter.clear()
+
+    async with admin_client as client:
+        response = await client.post("/api/admin/users/status", json={
+            "status": "approved", "discord_ids": discord_ids
+        })
+
+    assert len(response.json()["updated"]) == 2000
+    updates = [statement for statement in query_counter if statement.lstrip().upper().startswith("UPDATE")]
+    assert len(updates) == 1
@@ -56,3 +56,110 @@ def test_user_count_after_rollback(db_session):
     # This should be 0 because the previous test's changes were rolled back
     count = db_session.query(User).count()
     assert count == 0
+
+
+def test_commit_inside_test_is_rolled_back(db_session, sample_user_data):
+    """Test a committed write only releases a savepoint of the test's transaction."""
+    db_session.add(User(discord_id=sample_user_data["id"], discord_username="committed"))
+    db_session.commit()
+
+    connection = db_session.connection()
+    assert connection.in_transaction()
+    assert db_session.query(User).count() == 1
+
+
+def test_timestamps_load_as_naive_utc(db_session, sample_user_data):
+    """Test aware timestamps are stored as UTC and every backend returns naive UTC."""
+    from datetime import datetime, timedelta, timezone
+
+    user = User(discord_id=sample_user_data["id"], discord_username="user")
+    db_session.add(user)
+    db_session.commit()
+
+    expires_at = datetime(2030, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=2)))
+    db_session.add(Session(id="tz", user_id=user.id, expires_at=expires_at))
+    db_session.commit()
+    db_session.expire_all()
+
+    loaded = db_session.get(Session, "tz").expires_at
+    assert loaded == datetime(2030, 1, 1, 10, 0)
+    assert loaded.tzinfo is None
+
+
+def test_invalid_status_is_rejected(db_session, sample_user_data):
+    """Test the status column only accepts UserStatus values on every backend."""
+    from sqlalchemy.exc import IntegrityError, DataError, StatementError
+
+    with pytest.raises((IntegrityError, DataError, StatementError)):
+        db_session.execute(
+            text("INSERT INTO users (discord_id, discord_username, status) VALUES (:id, 'user', 'UNKNOWN')"),
+            {"id": sample_user_data["id"]}
+        )
+    db_session.rollback()
+
+
+def test_sessions_require_an_existing_user(db_session):
+    """Test foreign keys are enforced, including on SQLite."""
+    from datetime import datetime
+    from sqlalchemy.exc import IntegrityError
+
+    db_session.add(Session(id="orphan", user_id=999999, expires_at=datetime(2030, 1, 1)))
+    with pytest.raises(IntegrityError):
+        db_session.commit()
+    db_session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_sqlite_is_shared_by_sync_and_async_engines():
+    """Test an in-memory DATABASE_URL gives both engines the same database."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from database.connection import get_sqlite_url, get_async_database_url
+
+    assert get_sqlite_url("sqlite:///./file.db") == "sqlite:///./file.db"
+    assert get_sqlite_url("postgresql://u:p@host/db") == "postgresql://u:p@host/db"
+
+    url = get_sqlite_url("sqlite://")
+    assert "mode=memory" in url and "cache=shared" in url
+
+    sync_engine = create_engine(url)
+    async_engine = create_async_engine(get_async_database_url(url))
+    try:
+        with sync_engine.begin() as connection:
+            connection.execute(text("CREATE TABLE shared_check (value INTEGER)"))
+            connection.execute(text("INSERT INTO shared_check VALUES (42)"))
+
+        async with async_engine.connect() as connection:
+            assert (await connection.execute(text("SELECT value FROM shared_check"))).scalar() == 42
+    finally:
+        await async_engine.dispose()
+        sync_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_on_shared_in_memory_sqlite():
+    """Test concurrent write transactions wait for each other instead of failing"""
+    import asyncio
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from database.connection import get_engine_options, configure_sqlite, open_sqlite_anchor
+
+    url = "sqlite+aiosqlite:///file:concurrent_writers?mode=memory&cache=shared&uri=true"
+    anchor = open_sqlite_anchor(url)
+    async_engine = create_async_engine(url, **get_engine_options(url, is_async=True))
+    configure_sqlite(async_engine.sync_engine)
+    try:
+        async with async_engine.begin() as connection:
+            await connection.execute(text("CREATE TABLE counter (value INTEGER)"))
+
+        async def write(value):
+            async with async_engine.begin() as connection:
+                await connection.execute(text("INSERT INTO counter VALUES (:value)"), {"value": value})
+                await asyncio.sleep(0.005)
+
+        await asyncio.gather(*(write(value) for value in range(20)))
+
+        async with async_engine.connect() as connection:
+            assert (await connection.execute(text("SELECT COUNT(*) FROM counter"))).scalar() == 20
+    finally:
+        await async_engine.dispose()
+        anchor.close()
@@ -0,0 +1,175 @@
+"""
+Tests for the Discord OAuth callback flow
+"""
+import asyncio
+import pytest
+import httpx
+from routes.auth.discord_client import create_discord_client, set_discord_client
+from routes.auth.discord_oauth import discord_callback
+
+TARGET_GUILD = "100000000000000000"
+
+
+@pytest.fixture
+def fake_discord(monkeypatch):
+    """Mock Discord API that tracks requests and how many overlap."""
+    monkeypatch.setenv("DISCORD_TOKEN_URL", "https://discord.test/api/oauth2/token")
+    monkeypatch.setenv("DISCORD_USER_URL", "https://discord.test/api/users/@me")
+    monkeypatch.setenv("TARGET_SERVER_ID", TARGET_GUILD)
+    monkeypatch.setenv("FRONTEND_URL", "http://frontend.test")
+    # Reload the OAuth configuration from the patched environment
+    monkeypatch.setattr("routes.auth.oauth_config._oauth_config", None)
+    monkeypatch.setattr("routes.auth.discord_oauth.DISCORD_API_BASE_URL", "https://discord.test/api")
+
+    state = {"paths": [], "in_flight": 0, "max_in_flight": 0, "member_status": 200}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["paths"].append(request.url.path)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+
+        path = request.url.path
+        if path.endswith("/oauth2/token"):
+            return httpx.Response(200, json={"access_token": "token"})
+        if path.endswith("/member"):
+            if state["member_status"] != 200:
+                return httpx.Response(state["member_status"], json={"message": "Unknown Guild"})
+            return httpx.Response(200, json={"nick": "nick", "roles": ["1"]})
+        if path.endswith("/users/@me"):
+            return httpx.Response(200, json={"id": "200000000000000000", "username": "user"})
+        return httpx.Response(404)
+
+    set_discord_client(create_discord_client(transport=httpx.MockTransport(handler)))
+    try:
+        yield state
+    finally:
+        set_discord_client(None)
+
+
+@pytest.mark.asyncio
+async def test_callback_fetches_user_and_member_concurrently(db_session, async_db, fake_discord):
+    """Test user info and guild member lookups overlap and guilds are not listed"""
+    response = await discord_callback(code="code", db=async_db)
+
+    assert "auth=pending" in response.headers["location"]
+    assert fake_discord["max_in_flight"] == 2
+    assert not any(path.endswith("/users/@me/guilds") for path in fake_discord["paths"])
+    assert len(fake_discord["paths"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_callback_rejects_non_member(db_session, async_db, fake_discord):
+    """Test a 404 from the member endpoint means not in the target guild"""
+    fake_discord["member_status"] = 404
+
+    response = await discord_callback(code="code", db=async_db)
+
+    assert "error=not_in_target_guild" in response.headers["location"]
+
+
+@pytest.mark.asyncio
+async def test_callback_fails_on_member_lookup_error(db_session, async_db, fake_discord):
+    """Test other member endpoint failures are reported as auth failures"""
+    fake_discord["member_status"] = 500
+
+    response = await discord_callback(code="code", db=async_db)
+
+    assert "error=discord_auth_failed" in response.headers["location"]
+
+
+@pytest.mark.asyncio
+async def test_callback_logs_in_approved_user(db_session, async_db, fake_discord):
+    """Test a returning approved user is synced by the upsert and given a session"""
+    from database.models.user import User, UserStatus
+
+    await discord_callback(code="code", db=async_db)
+    db_session.query(User).update({"status": UserStatus.APPROVED})
+    db_session.commit()
+
+    response = await discord_callback(code="code", db=async_db)
+
+    assert "auth=success" in response.headers["location"]
+    assert "session_id=" in response.headers["set-cookie"]
+    assert db_session.query(User).one().server_nickname == "nick"
+
+
+@pytest.mark.asyncio
+async def test_callback_reports_failed_session_creation(db_session, async_db, fake_discord, monkeypatch):
+    """Test an approved user whose session cannot be created gets an error, not a cookie"""
+    from database.models.user import User, UserStatus
+
+    await discord_callback(code="code", db=async_db)
+    db_session.query(User).update({"status": UserStatus.APPROVED})
+    db_session.commit()
+
+    async def no_session(user_id, db=None):
+        return None
+
+    monkeypatch.setattr("routes.auth.discord_oauth.create_session_async", no_session)
+    response = await discord_callback(code="code", db=async_db)
+
+    assert "error=discord_auth_failed" in response.headers["location"]
+    assert "set-cookie" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_callback_uses_one_connection(db_session, async_db, fake_discord, assert_connections_used):
+    """Test the user sync and session creation share one connection and one commit"""
+    from database.models.user import User, UserStatus
+
+    await discord_callback(code="code", db=async_db)
+    await async_db.close()
+    db_session.query(User).update({"status": UserStatus.APPROVED})
+    db_session.commit()
+
+    with assert_connections_used(1):
+        response = await discord_callback(code="code", db=async_db)
+
+    assert "auth=success" in response.headers["location"]
+
+
+@pytest.mark.asyncio
+async def test_callback_logs_no_discord_identity(db_session, async_db, fake_discord, caplog):
+    """Test login logging carries internal IDs only, never Discord profile data"""
+    caplog.set_level("DEBUG", logger="routes.auth.discord_oauth")
+
+    await discord_callback(code="code", db=async_db)
+
+    records = [r for r in caplog.records if r.name == "routes.auth.discord_oauth"]
+    assert [r.getMessage() for r in records] == ["Discord login", "Created user pending approval"]
+    logged = " ".join(str(value) for record in records for value in vars(record).values())
+    assert "200000000000000000" not in logged
+    assert "nick" not in logged
+
+
+@pytest.mark.asyncio
+async def test_callback_redirects_are_url_encoded(db_session, async_db, fake_discord):
+    """Test fixed and dynamic redirect messages are percent-encoded"""
+    response = await discord_callback(code="code", db=async_db)
+    assert response.headers["location"] == (
+        "http://frontend.test/?auth=pending&message=Your%20account%20has%20been%20submitted%20for%20admin%20approval"
+    )
+
+    response = await discord_callback(error="access_denied", db=async_db)
+    assert response.headers["location"] == (
+        "http://frontend.test/?error=discord_auth_failed&message=Access%20Denied.%20Error%20connecting%20to%20Discord"
+    )
+
+    fake_discord["member_status"] = 500
+    response = await discord_callback(code="code", db=async_db)
+    assert response.headers["location"].endswith("message=Failed%20to%20get%20guild%20membership%20from%20Discord")
+
+
+def test_oauth_config_is_loaded_once(monkeypatch):
+    """Test the configuration is read from the environment on first use only"""
+    from routes.auth.oauth_config import get_oauth_config
+
+    monkeypatch.setenv("FRONTEND_URL", "http://first.test")
+    monkeypatch.setattr("routes.auth.oauth_config._oauth_config", None)
+    config = get_oauth_config()
+
+    monkeypatch.setenv("FRONTEND_URL", "http://second.test")
+    assert get_oauth_config() is config
+    assert config.redirects["success"] == "http://first.test/?auth=success&message=Login%20successful"
@@ -0,0 +1,83 @@
+"""
+Tests for the shared Discord HTTP client
+"""
+import pytest
+import httpx
+from routes.auth import discord_client
+from routes.auth.discord_client import (
+    create_discord_client,
+    get_discord_client,
+    set_discord_client,
+    close_discord_client
+)
+from routes.auth.discord_oauth import (
+    exchange_code_for_token,
+    get_discord_user_info,
+    get_discord_guild_member
+)
+
+
+@pytest.fixture
+def discord_requests(monkeypatch):
+    """Install a shared client backed by a mock transport and record requests."""
+    monkeypatch.setenv("DISCORD_TOKEN_URL", "https://discord.test/api/oauth2/token")
+    monkeypatch.setenv("DISCORD_USER_URL", "https://discord.test/api/users/@me")
+    # Reload the OAuth configuration from the patched environment
+    monkeypatch.setattr("routes.auth.oauth_config._oauth_config", None)
+    monkeypatch.setattr("routes.auth.discord_oauth.DISCORD_API_BASE_URL", "https://discord.test/api")
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/oauth2/token"):
+            return httpx.Response(200, json={"access_token": "token"})
+        if request.url.path.endswith("/member"):
+            return httpx.Response(404, json={"message": "Unknown Guild"})
+        return httpx.Response(200, json={"id": "1", "username": "user"})
+
+    client = create_discord_client(transport=httpx.MockTransport(handler))
+    set_discord_client(client)
+    try:
+        yield requests
+    finally:
+        set_discord_client(None)
+
+
+@pytest.mark.asyncio
+async def test_helpers_share_one_client(discord_requests):
+    """Test every Discord helper goes through the shared client"""
+    shared = get_discord_client()
+
+    token = await exchange_code_for_token("code")
+    user = await get_discord_user_info(token["access_token"])
+    member = await get_discord_guild_member(token["access_token"], "123")
+
+    assert get_discord_client() is shared
+    assert user["username"] == "user"
+    assert member is None
+    assert [request.url.path for request in discord_requests] == [
+        "/api/oauth2/token",
+        "/api/users/@me",
+        "/api/users/@me/guilds/123/member"
+    ]
+    assert discord_requests[1].headers["Authorization"] == "Bearer token"
+
+
+def test_client_configuration():
+    """Test limits and timeouts come from configuration"""
+    client = create_discord_client()
+
+    assert client.timeout.connect == discord_client.DISCORD_HTTP_CONNECT_TIMEOUT
+    assert client.timeout.read == discord_client.DISCORD_HTTP_TIMEOUT
+
+
+@pytest.mark.asyncio
+async def test_close_discord_client():
+    """Test the shared client is closed at shutdown and recreated on demand"""
+    client = get_discord_client()
+    await close_discord_client()
+
+    assert client.is_closed
+    assert get_discord_client() is not client
+    await close_discord_client()
@@ -0,0 +1,241 @@
+"""
+Tests for Discord rate-limit handling
+"""
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import pytest
+import httpx
+from routes.auth.discord_ratelimit import DiscordRateLimiter
+
+URL = "https://discord.test/api/users/@me"
+HEADERS = {"Authorization": "Bearer token"}
+
+
+class FakeClock:
+    """Deterministic clock whose sleep advances time."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+class ConcurrentClock(FakeClock):
+    """Fake clock for concurrent requests: sleeping yields and overlapping sleeps share time."""
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 3))
+        wake_at = self.now + seconds
+        await asyncio.sleep(0)
+        self.now = max(self.now, wake_at)
+
+
+class RateLimitedDiscord:
+    """Stand-in for Discord that emits rate-limit headers."""
+
+    def __init__(self, clock: FakeClock, limit: int = 2, reset_after: float = 1.0):
+        self.clock = clock
+        self.limit = limit
+        self.reset_after = reset_after
+        self.window_start = clock.now
+        self.used = 0
+        self.responses = []
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if self.clock.now >= self.window_start + self.reset_after:
+            self.window_start = self.clock.now
+            self.used = 0
+
+        reset_after = self.window_start + self.reset_after - self.clock.now
+        if self.used >= self.limit:
+            self.responses.append(429)
+            return httpx.Response(429, headers={
+                "X-RateLimit-Bucket": "abc",
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset-After": str(reset_after),
+                "Retry-After": str(reset_after)
+            }, json={"retry_after": reset_after, "global": False})
+
+        self.used += 1
+        self.responses.append(200)
+        return httpx.Response(200, headers={
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Remaining": str(self.limit - self.used),
+            "X-RateLimit-Reset-After": str(reset_after)
+        }, json={"id": "1"})
+
+    def send(self):
+        return lambda: self.client.get(URL, headers=HEADERS)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.mark.asyncio
+async def test_waits_for_exhausted_bucket(clock):
+    """Test requests are delayed before an exhausted bucket would 429"""
+    discord = RateLimitedDiscord(clock, limit=2, reset_after=1.0)
+    limiter = DiscordRateLimiter(clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        response = await limiter.send(discord.send(), "GET", URL, HEADERS)
+        assert response.status_code == 200
+
+    assert discord.responses == [200, 200, 200]
+    assert clock.sleeps == [1.0]
+    assert limiter.stats()["delayed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_after_429(clock):
+    """Test a 429 is retried after Retry-After"""
+    discord = RateLimitedDiscord(clock, limit=0, reset_after=0.5)
+    discord.limit = 1
+    discord.used = 1  # bucket already spent by another process
+    limiter = DiscordRateLimiter(clock=clock, sleep=clock.sleep)
+
+    response = await limiter.send(discord.send(), "GET", URL, HEADERS)
+
+    assert response.status_code == 200
+    assert discord.responses == [429, 200]
+    assert limiter.stats()["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded(clock):
+    """Test the 429 is returned once retries are exhausted"""
+    discord = RateLimitedDiscord(clock, limit=0, reset_after=0.5)
+    limiter = DiscordRateLimiter(max_retries=2, clock=clock, sleep=clock.sleep)
+
+    response = await limiter.send(discord.send(), "GET", URL, HEADERS)
+
+    assert response.status_code == 429
+    assert discord.responses == [429, 429, 429]
+
+
+@pytest.mark.asyncio
+async def test_long_retry_after_is_not_waited(clock):
+    """Test a Retry-After beyond the maximum wait fails fast"""
+    discord = RateLimitedDiscord(clock, limit=0, reset_after=60)
+    limiter = DiscordRateLimiter(max_wait=5, clock=clock, sleep=clock.sleep)
+
+    response = await limiter.send(discord.send(), "GET", URL, HEADERS)
+
+    assert response.status_code == 429
+    assert clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_buckets_are_tracked_per_token(clock):
+    """Test one user's exhausted bucket does not delay another user"""
+    first_user = RateLimitedDiscord(clock, limit=1, reset_after=1.0)
+    second_user = RateLimitedDiscord(clock, limit=1, reset_after=1.0)
+    limiter = DiscordRateLimiter(clock=clock, sleep=clock.sleep)
+
+    await limiter.send(first_user.send(), "GET", URL, HEADERS)
+    other_headers = {"Authorization": "Bearer other"}
+    response = await limiter.send(
+        lambda: second_user.client.get(URL, headers=other_headers), "GET", URL, other_headers
+    )
+
+    assert response.status_code == 200
+    assert clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_global_rate_limit_delays_all_requests(clock):
+    """Test a global 429 pauses subsequent requests"""
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "2", "X-RateLimit-Global": "true"}, json={"global": True}),
+        httpx.Response(200, json={}),
+        httpx.Response(200, json={}),
+    ]
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: responses.pop(0)))
+    limiter = DiscordRateLimiter(clock=clock, sleep=clock.sleep)
+
+    response = await limiter.send(lambda: client.get(URL), "GET", URL)
+
+    assert response.status_code == 200
+    assert clock.sleeps == [2.0]
+
+
+@pytest.mark.asyncio
+async def test_waiters_released_by_reset_do_not_overshoot():
+    """Test requests woken by a bucket reset re-check capacity instead of all firing"""
+    clock = ConcurrentClock()
+    discord = RateLimitedDiscord(clock, limit=2, reset_after=1.0)
+    limiter = DiscordRateLimiter(clock=clock, sleep=clock.sleep)
+    await limiter.send(discord.send(), "GET", URL, HEADERS)
+
+    responses = await asyncio.gather(*(
+        limiter.send(discord.send(), "GET", URL, HEADERS) for _ in range(5)
+    ))
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert 429 not in discord.responses
+    assert limiter.stats()["rate_limited"] == 0
+
+
+@pytest.mark.parametrize("headers", [
+    {"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "lots", "X-RateLimit-Reset-After": "1"},
+    {"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "nan"},
+    {"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "inf"},
+])
+@pytest.mark.asyncio
+async def test_malformed_rate_limit_headers_are_ignored(clock, headers):
+    """Test a good response with malformed X-RateLimit-* headers is returned and not tracked"""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, headers=headers)))
+    limiter = DiscordRateLimiter(clock=clock, sleep=clock.sleep)
+
+    response = await limiter.send(lambda: client.get(URL), "GET", URL)
+
+    assert response.status_code == 200
+    assert limiter.stats()["tracked_buckets"] == 0
+
+
+def test_malformed_limit_header_falls_back(clock):
+    """Test an unparseable X-RateLimit-Limit does not stop the bucket being tracked"""
+    limiter = DiscordRateLimiter(clock=clock, sleep=clock.sleep)
+    route = ("GET /api/users/@me", "app")
+    limiter._update_from_headers(route, "app", httpx.Response(200, headers={
+        "X-RateLimit-Bucket": "abc", "X-RateLimit-Limit": "five",
+        "X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "1"
+    }))
+
+    assert limiter._buckets[("abc", "app")].limit == 5
+
+
+@pytest.mark.parametrize("headers, body, expected", [
+    ({"Retry-After": "2.5"}, {"retry_after": 9}, 2.5),
+    ({"Retry-After": "soon"}, {"retry_after": 3}, 3.0),
+    ({}, ["not", "an", "object"], 1.0),
+    ({}, {"retry_after": "later"}, 1.0),
+    ({"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "4"}, "busy", 4.0),
+])
+def test_retry_after_falls_back_on_malformed_values(clock, headers, body, expected):
+    """Test unparseable Retry-After values fall back to the body, the bucket reset or a default"""
+    limiter = DiscordRateLimiter(clock=clock, sleep=clock.sleep)
+    route = ("GET /api/users/@me", "app")
+    response = httpx.Response(429, headers=headers, json=body)
+    limiter._update_from_headers(route, "app", response)
+
+    assert limiter._retry_after(route, "app", response) == expected
+
+
+def test_retry_after_accepts_http_date(clock):
+    """Test a Retry-After HTTP-date is converted to a delay"""
+    limiter = DiscordRateLimiter(clock=clock, sleep=clock.sleep)
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    response = httpx.Response(429, headers={"Retry-After": format_datetime(retry_at, usegmt=True)})
+
+    assert 28 <= limiter._retry_after(("GET /", "app"), "app", response) <= 30
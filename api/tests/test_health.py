@@ -0,0 +1,125 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, patch
+from httpx import AsyncClient
+
+from main import app
+from health import HealthMonitor, health_monitor
+from startup import startup_warmup
+
+
+def pool_status(checked_out=0, size=5, timeouts=0):
+    return {"async": {
+        "pool_class": "InstrumentedAsyncQueuePool",
+        "size": size,
+        "checked_out": checked_out,
+        "checkout_timeouts": timeouts,
+    }}
+
+
+@pytest.fixture
+def warmed_up():
+    with patch.object(startup_warmup, "ready", True):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_snapshot_ready_when_checks_pass(warmed_up):
+    """A passing run makes the monitor ready, with per-check details."""
+    monitor = HealthMonitor(check_redis_enabled=False, check_discord_enabled=False)
+    assert monitor.readiness()["status"] == "unknown"
+
+    with patch("health.connection.get_pool_status", return_value=pool_status(checked_out=1)):
+        monitor.checks["database"] = AsyncMock(return_value={})
+        await monitor.run_once()
+
+    readiness = monitor.readiness()
+    assert readiness["status"] == "ready"
+    assert set(readiness["checks"]) == {"database", "pool"}
+    assert readiness["checks"]["pool"]["saturation"] == pytest.approx(1 / 15, abs=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_database_against_test_engine(warmed_up):
+    """The database check runs SELECT 1 through the async engine."""
+    from tests.conftest import test_async_engine
+
+    monitor = HealthMonitor(check_redis_enabled=False, check_discord_enabled=False)
+    with patch("health.connection.async_engine", test_async_engine):
+        snapshot = await monitor.run_once()
+
+    assert snapshot["checks"]["database"]["ok"] is True
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_is_unready(warmed_up):
+    """Every connection checked out, or a new checkout timeout, fails the pool check."""
+    monitor = HealthMonitor(check_redis_enabled=False, check_discord_enabled=False)
+    monitor.checks["database"] = AsyncMock(return_value={})
+
+    with patch("health.connection.get_pool_status", return_value=pool_status(checked_out=15)):
+        await monitor.run_once()
+    assert monitor.readiness()["status"] == "unready"
+    assert monitor.readiness()["checks"]["pool"]["ok"] is False
+
+    with patch("health.connection.get_pool_status", return_value=pool_status(timeouts=2)):
+        await monitor.run_once()
+    assert monitor.readiness()["checks"]["pool"]["ok"] is False
+
+    # Old timeouts no longer count once a run has seen them
+    with patch("health.connection.get_pool_status", return_value=pool_status(timeouts=2)):
+        await monitor.run_once()
+    assert monitor.readiness()["status"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_slow_check_times_out(warmed_up):
+    """A hanging dependency fails its check within the timeout."""
+    async def hang():
+        await asyncio.sleep(10)
+
+    monitor = HealthMonitor(timeout=0.05, check_redis_enabled=False, check_discord_enabled=True)
+    monitor.checks["database"] = AsyncMock(return_value={})
+    monitor.checks["pool"] = AsyncMock(return_value={})
+    monitor.checks["discord"] = hang
+
+    snapshot = await monitor.run_once()
+    assert snapshot["checks"]["discord"]["ok"] is False
+    assert "timed out" in snapshot["checks"]["discord"]["error"]
+    assert monitor.readiness()["status"] == "unready"
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_unready(warmed_up):
+    """A snapshot older than the maximum age no longer counts as ready."""
+    monitor = HealthMonitor(max_age=0, check_redis_enabled=False, check_discord_enabled=False)
+    monitor.checks = {"database": AsyncMock(return_value={})}
+
+    await monitor.run_once()
+    await asyncio.sleep(0.01)
+    assert monitor.readiness()["status"] == "stale"
+
+
+@pytest.mark.asyncio
+async def test_ready_probe_is_served_from_snapshot(warmed_up):
+    """Probes read the cached snapshot and run no checks themselves."""
+    database = AsyncMock(return_value={})
+
+    with patch.dict(health_monitor.checks, {"database": database, "pool": AsyncMock(return_value={})}):
+        await health_monitor.run_once()
+        assert database.await_count == 1
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            for _ in range(5):
+                response = await client.get("/health/ready")
+                assert response.status_code == 200
+                assert response.json()["status"] == "ready"
+
+        assert database.await_count == 1
+
+        database.side_effect = ConnectionError("refused")
+        await health_monitor.run_once()
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/health/ready")
+            assert response.status_code == 503
+            assert response.json()["checks"]["database"]["error"] == "refused"
@@ -0,0 +1,58 @@
+"""
+Tests for the queued structured logging setup
+"""
+import json
+import logging
+import threading
+import pytest
+
+from logging_config import DebugSampler, DeferredQueueHandler, JsonFormatter, configure_logging, stop_logging
+
+
+def make_record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    """Test each record is one JSON object with its `extra` fields"""
+    entry = json.loads(JsonFormatter().format(make_record(user_id=7)))
+
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "test"
+    assert entry["user_id"] == 7
+    assert "args" not in entry
+
+
+def test_debug_sampler_keeps_a_fraction_of_debug_only():
+    """Test DEBUG records are sampled while higher levels always pass"""
+    assert DebugSampler(rate=0).filter(make_record(logging.DEBUG)) is False
+    assert DebugSampler(rate=1).filter(make_record(logging.DEBUG)) is True
+    assert DebugSampler(rate=0).filter(make_record(logging.INFO)) is True
+
+
+def test_records_are_formatted_off_the_calling_thread(capsys, monkeypatch):
+    """Test the caller only enqueues; the listener thread formats and writes"""
+    formatting_threads = []
+    original_format = JsonFormatter.format
+
+    def recording_format(self, record):
+        formatting_threads.append(threading.current_thread())
+        return original_format(self, record)
+
+    monkeypatch.setattr(JsonFormatter, "format", recording_format)
+    root_level = logging.getLogger().level
+    configure_logging(level="INFO", log_format="json")
+    try:
+        logging.getLogger("test.queue").info("login", extra={"user_id": 3})
+        logging.getLogger("test.queue").debug("dropped below the configured level")
+    finally:
+        stop_logging()
+        logging.getLogger().setLevel(root_level)
+
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert [(line["message"], line["user_id"]) for line in lines] == [("login", 3)]
+    assert formatting_threads and threading.current_thread() not in formatting_threads
+    assert not any(isinstance(h, DeferredQueueHandler) for h in logging.getLogger().handlers)
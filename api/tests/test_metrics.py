@@ -0,0 +1,108 @@
+"""
+Tests for the Prometheus metrics
+"""
+import pytest
+import httpx
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+
+from main import app
+from database.models.user import User, UserStatus
+from database.operations.users import get_user_summary_async, stream_users_by_status
+from routes.auth.discord_client import create_discord_client, set_discord_client, discord_request
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.asyncio
+async def test_route_latency_and_status_by_template():
+    """Requests are counted per route template and status; probes are left out."""
+    before = sample("http_responses_total", method="GET", route="/", status="200")
+    count_before = sample("http_request_duration_seconds_count", method="GET", route="/")
+    unmatched_before = sample("http_responses_total", method="GET", route="unmatched", status="404")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        await client.get("/")
+        await client.get("/no/such/page/12345")
+        await client.get("/health/live")
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "http_request_duration_seconds_bucket" in response.text
+    assert sample("http_responses_total", method="GET", route="/", status="200") == before + 1
+    assert sample("http_request_duration_seconds_count", method="GET", route="/") == count_before + 1
+    assert sample("http_responses_total", method="GET", route="unmatched", status="404") == unmatched_before + 1
+    assert sample("http_responses_total", method="GET", route="/health/live", status="200") == 0
+
+
+@pytest.mark.asyncio
+async def test_sql_timed_per_operation(db_session):
+    """Statements are attributed to the database operation that ran them."""
+    user = User(discord_id="1", discord_username="user", status=UserStatus.APPROVED)
+    db_session.add(user)
+    db_session.commit()
+
+    before = sample("db_query_duration_seconds_count", operation="get_user_summary_async")
+    await get_user_summary_async(user.id)
+    # One SELECT, plus the SAVEPOINTs of the test's transaction
+    assert sample("db_query_duration_seconds_count", operation="get_user_summary_async") > before
+
+
+@pytest.mark.asyncio
+async def test_async_generator_operation_is_labelled(db_session):
+    """Streaming operations label their own batches, not the consumer's queries."""
+    db_session.add_all([
+        User(discord_id=str(i), discord_username=f"user{i}", status=UserStatus.PENDING)
+        for i in range(3)
+    ])
+    db_session.commit()
+
+    before = sample("db_query_duration_seconds_count", operation="stream_users_by_status")
+    batches = [batch async for batch in stream_users_by_status(UserStatus.PENDING, batch_size=2)]
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert sample("db_query_duration_seconds_count", operation="stream_users_by_status") > before
+
+
+@pytest.mark.asyncio
+async def test_discord_latency_by_endpoint():
+    """Discord calls are timed per endpoint, with snowflake IDs collapsed."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/member"):
+            return httpx.Response(404)
+        return httpx.Response(200, json={})
+
+    set_discord_client(create_discord_client(transport=httpx.MockTransport(handler)))
+    endpoint = "/api/users/@me/guilds/{id}/member"
+    labels = {"method": "GET", "endpoint": endpoint}
+    before = sample("discord_request_duration_seconds_count", **labels)
+    not_found_before = sample("discord_responses_total", status="404", **labels)
+    try:
+        await discord_request("GET", "https://discord.test/api/users/@me/guilds/123456789012345678/member")
+        await discord_request("GET", "https://discord.test/api/users/@me/guilds/987654321098765432/member")
+    finally:
+        set_discord_client(None)
+
+    assert sample("discord_request_duration_seconds_count", **labels) == before + 2
+    assert sample("discord_responses_total", status="404", **labels) == not_found_before + 2
+
+
+@pytest.mark.asyncio
+async def test_discord_transport_error_is_counted():
+    """A request that never got a response is counted with status "error"."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    set_discord_client(create_discord_client(transport=httpx.MockTransport(handler)))
+    labels = {"method": "POST", "endpoint": "/api/oauth2/token", "status": "error"}
+    before = sample("discord_responses_total", **labels)
+    try:
+        with pytest.raises(httpx.ConnectError):
+            await discord_request("POST", "https://discord.test/api/oauth2/token")
+    finally:
+        set_discord_client(None)
+
+    assert sample("discord_responses_total", **labels) == before + 1
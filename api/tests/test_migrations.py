@@ -0,0 +1,57 @@
+import os
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+
+from database.connection import Base
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    """Fresh SQLite database upgraded to head"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    config = Config(os.path.join(API_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(API_DIR, "migrations"))
+
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+    yield engine, config
+    engine.dispose()
+
+
+def test_migrations_match_models(migrated_engine):
+    """Upgrading to head produces the schema the models describe"""
+    engine, _ = migrated_engine
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    assert diff == []
+
+
+def test_hot_path_indexes_exist(migrated_engine):
+    engine, _ = migrated_engine
+    inspector = inspect(engine)
+    session_indexes = {index["name"] for index in inspector.get_indexes("sessions")}
+    user_indexes = {index["name"] for index in inspector.get_indexes("users")}
+
+    assert {
+        "ix_sessions_expires_at", "ix_sessions_active_expires_at", "ix_sessions_user_id_is_active", "ix_sessions_inactive"
+    } <= session_indexes
+    assert "ix_sessions_user_id" not in session_indexes
+    assert "ix_users_status_created_at_id" in user_indexes
+
+
+def test_downgrade_to_baseline(migrated_engine):
+    engine, config = migrated_engine
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.downgrade(config, "0001")
+
+    columns = {column["name"] for column in inspect(engine).get_columns("sessions")}
+    assert "last_accessed_at" not in columns
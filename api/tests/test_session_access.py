@@ -0,0 +1,95 @@
+"""
+Tests for buffered session access and sliding expiration
+"""
+import pytest
+from sqlalchemy import text
+from datetime import datetime, timedelta
+from database.models.session import Session
+from database.operations.session_operations import create_session, update_session_access
+from database.operations.users import store_user_pending_approval
+from database.session_access import SessionAccessBuffer, SESSION_LIFETIME_DAYS
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    """Fresh access buffer used by update_session_access."""
+    buffer = SessionAccessBuffer(flush_interval=3600)
+    monkeypatch.setattr("database.operations.session_operations.session_access_buffer", buffer)
+    return buffer
+
+
+@pytest.fixture
+def session_id(db_session, sample_user_data):
+    user = store_user_pending_approval(sample_user_data)
+    return create_session(user.id, expires_in_days=1)
+
+
+def get_session_row(db_session, session_id):
+    db_session.expire_all()
+    return db_session.query(Session).filter(Session.id == session_id).first()
+
+
+def test_access_is_buffered_not_written(db_session, buffer, session_id, query_counter):
+    """Test recording access issues no SQL and coalesces per session"""
+    query_counter.clear()
+
+    assert update_session_access(session_id) is True
+    assert update_session_access(session_id) is True
+
+    assert query_counter == []
+    assert buffer.pending == 1
+
+
+def test_flush_slides_expiry(db_session, buffer, session_id):
+    """Test a flush writes last_accessed_at and extends expires_at"""
+    update_session_access(session_id)
+
+    assert buffer.flush() == 1
+
+    session = get_session_row(db_session, session_id)
+    assert session.last_accessed_at is not None
+    expected = datetime.utcnow() + timedelta(days=SESSION_LIFETIME_DAYS)
+    assert abs((session.expires_at.replace(tzinfo=None) - expected).total_seconds()) < 60
+    assert buffer.pending == 0
+
+
+def test_flush_stores_timestamps_like_the_orm(db_session, buffer, session_id):
+    """Test flushed times keep the Timestamp storage format on SQLite"""
+    if db_session.get_bind().dialect.name != "sqlite":
+        pytest.skip("storage format is SQLite-specific")
+    update_session_access(session_id)
+    buffer.flush()
+
+    stored = db_session.execute(
+        text("SELECT last_accessed_at, expires_at FROM sessions WHERE id = :id"), {"id": session_id}
+    ).one()
+
+    assert all("." not in value for value in stored)
+
+
+def test_flush_skips_inactive_sessions(db_session, buffer, session_id):
+    """Test revoked sessions are not revived by a flush"""
+    update_session_access(session_id)
+    db_session.query(Session).filter(Session.id == session_id).update({"is_active": False})
+    db_session.commit()
+
+    assert buffer.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushed_on_stop(db_session, buffer, session_id):
+    """Test pending access times are written at shutdown"""
+    buffer.start()
+    update_session_access(session_id)
+
+    await buffer.stop()
+
+    assert get_session_row(db_session, session_id).last_accessed_at is not None
+
+
+def test_sliding_expiration_disabled(monkeypatch, buffer):
+    """Test access is not recorded when sliding expiration is off"""
+    monkeypatch.setattr("database.operations.session_operations.SESSION_SLIDING_EXPIRATION", False)
+
+    assert update_session_access("any") is False
+    assert buffer.pending == 0
@@ -0,0 +1,147 @@
+"""
+Tests for the in-process session cache
+"""
+import pytest
+from datetime import datetime, timedelta
+from database.session_cache import SessionCache, SessionUser
+from database.models.user import UserStatus
+
+
+def make_session_user(user_id: int = 1, expires_in: timedelta = timedelta(days=7)) -> SessionUser:
+    return SessionUser(
+        id=user_id,
+        discord_username=f"user{user_id}",
+        server_nickname=None,
+        status=UserStatus.APPROVED,
+        expires_at=datetime.utcnow() + expires_in
+    )
+
+
+def test_cache_hit_and_miss():
+    """Test lookups count hits and misses"""
+    cache = SessionCache(max_size=10, ttl_seconds=60)
+    session_user = make_session_user()
+
+    assert cache.get("a") is None
+    cache.set("a", session_user)
+    assert cache.get("a") == session_user
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_lru_eviction():
+    """Test the least recently used entry is evicted when full"""
+    cache = SessionCache(max_size=2, ttl_seconds=60)
+    cache.set("a", make_session_user(1))
+    cache.set("b", make_session_user(2))
+    cache.get("a")
+    cache.set("c", make_session_user(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_ttl_capped_at_expires_at():
+    """Test entries are not cached past the session expiry"""
+    cache = SessionCache(max_size=10, ttl_seconds=60)
+    cache.set("a", make_session_user(expires_in=timedelta(seconds=-1)))
+
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_ttl_expiry(monkeypatch):
+    """Test entries expire after the configured TTL"""
+    import database.session_cache as session_cache_module
+
+    now = [1000.0]
+    monkeypatch.setattr(session_cache_module.time, "monotonic", lambda: now[0])
+    cache = SessionCache(max_size=10, ttl_seconds=5)
+    cache.set("a", make_session_user())
+
+    now[0] += 4
+    assert cache.get("a") is not None
+    now[0] += 2
+    assert cache.get("a") is None
+
+
+def test_cache_invalidate_user():
+    """Test all sessions for a user are evicted together"""
+    cache = SessionCache(max_size=10, ttl_seconds=60)
+    cache.set("a", make_session_user(1))
+    cache.set("b", make_session_user(1))
+    cache.set("c", make_session_user(2))
+
+    cache.invalidate_user(1)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_cache_disabled_with_zero_ttl():
+    """Test a zero TTL disables caching"""
+    cache = SessionCache(max_size=10, ttl_seconds=0)
+    cache.set("a", make_session_user())
+
+    assert cache.get("a") is None
+
+
+def test_invalidate_session_evicts_cache(db_session, sample_user_data):
+    """Test invalidating a session removes it from the shared cache"""
+    from database.operations.users import store_user_pending_approval
+    from database.operations.session_operations import (
+        create_session,
+        get_valid_session_user,
+        invalidate_all_user_sessions
+    )
+
+    user = store_user_pending_approval(sample_user_data)
+    session_id = create_session(user.id)
+
+    assert get_valid_session_user(session_id) is not None
+    assert get_valid_session_user(session_id) is not None  # served from cache
+
+    invalidate_all_user_sessions(user.id)
+
+    assert get_valid_session_user(session_id) is None
+
+
+@pytest.mark.asyncio
+async def test_injected_invalidation_evicts_after_commit(db_session, async_db, sample_user_data):
+    """Test a revocation in the caller's transaction evicts only once that commits"""
+    from database.operations.users import store_user_pending_approval
+    from database.operations.session_operations import (
+        create_session,
+        get_valid_session_user,
+        invalidate_session_async
+    )
+    from database.session_cache import session_cache
+
+    user = store_user_pending_approval(sample_user_data)
+    session_id = create_session(user.id)
+    assert get_valid_session_user(session_id) is not None
+
+    assert await invalidate_session_async(session_id, db=async_db) is True
+    # Not committed yet: other readers still see the active row, so the
+    # cached entry must not be dropped for them to re-cache
+    assert session_cache.get(session_id) is not None
+
+    await async_db.commit()
+    assert session_cache.get(session_id) is None
+    assert get_valid_session_user(session_id) is None
+
+
+@pytest.mark.asyncio
+async def test_session_cache_stats_endpoint(admin_client):
+    """Test the internal stats endpoint exposes counters"""
+    async with admin_client as client:
+        response = await client.get("/internal/session-cache")
+
+    assert response.status_code == 200
+    assert {"hits", "misses", "evictions", "size"} <= set(response.json())
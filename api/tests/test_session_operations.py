@@ -0,0 +1,170 @@
+"""
+Tests for session operations
+"""
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from database.operations.users import store_user_pending_approval
+from database.operations.session_operations import (
+    create_session,
+    get_valid_session_user,
+    invalidate_session
+)
+from database.models.session import Session
+from database.models.user import User, UserStatus
+from database.session_cache import session_cache
+
+
+@pytest.fixture
+def approved_user(db_session, sample_user_data):
+    """Store an approved user."""
+    user = store_user_pending_approval(sample_user_data)
+    db_session.query(User).filter(User.id == user.id).update({"status": UserStatus.APPROVED})
+    db_session.commit()
+    return user
+
+
+def test_get_valid_session_user(db_session, approved_user):
+    """Test resolving a valid session returns the user columns"""
+    session_id = create_session(approved_user.id)
+
+    result = get_valid_session_user(session_id)
+
+    assert result is not None
+    assert result.id == approved_user.id
+    assert result.discord_username == approved_user.discord_username
+    assert result.server_nickname == approved_user.server_nickname
+    assert result.status == UserStatus.APPROVED
+
+
+def test_get_valid_session_user_invalidated(db_session, approved_user):
+    """Test an invalidated session does not resolve"""
+    session_id = create_session(approved_user.id)
+    invalidate_session(session_id)
+
+    assert get_valid_session_user(session_id) is None
+
+
+def test_get_valid_session_user_expired(db_session, approved_user):
+    """Test an expired session does not resolve"""
+    session_id = create_session(approved_user.id)
+    session = db_session.query(Session).filter(Session.id == session_id).first()
+    session.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    db_session.commit()
+
+    assert get_valid_session_user(session_id) is None
+
+
+def test_get_valid_session_user_nonexistent(db_session):
+    """Test an unknown session ID does not resolve"""
+    assert get_valid_session_user("does-not-exist") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.session
+async def test_me_uses_single_query(db_session, approved_user, query_counter):
+    """Test /me resolves session and user with one query"""
+    from main import app
+
+    session_id = create_session(approved_user.id)
+    query_counter.clear()
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        client.cookies.set("session_id", session_id)
+        response = await client.get("/api/auth/me")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["authenticated"] is True
+    assert data["user"]["id"] == approved_user.id
+    assert data["user"]["status"] == "approved"
+    assert set(data) == {"authenticated", "user"}
+    assert "server_nickname" in data["user"]
+    assert len(query_counter) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.session
+async def test_me_not_modified(db_session, approved_user, query_counter):
+    """Test /me answers a matching If-None-Match with an empty 304 and no query on a cache hit"""
+    from main import app
+
+    session_id = create_session(approved_user.id)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        client.cookies.set("session_id", session_id)
+        response = await client.get("/api/auth/me")
+        etag = response.headers["etag"]
+        assert etag.startswith('W/"')
+        assert response.headers["cache-control"] == "private, no-cache"
+
+        query_counter.clear()
+        response = await client.get("/api/auth/me", headers={"If-None-Match": f'"other", {etag}'})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert len(query_counter) == 0
+
+        # A changed user gets a new validator once the cached snapshot is gone
+        db_session.query(User).filter(User.id == approved_user.id).update({"server_nickname": "renamed"})
+        db_session.commit()
+        session_cache.clear()
+        response = await client.get("/api/auth/me", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["user"]["server_nickname"] == "renamed"
+        assert response.headers["etag"] != etag
+
+
+def test_etag_matches():
+    """Test If-None-Match uses weak comparison over a list of tags"""
+    from routes.auth.auth import etag_matches
+
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('W/"abd"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+
+
+@pytest.mark.asyncio
+async def test_session_lifecycle_async(db_session, approved_user):
+    """Test the async session operations"""
+    from database.operations.session_operations import (
+        create_session_async,
+        get_valid_session_user_async,
+        invalidate_session_async,
+        invalidate_all_user_sessions_async
+    )
+
+    session_id = await create_session_async(approved_user.id)
+    session_user = await get_valid_session_user_async(session_id)
+    assert session_user.id == approved_user.id
+    assert session_user.status == UserStatus.APPROVED
+
+    assert await invalidate_session_async(session_id) is True
+    assert await get_valid_session_user_async(session_id) is None
+
+    await create_session_async(approved_user.id)
+    await create_session_async(approved_user.id)
+    assert await invalidate_all_user_sessions_async(approved_user.id) == 2
+
+
+def test_session_read_models(db_session, approved_user):
+    """Test get_session and get_user_from_session return slotted read models, not ORM objects"""
+    from database.operations.session_operations import get_session, get_user_from_session
+    from database.read_models import SessionSummary, UserSummary
+
+    session_id = create_session(approved_user.id)
+    db_session.expunge_all()
+
+    session = get_session(session_id)
+    user = get_user_from_session(session_id)
+
+    assert isinstance(session, SessionSummary) and session.is_valid()
+    assert session.user_id == approved_user.id
+    assert user == UserSummary(
+        approved_user.id, approved_user.discord_username, approved_user.server_nickname, UserStatus.APPROVED
+    )
+    assert not hasattr(user, "__dict__")
+    assert len(db_session.identity_map) == 0
@@ -0,0 +1,253 @@
+"""
+Tests for the pluggable session stores
+"""
+import inspect
+import pytest
+import fakeredis
+from httpx import AsyncClient
+from database.session_store import (
+    SqlSessionStore,
+    RedisSessionStore,
+    SignedSessionStore,
+    create_session_store,
+    set_session_store
+)
+from database.operations.users import store_user_pending_approval
+from database.models.user import UserStatus
+
+
+@pytest.fixture(params=["database", "redis", "signed"])
+def session_store(request, db_session):
+    """Run each test against every session backend."""
+    if request.param == "database":
+        store = SqlSessionStore()
+    elif request.param == "redis":
+        store = RedisSessionStore(fakeredis.FakeRedis())
+    else:
+        store = SignedSessionStore("test-secret")
+
+    set_session_store(store)
+    try:
+        yield store
+    finally:
+        set_session_store(None)
+
+
+@pytest.fixture
+def user(db_session, sample_user_data):
+    return store_user_pending_approval(sample_user_data)
+
+
+def test_create_and_get(session_store, user):
+    """Test a created session resolves to its user"""
+    session_id = session_store.create(user.id)
+
+    session_user = session_store.get(session_id)
+
+    assert session_user is not None
+    assert session_user.id == user.id
+    assert session_user.discord_username == user.discord_username
+    assert session_user.server_nickname == user.server_nickname
+    assert session_user.status == UserStatus.PENDING
+
+
+def test_get_nonexistent(session_store):
+    """Test an unknown session ID does not resolve"""
+    assert session_store.get("does-not-exist") is None
+
+
+def test_invalidate(session_store, user):
+    """Test an invalidated session no longer resolves"""
+    session_id = session_store.create(user.id)
+
+    assert session_store.invalidate(session_id) is True
+    assert session_store.get(session_id) is None
+
+
+def test_invalidate_user(session_store, user, sample_user_data):
+    """Test all sessions for a user are invalidated together"""
+    other_data = sample_user_data.copy()
+    other_data["id"] = str(int(sample_user_data["id"]) + 1)
+    other_user = store_user_pending_approval(other_data)
+
+    first = session_store.create(user.id)
+    second = session_store.create(user.id)
+    other = session_store.create(other_user.id)
+
+    assert session_store.invalidate_user(user.id) == 2
+    assert session_store.get(first) is None
+    assert session_store.get(second) is None
+    assert session_store.get(other) is not None
+
+
+def test_invalidate_users(session_store, user, sample_user_data):
+    """Test sessions for many users are invalidated in one call"""
+    other_data = sample_user_data.copy()
+    other_data["id"] = str(int(sample_user_data["id"]) + 1)
+    other_user = store_user_pending_approval(other_data)
+
+    sessions = [session_store.create(user.id), session_store.create(other_user.id)]
+
+    assert session_store.invalidate_users([user.id, other_user.id]) == 2
+    assert all(session_store.get(session_id) is None for session_id in sessions)
+    assert session_store.invalidate_users([]) == 0
+
+
+def test_redis_create_unknown_user(db_session):
+    """Test Redis sessions cannot be created for a missing user"""
+    store = RedisSessionStore(fakeredis.FakeRedis())
+    assert store.create(99999) is None
+
+
+def test_redis_session_uses_native_ttl(db_session, user):
+    """Test Redis sessions expire through key TTLs"""
+    client = fakeredis.FakeRedis()
+    store = RedisSessionStore(client)
+
+    session_id = store.create(user.id, expires_in_days=1)
+
+    ttl = client.ttl(f"session:{session_id}")
+    assert 0 < ttl <= 86400
+
+
+def test_redis_cleanup_prunes_user_index(db_session, user):
+    """Test cleanup removes expired session IDs from the per-user set"""
+    client = fakeredis.FakeRedis()
+    store = RedisSessionStore(client)
+    session_id = store.create(user.id)
+
+    client.delete(f"session:{session_id}")  # simulate key TTL expiry
+
+    assert store.cleanup() == 1
+    assert client.exists(f"user_sessions:{user.id}") == 0
+
+
+def test_redis_get_skips_database(db_session, user, query_counter):
+    """Test Redis session reads issue no SQL"""
+    store = RedisSessionStore(fakeredis.FakeRedis())
+    session_id = store.create(user.id)
+    query_counter.clear()
+
+    assert store.get(session_id) is not None
+    assert query_counter == []
+
+
+def test_session_lifetime_defaults_to_configured_days():
+    """Test stored session expiry defaults to the cookie lifetime on every backend"""
+    from database.session_access import SESSION_LIFETIME_DAYS
+    from database.operations import session_operations
+
+    creators = [session_operations.create_session, session_operations.create_session_async]
+    for store in (SqlSessionStore, RedisSessionStore, SignedSessionStore):
+        creators += [store.create, store.create_async]
+
+    for create in creators:
+        assert inspect.signature(create).parameters["expires_in_days"].default == SESSION_LIFETIME_DAYS
+
+
+def test_unknown_backend():
+    """Test an unknown backend name is rejected"""
+    with pytest.raises(ValueError):
+        create_session_store("memcached")
+
+
+@pytest.mark.asyncio
+@pytest.mark.session
+async def test_me_and_logout(session_store, user):
+    """Test /me and /logout work against the configured store"""
+    from main import app
+
+    session_id = session_store.create(user.id)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        client.cookies.set("session_id", session_id)
+        response = await client.get("/api/auth/me")
+        assert response.json()["authenticated"] is True
+
+        await client.post("/api/auth/logout")
+
+    assert session_store.get(session_id) is None
+
+
+def test_signed_session_get_skips_database(db_session, user, query_counter):
+    """Test signed sessions are validated from the token alone"""
+    store = SignedSessionStore("test-secret")
+    session_id = store.create(user.id)
+    query_counter.clear()
+
+    assert store.get(session_id).id == user.id
+    assert query_counter == []
+
+
+def test_signed_session_rejects_tampering(db_session, user):
+    """Test a modified or foreign-signed token does not resolve"""
+    store = SignedSessionStore("test-secret")
+    token = store.create(user.id)
+    payload = store.decode(token)
+    payload["st"] = "approved"
+    payload["uid"] = 12345
+
+    forged = store.encode(payload).split(".")[0] + "." + token.split(".")[1]
+    assert store.get(forged) is None
+    assert SignedSessionStore("other-secret").get(token) is None
+    assert store.get("not-a-token") is None
+
+
+@pytest.mark.parametrize("payload", [
+    {"sid": "abc", "uid": 1, "name": "user", "nick": None, "st": "approved"},
+    {"sid": "abc", "uid": "1", "name": "user", "nick": None, "st": "approved", "exp": 4102444800},
+    {"sid": "abc", "uid": 1, "name": "user", "nick": None, "st": "unknown", "exp": 4102444800},
+    {"sid": "abc", "uid": 1, "name": "user", "nick": None, "st": "approved", "exp": 10**20},
+    ["not", "an", "object"],
+])
+def test_signed_session_rejects_malformed_payload(payload):
+    """Test a correctly signed token with missing or mistyped fields does not resolve"""
+    store = SignedSessionStore("test-secret")
+
+    assert store.get(store.encode(payload)) is None
+    assert store.invalidate(store.encode(payload)) is False
+
+
+@pytest.mark.asyncio
+async def test_signed_session_malformed_cookie_is_unauthenticated(db_session):
+    """Test a cookie with non-ASCII characters is rejected rather than failing the request"""
+    from main import app
+
+    set_session_store(SignedSessionStore("test-secret"))
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/auth/me", headers={"Cookie": "session_id=abc.\xe9".encode("latin-1")})
+    finally:
+        set_session_store(None)
+
+    assert response.status_code == 200
+    assert response.json()["authenticated"] is False
+
+
+def test_signed_session_rejects_expired(db_session, user):
+    """Test an expired token does not resolve"""
+    store = SignedSessionStore("test-secret")
+    token = store.create(user.id, expires_in_days=-1)
+
+    assert store.get(token) is None
+
+
+def test_signed_session_revocation_reaches_other_workers(db_session, user):
+    """Test a revocation on one worker is picked up on refresh by another"""
+    worker_a = SignedSessionStore("test-secret")
+    worker_b = SignedSessionStore("test-secret")
+    token = worker_a.create(user.id)
+
+    worker_a.invalidate(token)
+
+    assert worker_a.get(token) is None
+    assert worker_b.get(token) is not None  # until the next refresh
+    worker_b.refresh()
+    assert worker_b.get(token) is None
+    assert worker_b.revoked_count == 1
+
+
+def test_signed_session_requires_secret():
+    """Test signed sessions cannot be configured without a secret"""
+    with pytest.raises(ValueError):
+        SignedSessionStore("")
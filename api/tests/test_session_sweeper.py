@@ -0,0 +1,78 @@
+"""
+Tests for the expired-session sweeper
+"""
+import pytest
+from datetime import datetime, timedelta
+from database.models.session import Session
+from database.operations.users import store_user_pending_approval
+from database.operations.session_operations import delete_expired_sessions_batch
+from database.session_sweeper import SessionSweeper
+
+
+@pytest.fixture
+def sessions(db_session, sample_user_data):
+    """Create 5 expired, 2 inactive and 3 valid sessions."""
+    user = store_user_pending_approval(sample_user_data)
+    now = datetime.utcnow()
+    rows = (
+        [Session(id=f"expired-{i}", user_id=user.id, expires_at=now - timedelta(hours=1)) for i in range(5)] +
+        [Session(id=f"inactive-{i}", user_id=user.id, expires_at=now + timedelta(days=1), is_active=False) for i in range(2)] +
+        [Session(id=f"valid-{i}", user_id=user.id, expires_at=now + timedelta(days=1)) for i in range(3)]
+    )
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+def remaining_ids(db_session):
+    return sorted(session_id for (session_id,) in db_session.query(Session.id).all())
+
+
+def test_delete_batch_is_bounded(db_session, sessions):
+    """Test a batch deletes at most batch_size rows"""
+    assert delete_expired_sessions_batch(batch_size=4) == 4
+    assert len(remaining_ids(db_session)) == 6
+
+
+def test_delete_batch_fills_with_inactive_after_expired(db_session, sessions):
+    """Test expired rows go first and inactive ones fill the rest of the batch"""
+    assert delete_expired_sessions_batch(batch_size=6) == 6
+    remaining = remaining_ids(db_session)
+    assert not any(session_id.startswith("expired") for session_id in remaining)
+    assert len([session_id for session_id in remaining if session_id.startswith("inactive")]) == 1
+
+    assert delete_expired_sessions_batch(batch_size=100) == 1
+    assert remaining_ids(db_session) == ["valid-0", "valid-1", "valid-2"]
+
+def test_delete_batch_keeps_inactive_when_asked(db_session, sessions):
+    """Test inactive, unexpired sessions can be kept"""
+    assert delete_expired_sessions_batch(batch_size=100, include_inactive=False) == 5
+    assert remaining_ids(db_session) == ["inactive-0", "inactive-1", "valid-0", "valid-1", "valid-2"]
+
+
+@pytest.mark.asyncio
+async def test_sweeper_runs_until_short_batch(db_session, sessions):
+    """Test a sweep run deletes in batches until nothing is left"""
+    sweeper = SessionSweeper(batch_size=3, pause=0)
+
+    removed = await sweeper.run_once()
+
+    assert removed == 7
+    assert remaining_ids(db_session) == ["valid-0", "valid-1", "valid-2"]
+    stats = sweeper.stats()
+    assert stats["batches"] == 3
+    assert stats["rows_removed"] == 7
+
+
+@pytest.mark.asyncio
+async def test_sweeper_skips_when_locked(db_session, sessions, monkeypatch):
+    """Test a run stops when another worker holds the sweep lock"""
+    monkeypatch.setattr(
+        "database.session_sweeper.delete_expired_sessions_batch",
+        lambda batch_size, include_inactive: None
+    )
+    sweeper = SessionSweeper(batch_size=3, pause=0)
+
+    assert await sweeper.run_once() == 0
+    assert sweeper.stats()["skipped_runs"] == 1
+    assert len(remaining_ids(db_session)) == 10
@@ -0,0 +1,106 @@
+import pytest
+import asyncio
+import os
+import pathlib
+import subprocess
+import sys
+from unittest.mock import AsyncMock, patch
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from main import app
+from startup import StartupWarmup, startup_warmup
+
+API_DIR = pathlib.Path(__file__).parent.parent
+
+# Wall-clock budget for `import main` in a fresh interpreter
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "3.0"))
+
+
+@pytest.mark.unit
+def test_import_main_within_budget_without_connecting(tmp_path):
+    """Importing the app is fast and never opens a database connection."""
+    db_file = tmp_path / "import.db"
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_file}",
+        "ASYNC_DATABASE_URL": "",
+    }
+    script = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import main\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=API_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    elapsed = float(result.stdout.strip().splitlines()[-1])
+    assert elapsed < IMPORT_TIME_BUDGET_SECONDS, (
+        f"import main took {elapsed:.2f}s, budget is {IMPORT_TIME_BUDGET_SECONDS:.2f}s"
+    )
+    # SQLite creates the file on first connect
+    assert not db_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_leaves_connections_pooled(tmp_path):
+    """Warm-up opens the requested connections concurrently and pools them."""
+    from database import connection
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=3
+    )
+    try:
+        with patch.object(connection, "async_engine", engine):
+            warmed = await connection.warm_up_pool(3)
+
+        assert warmed == 3
+        assert engine.pool.checkedin() == 3
+        assert engine.pool.checkedout() == 0
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warmup_retries_database_until_ready():
+    """A failed database warm-up is retried; readiness waits for success."""
+    warmup = StartupWarmup(pool_connections=2, warm_discord=False, retry_interval=0)
+    pool = AsyncMock(side_effect=[ConnectionError("refused"), 2])
+
+    with patch("startup.warm_up_pool", pool):
+        warmup.start()
+        await asyncio.wait_for(warmup._task, timeout=1)
+
+    assert warmup.ready is True
+    assert warmup.attempts == 2
+    assert pool.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_discord_warmup_failure_does_not_block_readiness():
+    """Discord is warmed alongside the pool, but its failure is not fatal."""
+    warmup = StartupWarmup(pool_connections=1, warm_discord=True, retry_interval=0)
+
+    with patch("startup.warm_up_pool", AsyncMock(return_value=1)), \
+         patch("startup.warm_up_discord_client", AsyncMock(side_effect=RuntimeError("down"))):
+        assert await warmup.run_once() is True
+
+    assert warmup.ready is True
+    assert warmup.discord_warm is False
+
+
+@pytest.mark.asyncio
+async def test_readiness_waits_for_warmup():
+    """/health/ready answers 503 until warm-up finishes, while liveness stays up."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        with patch.object(startup_warmup, "ready", False):
+            response = await client.get("/health/ready")
+            assert response.status_code == 503
+            assert response.json() == {"status": "starting"}
+            assert (await client.get("/health/live")).status_code == 200
@@ -0,0 +1,69 @@
+"""
+Tests for request-scoped units of work
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from database.models.session import Session
+from database.models.user import UserStatus
+from database.operations import session_operations
+from database.operations.users import store_user_pending_approval, upsert_discord_user_async
+from database.session_cache import session_cache
+
+
+@pytest.fixture
+def approved_user(db_session, sample_user_data):
+    user = store_user_pending_approval(sample_user_data)
+    user.status = UserStatus.APPROVED
+    db_session.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_injected_session_defers_commit(async_db, sample_user_data):
+    """Test operations in an injected session share its transaction and leave the commit to the caller"""
+    user = await upsert_discord_user_async(sample_user_data, db=async_db)
+    session_id = await session_operations.create_session_async(user.id, db=async_db)
+
+    assert (await async_db.execute(select(Session.id))).scalar() == session_id
+
+    await async_db.rollback()
+    assert (await async_db.execute(select(Session.id))).first() is None
+
+
+@pytest.mark.asyncio
+async def test_failed_operation_leaves_injected_session_usable(async_db, sample_user_data):
+    """Test a soft failure only rolls back its own savepoint, not the caller's work"""
+    user = await upsert_discord_user_async(sample_user_data, db=async_db)
+
+    # No such user: the foreign key fails and the operation reports None
+    assert await session_operations.create_session_async(user.id + 1000, db=async_db) is None
+
+    session_id = await session_operations.create_session_async(user.id, db=async_db)
+    await async_db.commit()
+
+    assert (await async_db.execute(select(Session.id))).scalars().all() == [session_id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.session
+async def test_me_and_logout_check_out_one_connection(approved_user, assert_connections_used):
+    """Test /me and /logout each use a single pooled connection, and none on a cache hit"""
+    from main import app
+
+    session_id = session_operations.create_session(approved_user.id)
+    session_cache.clear()
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        client.cookies.set("session_id", session_id)
+
+        with assert_connections_used(1):
+            assert (await client.get("/api/auth/me")).json()["authenticated"] is True
+
+        with assert_connections_used(0):
+            assert (await client.get("/api/auth/me")).json()["authenticated"] is True
+
+        with assert_connections_used(1):
+            await client.post("/api/auth/logout")
+
+    assert session_operations.get_valid_session_user(session_id) is None
@@ -198,23 +198,25 @@ def test_discord_oauth_detects_user_changes(db_session, sample_user_data):
     # Mock the Discord API calls
     with patch('routes.auth.discord_oauth.exchange_code_for_token') as mock_exchange, \
          patch('routes.auth.discord_oauth.get_discord_user_info') as mock_get_user, \
-         patch('routes.auth.discord_oauth.get_discord_user_guilds') as mock_get_guilds, \
-         patch('routes.auth.discord_oauth.is_member_of_target_guild') as mock_is_member, \
          patch('routes.auth.discord_oauth.check_user_guild_roles') as mock_check_roles:
         
         # Configure mocks
         mock_exchange.return_value = {"access_token": "fake_token"}
         mock_get_user.return_value = updated_discord_data
-        mock_get_guilds.return_value = [{"id": "fake_guild", "name": "Test Guild"}]
-        mock_is_member.return_value = (True, "fake_guild")
         mock_check_roles.return_value = updated_guild_member_info
         
         # Import and call the discord_callback function
         from routes.auth.discord_oauth import discord_callback
         
-        # Simulate the OAuth callback
+        # Simulate the OAuth callback in a request-scoped session
         import asyncio
-        response = asyncio.run(discord_callback(code="fake_code"))
+        from tests.conftest import TestAsyncSessionLocal
+
+        async def run_callback():
+            async with TestAsyncSessionLocal() as db:
+                return await discord_callback(code="fake_code", db=db)
+
+        response = asyncio.run(run_callback())
         
         # Check if user data was updated in the database
         updated_user = get_user_by_discord_id(sample_user_data["id"])
@@ -224,3 +226,92 @@ def test_discord_oauth_detects_user_changes(db_session, sample_user_data):
         assert updated_user.discord_username == updated_discord_data["username"]
         assert updated_user.email == updated_discord_data["email"]
         assert updated_user.server_nickname == updated_guild_member_info["nickname"]
+
+
+@pytest.mark.asyncio
+async def test_store_and_get_user_async(db_session, sample_user_data):
+    """Test the async store and lookup operations"""
+    from database.operations.users import (
+        store_user_pending_approval_async,
+        get_user_by_discord_id_async,
+        get_user_by_id_async
+    )
+
+    user = await store_user_pending_approval_async(sample_user_data)
+    assert user is not None
+    assert user.status == UserStatus.PENDING
+
+    by_discord_id = await get_user_by_discord_id_async(sample_user_data["id"])
+    assert by_discord_id.id == user.id
+
+    by_id = await get_user_by_id_async(user.id)
+    assert by_id.discord_id == sample_user_data["id"]
+
+    assert await store_user_pending_approval_async(sample_user_data) is None
+
+
+@pytest.mark.asyncio
+async def test_update_user_discord_info_async(db_session, sample_user_data):
+    """Test the async Discord info update"""
+    from database.operations.users import update_user_discord_info_async
+
+    user = store_user_pending_approval(sample_user_data)
+
+    success = await update_user_discord_info_async(user.id, {
+        "username": "updateduser",
+        "email": "updated@example.com",
+        "server_nickname": "Updated Nickname"
+    })
+    assert success is True
+
+    updated_user = get_user_by_id(user.id)
+    assert updated_user.discord_username == "updateduser"
+    assert updated_user.server_nickname == "Updated Nickname"
+
+    assert await update_user_discord_info_async(99999, {"username": "x"}) is False
+
+
+def test_upsert_discord_user(db_session, sample_user_data):
+    """Test the upsert creates, then syncs changed fields without touching status"""
+    from database.operations.users import upsert_discord_user
+
+    created = upsert_discord_user(sample_user_data)
+    assert created.created is True
+    assert created.status == UserStatus.PENDING
+
+    db_session.query(User).filter(User.id == created.id).update({"status": UserStatus.APPROVED})
+    db_session.commit()
+
+    synced = upsert_discord_user({**sample_user_data, "server_nickname": "Renamed"})
+    assert synced.id == created.id
+    assert synced.created is False
+    assert synced.status == UserStatus.APPROVED
+    assert get_user_by_id(created.id).server_nickname == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_upsert_discord_user_async_unchanged(db_session, sample_user_data, query_counter):
+    """Test an unchanged login still returns the existing user without a row update"""
+    from database.operations.users import upsert_discord_user_async
+
+    created = await upsert_discord_user_async(sample_user_data)
+    query_counter.clear()
+
+    again = await upsert_discord_user_async(sample_user_data)
+    assert again == type(created)(id=created.id, status=UserStatus.PENDING, created=False)
+    assert not any(statement.lstrip().upper().startswith("UPDATE") for statement in query_counter)
+
+
+def test_get_user_summary(db_session, sample_user_data):
+    """Test user summaries load only the read-path columns"""
+    from database.operations.users import get_user_summary, get_user_summary_by_discord_id
+
+    user = store_user_pending_approval(sample_user_data)
+    db_session.expunge_all()
+
+    summary = get_user_summary(user.id)
+    assert summary.discord_username == sample_user_data["username"]
+    assert summary.status == UserStatus.PENDING
+    assert get_user_summary_by_discord_id(sample_user_data["id"]) == summary
+    assert get_user_summary(99999) is None
+    assert len(db_session.identity_map) == 0